@@ -9,6 +9,7 @@ import pydantic
 
 from vault_autopilot._cli.commands.apply import apply
 from vault_autopilot._cli.exc import ConfigSyntaxError, ConfigValidationError
+from vault_autopilot._cli.profiling import PROFILER_KEY, Profiler
 from vault_autopilot._conf import Settings
 from vault_autopilot.exc import Location
 from vault_autopilot.util.model import convert_errors
@@ -59,12 +60,44 @@ def validate_config(ctx: click.Context, fn: ConfigOption) -> Settings:
     ),
     help="Path to a YAML configuration file.",
 )
+@click.option(
+    "--profile",
+    type=click.Path(dir_okay=False, writable=True, path_type=pathlib.Path),
+    help=(
+        "Run the command under cProfile and write the collected statistics in the "
+        "pstats format to the given path. Also reports the wall time spent in each "
+        "phase of the pipeline. Worker processes started with `--workers` are not "
+        "profiled."
+    ),
+)
 @click.pass_context
-def cli(ctx: click.Context, debug: bool, config: ConfigOption) -> None:
+def cli(
+    ctx: click.Context,
+    debug: bool,
+    config: ConfigOption,
+    profile: pathlib.Path | None,
+) -> None:
     logging.basicConfig(
         level=logging.DEBUG if debug else logging.WARNING,
     )
-    ctx.obj = lazy_object_proxy.Proxy(lambda: validate_config(ctx=ctx, fn=config))
+
+    profiler = Profiler(profile)
+
+    if profiler.enabled:
+        ctx.meta[PROFILER_KEY] = profiler
+        profiler.start()
+
+        def write_profile() -> None:
+            profiler.stop()
+            click.echo(profiler.report(), err=True)
+
+        ctx.call_on_close(write_profile)
+
+    def load_config() -> Settings:
+        with profiler.phase("config load"):
+            return validate_config(ctx=ctx, fn=config)
+
+    ctx.obj = lazy_object_proxy.Proxy(load_config)
 
 
 cli.add_command(apply)
@@ -1,20 +1,44 @@
 import asyncio
-import glob
+import collections
+import dataclasses
+import datetime
+import functools
+import json
+import multiprocessing
+import multiprocessing.synchronize
 import pathlib
+import re
 import signal
+import time
+import typing
+from abc import abstractmethod
+from collections.abc import AsyncGenerator, Coroutine
+from concurrent.futures import ProcessPoolExecutor, wait
 from contextlib import suppress
 from dataclasses import dataclass, field
 from enum import StrEnum
 from logging import getLogger
-from typing import IO, Any, Iterator, NoReturn, Sequence, Union
+from queue import Empty
+from typing import IO, Any, Callable, NoReturn, Sequence, Union
 
 import click
+from humanize import precisedelta
 from ironfence import Mutex
 from pydantic import Field
-from rich.console import Group, RenderableType
+from rich import get_console
+from rich.console import Console, Group, RenderableType
+from rich.table import Table
 from rich.text import Text
+from typing_extensions import override
 from vault_autopilot import dto
-from vault_autopilot.parser import AbstractManifestObject, ManifestParser
+from vault_autopilot.graph import partition, resource_key
+from vault_autopilot.manifest_cache import ManifestCache
+from vault_autopilot.parser import (
+    AbstractManifestObject,
+    ManifestFormat,
+    ManifestParser,
+    scan_kinds,
+)
 from vault_autopilot.processor.issuer import IssuerApplyProcessor
 from vault_autopilot.processor.password import PasswordApplyProcessor
 from vault_autopilot.processor.password_policy import PasswordPolicyApplyProcessor
@@ -27,6 +51,9 @@ from vault_autopilot.util.dependency_chain import DependencyChain
 
 from ... import _conf, exc
 from ..._pkg import asyva
+from ..._pkg.asyva.cache import CacheStats, ReadCache
+from ..._pkg.asyva.ratelimit import EndpointClass, RateLimiter, RateLimitStats
+from ..._pkg.asyva.singleflight import CoalescingStats, Singleflight
 from ...dispatcher import Dispatcher, event
 from ...service import (
     IssuerService,
@@ -38,8 +65,20 @@ from ...service import (
 )
 from ...service._issuer import IssuerSnapshot
 from ...service._secrets_engine import SecretsEngineSnapshot
+from ...telemetry import tracing
+from ...telemetry.loop_lag import LoopLagMonitor
+from ...telemetry.timeline import (
+    ResourceTiming,
+    Timeline,
+    create_trace_config,
+    mark,
+)
+from ...util.adaptive import AdaptiveSemaphore
 from ...util.coro import BoundlessSemaphore
+from ...util.hashing import stable_hash
+from ..discovery import ManifestDiscovery
 from ..exc import CLIError
+from ..profiling import Profiler
 from ..workflow import AbstractRenderer, AbstractStage, Workflow
 
 __all__ = ["apply"]
@@ -59,29 +98,244 @@ class RecordStyle(StrEnum):
     CRITICAL = "yellow"
 
 
+def format_record(resource_kind: str, absolute_path: str, status: str) -> Record:
+    """Describes a resource with the :data:`TEMPLATE_DICT` entry of its status."""
+    template = TEMPLATE_DICT[status]
+
+    return Record(
+        content=template[0].format(
+            resource_kind=resource_kind, absolute_path=absolute_path
+        ),
+        style=template[1],
+    )
+
+
+def compose_record_content(record: Record) -> RenderableType:
+    return Text(f"=> {record.content}", style=record.style)
+
+
 @dataclass(slots=True)
-class RecordRenderer(AbstractRenderer):
+class ResourceUpdate:
+    """
+    A change in the status of a resource. Sent as is by the worker processes, see
+    :func:`apply_shards`.
+
+    Attributes:
+        kind: The kind of the resource.
+        absolute_path: The absolute path of the resource.
+        status: A :data:`TEMPLATE_DICT` key.
+        error: The message of the error the resource failed with, if any.
+        timestamp: The time of the change, as returned by :func:`time.perf_counter`.
+    """
+
+    kind: str
+    absolute_path: str
+    status: str
+    error: str | None = None
+    timestamp: float = field(default_factory=time.perf_counter)
+
+
+@dataclass(slots=True)
+class ResourceRenderer(AbstractRenderer):
+    @abstractmethod
+    def update(self, update: ResourceUpdate) -> None:
+        """Takes the latest status of a resource."""
+
+    def expect(self, total: int) -> None:
+        """Takes the number of resources to apply, once all the manifests are
+        parsed."""
+
+
+@dataclass(slots=True)
+class RecordRenderer(ResourceRenderer):
+    """Shows a line per resource, updated in place as the resource is applied."""
+
     _records: dict[int, Record] = field(default_factory=dict)
 
-    def create_or_update_record(
-        self, record_uid: int, content: str, style: str = ""
-    ) -> Record:
-        record = Record(content=content, style=style)
+    def update(self, update: ResourceUpdate) -> None:
+        self._records[stable_hash(resource_key(update.kind, update.absolute_path))] = (
+            format_record(update.kind, update.absolute_path, update.status)
+        )
+        self.touch()
+
+    def compose_renderable(self) -> RenderableType:
+        return Group(*map(compose_record_content, self._records.values()))
+
+
+STATUS_OUTCOMES = {
+    "verify_success": "unchanged",
+    "update_success": "updated",
+    "create_success": "created",
+    "verify_error": "failed",
+    "update_error": "failed",
+    "create_error": "failed",
+}
+"""The outcomes of the resources, by the :data:`TEMPLATE_DICT` key of their final
+status."""
+
+OUTCOMES = ("created", "updated", "unchanged", "failed")
 
-        self._records.update({record_uid: record})
 
-        return record
+@dataclass(slots=True)
+class SummaryRenderer(ResourceRenderer):
+    """
+    Shows the number of resources of each kind by outcome, the rate they're applied
+    at and the estimated time left, along with the last few resources applied and the
+    last few failures. Unlike :class:`RecordRenderer`, the cost of a redraw doesn't
+    grow with the number of resources.
+
+    Attributes:
+        total: The number of resources to apply, once known. The estimated time left
+            is only shown then.
+        window: The number of the last applied resources to show.
+        failures_window: The number of the last failures to show.
+    """
+
+    total: int | None = None
+    window: int = 10
+    failures_window: int = 5
+    _counters: dict[str, collections.Counter[str]] = field(default_factory=dict)
+    _recent: collections.deque[Record] = field(init=False)
+    _failures: collections.deque[Record] = field(init=False)
+    _started_at: float | None = None
+    _finished: int = 0
+
+    def __post_init__(self) -> None:
+        self._recent = collections.deque(maxlen=self.window)
+        self._failures = collections.deque(maxlen=self.failures_window)
+
+    @override
+    def expect(self, total: int) -> None:
+        self.total = total
+        self.touch()
+
+    def update(self, update: ResourceUpdate) -> None:
+        counter = self._counters.setdefault(update.kind, collections.Counter())
+
+        if update.status == "application_requested":
+            if self._started_at is None:
+                self._started_at = time.monotonic()
+            counter["pending"] += 1
+        else:
+            record = format_record(update.kind, update.absolute_path, update.status)
+            outcome = STATUS_OUTCOMES[update.status]
+            counter["pending"] -= 1
+            counter[outcome] += 1
+            self._finished += 1
+            self._recent.append(record)
+
+            if outcome == "failed":
+                self._failures.append(record)
+
+        self.touch()
 
     def compose_renderable(self) -> RenderableType:
-        return Group(
-            *(
-                self._compose_record_content(record)
-                for record in self._records.values()
-            ),
+        table = Table(box=None, padding=(0, 2, 0, 0), show_edge=False)
+        table.add_column("KIND")
+
+        for column in ("pending", *OUTCOMES):
+            table.add_column(column.upper(), justify="right")
+
+        for kind, counter in sorted(self._counters.items()):
+            table.add_row(
+                kind,
+                str(max(counter["pending"], 0)),
+                *(str(counter[outcome]) for outcome in OUTCOMES),
+            )
+
+        renderables: list[RenderableType] = [table, Text(self._compose_progress())]
+
+        if self._recent:
+            renderables += [Text("Recent:"), *map(compose_record_content, self._recent)]
+        if self._failures:
+            renderables += [
+                Text("Failures:", style=RecordStyle.CRITICAL),
+                *map(compose_record_content, self._failures),
+            ]
+
+        return Group(*renderables)
+
+    def _compose_progress(self) -> str:
+        progress = "%d/%s resources applied" % (
+            self._finished,
+            "?" if self.total is None else self.total,
+        )
+
+        if self._started_at is None or not self._finished:
+            return progress
+
+        rate = self._finished / max(time.monotonic() - self._started_at, 1e-3)
+        progress += ", %.1f/s" % rate
+
+        if self.total is not None and self.total > self._finished:
+            progress += ", ETA %s" % precisedelta(
+                datetime.timedelta(seconds=(self.total - self._finished) / rate),
+                minimum_unit="seconds",
+                format="%0.0f",
+            )
+
+        return progress
+
+
+@dataclass(slots=True)
+class PlainRenderer(ResourceRenderer):
+    """
+    Prints a line as each resource is applied, for when the output isn't a terminal
+    (see :attr:`Workflow.live`). Nothing is kept around.
+    """
+
+    def update(self, update: ResourceUpdate) -> None:
+        if update.status == "application_requested":
+            return
+
+        click.echo(
+            "=> %s"
+            % format_record(update.kind, update.absolute_path, update.status).content
         )
 
-    def _compose_record_content(self, record: Record) -> RenderableType:
-        return Text(f"=> {record.content}", style=record.style)
+    def compose_renderable(self) -> RenderableType:
+        return Group()
+
+
+@dataclass(slots=True)
+class NdjsonRenderer(ResourceRenderer):
+    """
+    Writes a JSON object per resource event to a stream, for other tools to consume as
+    the resources are applied. Meant to be used without the live display (see
+    :attr:`Workflow.live`), the stream is buffered and flushed once the run is over.
+
+    Each line holds the kind, the absolute path and the status of the resource, the
+    outcome and the error message once it's applied, the number of seconds since the
+    start of the run (``elapsed``) and, once applied, the number of seconds since it
+    was requested (``duration``).
+    """
+
+    stream: IO[str]
+    _started_at: float = field(default_factory=time.perf_counter)
+    _requested_at: dict[int, float] = field(default_factory=dict)
+
+    def update(self, update: ResourceUpdate) -> None:
+        key = stable_hash(resource_key(update.kind, update.absolute_path))
+        line: dict[str, Any] = {
+            "kind": update.kind,
+            "path": update.absolute_path,
+            "status": update.status,
+            "elapsed": round(update.timestamp - self._started_at, 6),
+        }
+
+        if update.status == "application_requested":
+            self._requested_at[key] = update.timestamp
+        else:
+            line["outcome"] = STATUS_OUTCOMES[update.status]
+            line["error"] = update.error
+
+            if (requested_at := self._requested_at.pop(key, None)) is not None:
+                line["duration"] = round(update.timestamp - requested_at, 6)
+
+        self.stream.write(json.dumps(line) + "\n")
+
+    def compose_renderable(self) -> RenderableType:
+        return Group()
 
 
 class ManifestObject(AbstractManifestObject):
@@ -95,10 +349,46 @@ class ManifestObject(AbstractManifestObject):
     ) = Field(discriminator="kind")
 
 
+UPSTREAM_KINDS = frozenset(("SecretsEngine", "PasswordPolicy"))
+"""The kinds of the resources that the others depend on, along with the root issuers,
+i.e. the issuers without ``chaining``."""
+
+DOCUMENT_START_RE = re.compile(rb"^---(?=\s|$)|^(?=\{)", re.MULTILINE)
+"""Where the documents of a manifest file start: at a YAML ``---`` separator, or at
+a JSON object opened at the start of a line, i.e. each line of a newline-delimited
+JSON file."""
+
+CHAINING_RE = re.compile(rb"^[ \t]*chaining[ \t]*:|\"chaining\"\s*:", re.MULTILINE)
+
+
+def is_upstream(data: bytes) -> bool:
+    """Tells whether a manifest file defines resources that the others depend on, so
+    that it's parsed and dispatched first (see :attr:`ManifestParser.prioritize`).
+
+    A multi-document file is split into its documents to tell the root issuers from
+    the chained ones, since they may be defined in the same file."""
+    kinds = scan_kinds(data)
+
+    if not kinds.isdisjoint(UPSTREAM_KINDS):
+        return True
+
+    return "Issuer" in kinds and any(
+        "Issuer" in scan_kinds(doc) and CHAINING_RE.search(doc) is None
+        for doc in DOCUMENT_START_RE.split(data)
+    )
+
+
+RENDERERS: dict[str, type[ResourceRenderer]] = {
+    "records": RecordRenderer,
+    "summary": SummaryRenderer,
+    "plain": PlainRenderer,
+}
+
+
 @dataclass(slots=True)
 class ApplyManifestsStage(AbstractStage):
     title: str = "Applying manifests"
-    renderer: RecordRenderer = field(default_factory=RecordRenderer)
+    renderer: ResourceRenderer = field(default_factory=RecordRenderer)
 
 
 @dataclass(slots=True)
@@ -107,24 +397,61 @@ class AppContext:
     client: asyva.Client
     storage: KvV2SecretStorage
     workflow: Workflow
+    profiler: Profiler = field(default_factory=Profiler)
+    timeline: Timeline | None = None
+    tracer: tracing.Tracer | None = None
+    sem: asyncio.Semaphore = field(default_factory=BoundlessSemaphore)
+
+
+def create_client(settings: _conf.Settings) -> asyva.Client:
+    return asyva.Client(
+        transport=settings.transport,
+        retry=settings.retry,
+        rate_limit=settings.rate_limit,
+        cache=settings.cache,
+        token_cache=settings.token_cache,
+    )
 
 
-def handle_exception(ex: Exception, ctx: AppContext) -> NoReturn:
-    asyncio.get_event_loop().run_until_complete(
-        graceful_shutdown(ctx.workflow, ctx.client, "failed")
-    )
+def create_semaphore(
+    settings: _conf.Settings, client: asyva.Client
+) -> asyncio.Semaphore:
+    """Returns the semaphore that limits the number of resources applied concurrently.
+    An adaptive one is driven by the requests of the given client, so it must be
+    created before the client is authenticated."""
+    if not settings.concurrency.adaptive:
+        return BoundlessSemaphore()
+
+    sem = AdaptiveSemaphore(settings.concurrency)
+    client.trace_configs.append(sem.create_trace_config())
+    return sem
 
+
+def translate_exception(ex: Exception) -> CLIError:
+    """Converts an exception raised while applying manifests into a CLI error."""
     while True:
         if isinstance(ex, ExceptionGroup):
             ex = ex.exceptions[0]
             continue
         break
 
+    if isinstance(ex, CLIError):
+        return ex
+
     if isinstance(ex, asyva.exc.UnauthorizedError):
-        raise CLIError("Authorization failed: %s" % ex) from ex
+        return CLIError("Authorization failed: %s" % ex)
 
     if isinstance(ex, (exc.ManifestError, ConnectionRefusedError)):
-        raise CLIError(str(ex)) from ex
+        return CLIError(str(ex))
+
+    if isinstance(ex, asyva.exc.CircuitOpenError):
+        return CLIError(ex.message.format(ctx=ex.ctx), exit_code=128)
+
+    if isinstance(ex, asyva.exc.VaultDownError):
+        return CLIError(
+            "%s: Vault is sealed or unavailable" % ex.message.format(ctx=ex.ctx),
+            exit_code=128,
+        )
 
     if isinstance(
         ex,
@@ -139,310 +466,732 @@ def handle_exception(ex: Exception, ctx: AppContext) -> NoReturn:
     ):
         # TODO: print the contents of a YAML file, highlighting any invalid
         #  lines.
-        raise CLIError(str(ex), exit_code=128) from ex
-
-    if isinstance(ex, CLIError):
-        raise ex
+        return CLIError(str(ex), exit_code=128)
 
     logger.debug(ex, exc_info=ex)
-    raise CLIError("Unexpected error: %r" % ex, exit_code=128) from ex
+    return CLIError("Unexpected error: %r" % ex, exit_code=128)
 
 
-async def async_apply(
-    ctx: AppContext,
-    patterns: Sequence[str],
-    recursive: bool,
-    stage: ApplyManifestsStage,
-) -> None:
-    client = ctx.client
-    queue = asyncio.Queue[ManifestObject | None]()
-    unresolved_deps: list[exc.UnresolvedDependencyError] = []
+def handle_exception(ex: Exception, ctx: AppContext) -> NoReturn:
+    asyncio.get_event_loop().run_until_complete(
+        graceful_shutdown(ctx.workflow, ctx.client, "failed")
+    )
 
-    async def configure_dispatcher() -> (
-        Dispatcher[ManifestObject | None, event.EventType]
-    ):
-        observer, sem = event.EventObserver[event.EventType](), BoundlessSemaphore()
+    err = translate_exception(ex)
 
-        def proc_kwargs() -> dict[str, Any]:
-            return {
-                "sem": sem,
-                "client": client,
-                "observer": observer,
-            }
+    if err is ex:
+        raise err
 
-        def event_builder(
-            payload: ManifestObject | None,
-        ) -> event.ResourceApplicationRequested | event.ShutdownRequested:
-            if payload is None:
-                return event.ShutdownRequested()
-
-            root = payload.root
-            match root.kind:
-                case "Password":
-                    assert isinstance(root, dto.PasswordApplyDTO)
-                    return event.PasswordApplicationRequested(root)
-                case "Issuer":
-                    assert isinstance(root, dto.IssuerApplyDTO)
-                    return event.IssuerApplicationRequested(root)
-                case "PasswordPolicy":
-                    assert isinstance(root, dto.PasswordPolicyApplyDTO)
-                    return event.PasswordPolicyApplicationRequested(root)
-                case "PKIRole":
-                    assert isinstance(root, dto.PKIRoleApplyDTO)
-                    return event.PKIRoleApplicationRequested(root)
-                case "SecretsEngine":
-                    assert isinstance(root, dto.SecretsEngineApplyDTO)
-                    return event.SecretsEngineApplicationRequested(root)
-                case "SSHKey":
-                    assert isinstance(root, dto.SSHKeyApplyDTO)
-                    return event.SSHKeyApplicationRequested(root)
-
-                case _:
-                    raise TypeError("Unexpected payload type: %r" % payload)
-
-        dispatcher = Dispatcher[ManifestObject | None, event.EventType](
-            client=client,
-            observer=observer,
-            event_builder=event_builder,
-            processing_registry={
-                "Password": PasswordApplyProcessor(
-                    pwd_svc=PasswordService(client),
-                    # TODO: Allow processors to share the same dependency chain to
-                    #  reduce memory consumption.
-                    dep_chain=Mutex(DependencyChain()),
-                    shutdown_event=event.ShutdownRequested,
-                    **proc_kwargs(),
-                ),
-                "Issuer": IssuerApplyProcessor(
-                    iss_svc=IssuerService(
-                        client, SnapshotRepo("issuer_", ctx.storage, IssuerSnapshot)
-                    ),
-                    dep_chain=Mutex(DependencyChain()),
-                    shutdown_event=event.ShutdownRequested,
-                    **proc_kwargs(),
-                ),
-                "PasswordPolicy": PasswordPolicyApplyProcessor(
-                    pwd_policy_svc=PasswordPolicyService(client), **proc_kwargs()
-                ),
-                "PKIRole": PKIRoleApplyProcessor(
-                    pki_role_svc=PKIRoleService(client),
-                    dep_chain=Mutex(DependencyChain()),
-                    shutdown_event=event.ShutdownRequested,
-                    **proc_kwargs(),
-                ),
-                "SecretsEngine": SecretsEngineApplyProcessor(
-                    secrets_engine_svc=SecretsEngineService(
-                        client,
-                        SnapshotRepo(
-                            "secrets_engine_", ctx.storage, SecretsEngineSnapshot
-                        ),
-                    ),
-                    **proc_kwargs(),
-                ),
-                "SSHKey": SSHKeyApplyProcessor(
-                    ssh_key_svc=SSHKeyService(client),
-                    dep_chain=Mutex(DependencyChain()),
-                    shutdown_event=event.ShutdownRequested,
-                    **proc_kwargs(),
-                ),
-            },
-            queue=queue,
-        )
+    raise err from ex
 
-        TEMPLATE_DICT = {
-            "application_requested": (
-                "Applying {resource_kind} {absolute_path!r}...",
-                RecordStyle.INFO,
-            ),
-            "verify_success": (
-                "Verifying integrity of {resource_kind} {absolute_path!r}... done",
-                RecordStyle.INFO,
+
+TEMPLATE_DICT = {
+    "application_requested": (
+        "Applying {resource_kind} {absolute_path!r}...",
+        RecordStyle.INFO,
+    ),
+    "verify_success": (
+        "Verifying integrity of {resource_kind} {absolute_path!r}... done",
+        RecordStyle.INFO,
+    ),
+    "verify_error": (
+        "Verifying integrity of {resource_kind} {absolute_path!r}... FAILED",
+        RecordStyle.CRITICAL,
+    ),
+    "update_success": (
+        "Updating {resource_kind} {absolute_path!r}... done",
+        RecordStyle.INFO,
+    ),
+    "update_error": (
+        "Updating {resource_kind} {absolute_path!r}... FAILED",
+        RecordStyle.CRITICAL,
+    ),
+    "create_success": (
+        "Creating {resource_kind} {absolute_path!r}... done",
+        RecordStyle.INFO,
+    ),
+    "create_error": (
+        "Creating {resource_kind} {absolute_path!r}... FAILED",
+        RecordStyle.CRITICAL,
+    ),
+}
+
+ResourceEvent = Union[
+    event.ResourceApplicationRequested,
+    event.ResourceApplicationInitiated,
+    event.ResourceApplySuccess,
+    event.ResourceApplyError,
+]
+ResourceEventCallback = Callable[[ResourceEvent], Coroutine[Any, Any, None]]
+UnresolvedDepsCallback = Callable[
+    [event.UnresolvedDepsDetected], Coroutine[Any, Any, None]
+]
+
+
+def event_status(ev: ResourceEvent) -> str | None:
+    """
+    Returns the key of the :data:`TEMPLATE_DICT` entry that describes the given event,
+    or ``None`` if the event isn't meant to be displayed.
+    """
+    if isinstance(ev, event.ResourceApplicationRequested):
+        return "application_requested"
+    elif isinstance(ev, event.ResourceApplicationInitiated):
+        return None
+    elif isinstance(ev, event.ResourceVerifySuccess):
+        return "verify_success"
+    elif isinstance(ev, event.ResourceVerifyError):
+        return "verify_error"
+    elif isinstance(ev, event.ResourceUpdateSuccess):
+        return "update_success"
+    elif isinstance(ev, event.ResourceUpdateError):
+        return "update_error"
+    elif isinstance(ev, event.ResourceCreateSuccess):
+        return "create_success"
+    elif isinstance(ev, event.ResourceCreateError):
+        return "create_error"
+
+    raise RuntimeError("Unexpected event type: %r" % ev)
+
+
+def resource_update(ev: ResourceEvent) -> ResourceUpdate | None:
+    """Describes the given event, or returns ``None`` if the event isn't meant to be
+    displayed."""
+    if (status := event_status(ev)) is None:
+        return None
+
+    error = ev.error if isinstance(ev, event.ResourceApplyError) else None
+
+    return ResourceUpdate(
+        ev.resource.kind,
+        ev.resource.absolute_path(),
+        status,
+        translate_exception(error).message if error is not None else None,
+    )
+
+
+def mark_event(ev: ResourceEvent) -> None:
+    """Records the timing boundary the given event stands for, see
+    :mod:`vault_autopilot.telemetry.timeline`."""
+    if isinstance(ev, event.ResourceApplicationRequested):
+        mark(ev.resource, "requested")
+    elif isinstance(ev, event.ResourceApplicationInitiated):
+        # marked once the processor acquires a semaphore slot, see
+        # :meth:`AbstractProcessor.slot`
+        return
+    else:
+        mark(ev.resource, "finished")
+
+
+def event_builder(
+    payload: ManifestObject | None,
+) -> event.ResourceApplicationRequested | event.ShutdownRequested:
+    if payload is None:
+        return event.ShutdownRequested()
+
+    root = payload.root
+    match root.kind:
+        case "Password":
+            assert isinstance(root, dto.PasswordApplyDTO)
+            return event.PasswordApplicationRequested(root)
+        case "Issuer":
+            assert isinstance(root, dto.IssuerApplyDTO)
+            return event.IssuerApplicationRequested(root)
+        case "PasswordPolicy":
+            assert isinstance(root, dto.PasswordPolicyApplyDTO)
+            return event.PasswordPolicyApplicationRequested(root)
+        case "PKIRole":
+            assert isinstance(root, dto.PKIRoleApplyDTO)
+            return event.PKIRoleApplicationRequested(root)
+        case "SecretsEngine":
+            assert isinstance(root, dto.SecretsEngineApplyDTO)
+            return event.SecretsEngineApplicationRequested(root)
+        case "SSHKey":
+            assert isinstance(root, dto.SSHKeyApplyDTO)
+            return event.SSHKeyApplicationRequested(root)
+
+        case _:
+            raise TypeError("Unexpected payload type: %r" % payload)
+
+
+def configure_dispatcher(
+    client: asyva.Client,
+    storage: KvV2SecretStorage,
+    queue: asyncio.Queue[ManifestObject | None],
+    on_resource_update: ResourceEventCallback,
+    on_unresolved_deps_detected: UnresolvedDepsCallback,
+    sem: asyncio.Semaphore | None = None,
+) -> Dispatcher[ManifestObject | None, event.EventType]:
+    observer = event.EventObserver[event.EventType]()
+    sem = sem if sem is not None else BoundlessSemaphore()
+
+    def proc_kwargs() -> dict[str, Any]:
+        return {
+            "sem": sem,
+            "client": client,
+            "observer": observer,
+        }
+
+    dispatcher = Dispatcher[ManifestObject | None, event.EventType](
+        client=client,
+        observer=observer,
+        event_builder=event_builder,
+        processing_registry={
+            "Password": PasswordApplyProcessor(
+                pwd_svc=PasswordService(client),
+                # TODO: Allow processors to share the same dependency chain to
+                #  reduce memory consumption.
+                dep_chain=Mutex(DependencyChain()),
+                shutdown_event=event.ShutdownRequested,
+                **proc_kwargs(),
             ),
-            "verify_error": (
-                "Verifying integrity of {resource_kind} {absolute_path!r}... FAILED",
-                RecordStyle.CRITICAL,
+            "Issuer": IssuerApplyProcessor(
+                iss_svc=IssuerService(
+                    client, SnapshotRepo("issuer_", storage, IssuerSnapshot)
+                ),
+                dep_chain=Mutex(DependencyChain()),
+                shutdown_event=event.ShutdownRequested,
+                **proc_kwargs(),
             ),
-            "update_success": (
-                "Updating {resource_kind} {absolute_path!r}... done",
-                RecordStyle.INFO,
+            "PasswordPolicy": PasswordPolicyApplyProcessor(
+                pwd_policy_svc=PasswordPolicyService(client), **proc_kwargs()
             ),
-            "update_error": (
-                "Updating {resource_kind} {absolute_path!r}... FAILED",
-                RecordStyle.CRITICAL,
+            "PKIRole": PKIRoleApplyProcessor(
+                pki_role_svc=PKIRoleService(client),
+                dep_chain=Mutex(DependencyChain()),
+                shutdown_event=event.ShutdownRequested,
+                **proc_kwargs(),
             ),
-            "create_success": (
-                "Creating {resource_kind} {absolute_path!r}... done",
-                RecordStyle.INFO,
+            "SecretsEngine": SecretsEngineApplyProcessor(
+                secrets_engine_svc=SecretsEngineService(
+                    client,
+                    SnapshotRepo("secrets_engine_", storage, SecretsEngineSnapshot),
+                ),
+                **proc_kwargs(),
             ),
-            "create_error": (
-                "Creating {resource_kind} {absolute_path!r}... FAILED",
-                RecordStyle.CRITICAL,
+            "SSHKey": SSHKeyApplyProcessor(
+                ssh_key_svc=SSHKeyService(client),
+                dep_chain=Mutex(DependencyChain()),
+                shutdown_event=event.ShutdownRequested,
+                **proc_kwargs(),
             ),
-        }
+        },
+        queue=queue,
+    )
 
-        async def on_resource_update(
-            ev: Union[
-                event.ResourceApplicationRequested,
-                event.ResourceApplicationInitiated,
-                event.ResourceApplySuccess,
-                event.ResourceApplyError,
-            ],
-        ) -> None:
-            if isinstance(ev, event.ResourceApplicationRequested):
-                template = TEMPLATE_DICT["application_requested"]
-            elif isinstance(ev, event.ResourceApplicationInitiated):
-                return
-            elif isinstance(ev, event.ResourceVerifySuccess):
-                template = TEMPLATE_DICT["verify_success"]
-            elif isinstance(ev, event.ResourceVerifyError):
-                template = TEMPLATE_DICT["verify_error"]
-            elif isinstance(ev, event.ResourceUpdateSuccess):
-                template = TEMPLATE_DICT["update_success"]
-            elif isinstance(ev, event.ResourceUpdateError):
-                template = TEMPLATE_DICT["update_error"]
-            elif isinstance(ev, event.ResourceCreateSuccess):
-                template = TEMPLATE_DICT["create_success"]
-            elif isinstance(ev, event.ResourceCreateError):
-                template = TEMPLATE_DICT["create_error"]
-            else:
-                raise RuntimeError("Unexpected event type: %r" % ev)
-
-            path = ev.resource.absolute_path()
-            stage.renderer.create_or_update_record(
-                record_uid=hash(ev.resource.__class__.__name__ + path),
-                content=template[0].format(
-                    resource_kind=ev.resource.kind,
-                    absolute_path=path,
-                ),
-                style=template[1],
-            )
+    dispatcher.register_handler(
+        (
+            event.PasswordApplicationRequested,
+            event.PasswordApplicationInitiated,
+            event.PasswordUpdateError,
+            event.PasswordCreateError,
+            event.PasswordVerifyError,
+            event.PasswordCreateSuccess,
+            event.PasswordUpdateSuccess,
+            event.PasswordVerifySuccess,
+            event.IssuerApplicationRequested,
+            event.IssuerApplicationInitiated,
+            event.IssuerCreateError,
+            event.IssuerUpdateError,
+            event.IssuerVerifyError,
+            event.IssuerCreateSuccess,
+            event.IssuerUpdateSuccess,
+            event.IssuerVerifySuccess,
+            event.PasswordPolicyApplicationRequested,
+            event.PasswordPolicyApplicationInitiated,
+            event.PasswordPolicyVerifyError,
+            event.PasswordPolicyUpdateError,
+            event.PasswordPolicyCreateError,
+            event.PasswordPolicyCreateSuccess,
+            event.PasswordPolicyUpdateSuccess,
+            event.PasswordPolicyVerifySuccess,
+            event.PKIRoleApplicationRequested,
+            event.PKIRoleApplicationInitiated,
+            event.PKIRoleUpdateError,
+            event.PKIRoleCreateError,
+            event.PKIRoleVerifyError,
+            event.PKIRoleCreateSuccess,
+            event.PKIRoleUpdateSuccess,
+            event.PKIRoleVerifySuccess,
+            event.SecretsEngineApplicationRequested,
+            event.SecretsEngineApplicationInitiated,
+            event.SecretsEngineUpdateError,
+            event.SecretsEngineCreateError,
+            event.SecretsEngineVerifyError,
+            event.SecretsEngineCreateSuccess,
+            event.SecretsEngineUpdateSuccess,
+            event.SecretsEngineVerifySuccess,
+            event.SSHKeyApplicationRequested,
+            event.SSHKeyApplicationInitiated,
+            event.SSHKeyCreateError,
+            event.SSHKeyUpdateError,
+            event.SSHKeyVerifyError,
+            event.SSHKeyCreateSuccess,
+            event.SSHKeyUpdateSuccess,
+            event.SSHKeyVerifySuccess,
+        ),
+        callback=on_resource_update,
+    )
+    dispatcher.register_handler(
+        (event.UnresolvedDepsDetected,), callback=on_unresolved_deps_detected
+    )
 
-        async def on_unresolved_deps_detected(ev: event.UnresolvedDepsDetected) -> None:
-            unresolved_deps.extend([*ev.unresolved_deps])
+    return dispatcher
 
-        dispatcher.register_handler(
-            (
-                event.PasswordApplicationRequested,
-                event.PasswordApplicationInitiated,
-                event.PasswordUpdateError,
-                event.PasswordCreateError,
-                event.PasswordVerifyError,
-                event.PasswordCreateSuccess,
-                event.PasswordUpdateSuccess,
-                event.PasswordVerifySuccess,
-                event.IssuerApplicationRequested,
-                event.IssuerApplicationInitiated,
-                event.IssuerCreateError,
-                event.IssuerUpdateError,
-                event.IssuerVerifyError,
-                event.IssuerCreateSuccess,
-                event.IssuerUpdateSuccess,
-                event.IssuerVerifySuccess,
-                event.PasswordPolicyApplicationRequested,
-                event.PasswordPolicyApplicationInitiated,
-                event.PasswordPolicyVerifyError,
-                event.PasswordPolicyUpdateError,
-                event.PasswordPolicyCreateError,
-                event.PasswordPolicyCreateSuccess,
-                event.PasswordPolicyUpdateSuccess,
-                event.PasswordPolicyVerifySuccess,
-                event.PKIRoleApplicationRequested,
-                event.PKIRoleApplicationInitiated,
-                event.PKIRoleUpdateError,
-                event.PKIRoleCreateError,
-                event.PKIRoleVerifyError,
-                event.PKIRoleCreateSuccess,
-                event.PKIRoleUpdateSuccess,
-                event.PKIRoleVerifySuccess,
-                event.SecretsEngineApplicationRequested,
-                event.SecretsEngineApplicationInitiated,
-                event.SecretsEngineUpdateError,
-                event.SecretsEngineCreateError,
-                event.SecretsEngineVerifyError,
-                event.SecretsEngineCreateSuccess,
-                event.SecretsEngineUpdateSuccess,
-                event.SecretsEngineVerifySuccess,
-                event.SSHKeyApplicationRequested,
-                event.SSHKeyApplicationInitiated,
-                event.SSHKeyCreateError,
-                event.SSHKeyUpdateError,
-                event.SSHKeyVerifyError,
-                event.SSHKeyCreateSuccess,
-                event.SSHKeyUpdateSuccess,
-                event.SSHKeyVerifySuccess,
-            ),
-            callback=on_resource_update,
+
+@dataclass(slots=True)
+class ShardResult:
+    """
+    The outcome of applying a shard of manifests in a worker process.
+
+    Attributes:
+        snapshot_updates: The snapshot storage entries the worker created or changed.
+        unresolved_deps: Formatted messages about unresolved dependencies.
+        error: The message and the exit code of the error that aborted the shard, if
+            any. Exceptions aren't sent across processes as is, since not all of them
+            survive pickling.
+        timings: The timings of the resources, if requested.
+        trace_events: The trace events collected by the worker, if requested.
+        rate_limit_stats: The statistics of the rate limiter of the worker, if any
+            limit is configured.
+        coalescing_stats: The statistics of the reads coalesced by the worker.
+        cache_stats: The statistics of the read cache of the worker, if enabled.
+    """
+
+    snapshot_updates: dict[str, Any] = field(default_factory=dict)
+    unresolved_deps: list[str] = field(default_factory=list)
+    error: tuple[str, int] | None = None
+    timings: list[ResourceTiming] = field(default_factory=list)
+    trace_events: list[tracing.TraceEvent] = field(default_factory=list)
+    rate_limit_stats: dict[EndpointClass, RateLimitStats] = field(default_factory=dict)
+    coalescing_stats: dict[str, CoalescingStats] = field(default_factory=dict)
+    cache_stats: dict[str, CacheStats] = field(default_factory=dict)
+
+
+SHARD_STOP_POLL_INTERVAL = 0.1
+"""How often the workers check whether the parent asked them to stop, in seconds."""
+
+_shard_events: "multiprocessing.Queue[ResourceUpdate | None] | None" = None
+_shard_stop: "multiprocessing.synchronize.Event | None" = None
+
+
+def _init_shard_worker(
+    events: "multiprocessing.Queue[ResourceUpdate | None]",
+    stop: "multiprocessing.synchronize.Event",
+) -> None:
+    global _shard_events, _shard_stop
+
+    # Termination signals are handled by the parent process, which asks the workers
+    # to stop (see ``stop``) and waits for them to report what they applied.
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+    _shard_events, _shard_stop = events, stop
+
+
+def run_shard(
+    settings: _conf.Settings,
+    storage_data: dict[Any, Any],
+    manifests: Sequence[ManifestObject],
+    timings: bool = False,
+    trace: bool = False,
+) -> ShardResult:
+    """Applies the given manifests in a worker process, see :func:`apply_shards`."""
+    assert (
+        _shard_events is not None and _shard_stop is not None
+    ), "The shard worker isn't initialized"
+
+    try:
+        return asyncio.run(
+            _apply_shard(
+                settings,
+                storage_data,
+                manifests,
+                _shard_events,
+                _shard_stop,
+                timings,
+                trace,
+            )
         )
-        dispatcher.register_handler(
-            (event.UnresolvedDepsDetected,), callback=on_unresolved_deps_detected
+    finally:
+        # Let the parent know that no more events will come from this shard
+        _shard_events.put(None)
+
+
+async def _apply_shard(
+    settings: _conf.Settings,
+    storage_data: dict[Any, Any],
+    manifests: Sequence[ManifestObject],
+    events: "multiprocessing.Queue[ResourceUpdate | None]",
+    stop: "multiprocessing.synchronize.Event",
+    timings: bool,
+    trace: bool,
+) -> ShardResult:
+    client, queue, result = (
+        create_client(settings),
+        asyncio.Queue[ManifestObject | None](),
+        ShardResult(),
+    )
+
+    timeline = Timeline() if timings else None
+
+    if timeline is not None:
+        timeline.activate()
+        client.trace_configs.append(create_trace_config())
+
+    tracer = tracing.Tracer() if trace else None
+
+    if tracer is not None:
+        tracer.activate()
+        client.trace_configs.append(tracing.create_trace_config())
+
+    sem = create_semaphore(settings, client)
+
+    storage = KvV2SecretStorage(
+        secrets_engine_path=settings.storage["secrets_engine_path"],
+        snapshots_secret_path=settings.storage["snapshots_secret_path"],
+        client=client,
+    )
+    storage.data = dict(storage_data)
+
+    async def on_resource_update(ev: ResourceEvent) -> None:
+        mark_event(ev)
+
+        if (update := resource_update(ev)) is not None:
+            events.put(update)
+
+    async def on_unresolved_deps_detected(ev: event.UnresolvedDepsDetected) -> None:
+        result.unresolved_deps.extend(map(str, ev.unresolved_deps))
+
+    async def cancel_when_stopped(task: asyncio.Task[Any]) -> None:
+        while not stop.is_set():
+            await asyncio.sleep(SHARD_STOP_POLL_INTERVAL)
+
+        task.cancel()
+
+    for manifest in manifests:
+        queue.put_nowait(manifest)
+    queue.put_nowait(None)
+
+    current = asyncio.current_task()
+    assert current is not None
+    watcher = asyncio.create_task(cancel_when_stopped(current))
+
+    try:
+        await client.authenticate(
+            base_url=settings.base_url,
+            authn=settings.auth,
+            namespace=settings.default_namespace,
         )
+        await configure_dispatcher(
+            client,
+            storage,
+            queue,
+            on_resource_update,
+            on_unresolved_deps_detected,
+            sem,
+        ).dispatch()
+    except asyncio.CancelledError:
+        # Stopped by the parent, which still merges the snapshots of the resources
+        # written so far
+        result.error = ("Aborted", 1)
+    except Exception as ex:
+        err = translate_exception(ex)
+        result.error = (err.message, err.exit_code)
+    finally:
+        watcher.cancel()
 
-        return dispatcher
+        result.snapshot_updates = {
+            key: value
+            for key, value in storage.data.items()
+            if storage_data.get(key) != value
+        }
 
-    def stream_data_from_files() -> Iterator[IO[bytes]]:
-        """Yields an iterator of binary file objects for regular files matching given
-        patterns (simple filenames or globs). Skips dirs if ``recursive`` is ``False``;
-        otherwise, includes all matching files in the dir."""
-        for pat in patterns:
-            counter = 0
+        if timeline is not None:
+            # Both processes read the same monotonic clock, so the parent can merge
+            # the timestamps as is
+            result.timings = list(timeline.resources.values())
 
-            for counter, fn in enumerate(
-                (
-                    fn
-                    for fn in glob.iglob(pat, recursive=recursive)
-                    if not pathlib.Path(fn).is_dir()
-                ),
-                1,
-            ):
-                logger.debug("streaming manifest %r", fn)
-                yield open(fn, "rb")
-
-            if counter == 0:
-                raise CLIError(
-                    "No files were found that match the pattern %r. Make sure the "
-                    "pattern matches at least one existing regular file, or use the -R "
-                    "option to search recursively." % pat
+        if tracer is not None:
+            result.trace_events = tracer.events
+
+        if (limiter := client.rate_limiter) is not None:
+            result.rate_limit_stats = limiter.stats
+
+        result.coalescing_stats = client.singleflight.stats
+
+        if (cache := client.read_cache) is not None:
+            result.cache_stats = cache.stats
+
+        await client.close()
+
+    return result
+
+
+async def apply_shards(
+    settings: _conf.Settings,
+    storage: KvV2SecretStorage,
+    shards: Sequence[Sequence[ManifestObject]],
+    on_event: Callable[[ResourceUpdate], None],
+    unresolved_deps: list[str],
+    timeline: Timeline | None = None,
+    tracer: tracing.Tracer | None = None,
+    rate_limiter: RateLimiter | None = None,
+    singleflight: Singleflight | None = None,
+    read_cache: ReadCache | None = None,
+) -> None:
+    """
+    Applies each shard in a separate worker process.
+
+    Every worker runs its own event loop, client and dispatcher. Resource events are
+    streamed back to the parent through a queue and passed to ``on_event``, while the
+    snapshot updates and the unresolved dependencies are merged once the workers are
+    done. The rate limits are split evenly between the workers.
+
+    If the run is aborted, the workers are asked to stop, and the snapshot updates they
+    made until then are merged as well.
+
+    Raises:
+        CLIError: If any of the shards failed. The snapshot updates of all shards are
+            merged before raising, so that they can still be pushed to the storage.
+    """
+    loop, mp_ctx = asyncio.get_running_loop(), multiprocessing.get_context("spawn")
+    settings = settings.model_copy(
+        update={"rate_limit": settings.rate_limit.split(len(shards))}
+    )
+    events: "multiprocessing.Queue[ResourceUpdate | None]" = mp_ctx.Queue()
+    stop = mp_ctx.Event()
+    pool = ProcessPoolExecutor(
+        max_workers=len(shards),
+        mp_context=mp_ctx,
+        initializer=_init_shard_worker,
+        initargs=(events, stop),
+    )
+
+    def merge(result: ShardResult) -> None:
+        storage.update(result.snapshot_updates)
+        unresolved_deps.extend(result.unresolved_deps)
+
+        if timeline is not None:
+            timeline.merge(result.timings)
+        if tracer is not None:
+            tracer.merge(result.trace_events)
+        if rate_limiter is not None:
+            rate_limiter.merge(result.rate_limit_stats)
+        if singleflight is not None:
+            singleflight.merge(result.coalescing_stats)
+        if read_cache is not None:
+            read_cache.merge(result.cache_stats)
+
+    # The futures of the pool rather than those of the loop, which would be cancelled
+    # along with the task waiting for them
+    futures = [
+        pool.submit(
+            run_shard,
+            settings,
+            dict(storage.data),
+            tuple(shard),
+            timeline is not None,
+            tracer is not None,
+        )
+        for shard in shards
+    ]
+
+    try:
+        finished = 0
+
+        while finished < len(futures):
+            try:
+                item = await loop.run_in_executor(
+                    None, functools.partial(events.get, timeout=0.1)
                 )
+            except Empty:
+                # a worker that crashed will never report its completion
+                if all(fut.done() for fut in futures) and any(
+                    not fut.cancelled() and fut.exception() is not None
+                    for fut in futures
+                ):
+                    break
+                continue
+
+            if item is None:
+                finished += 1
+            else:
+                on_event(item)
 
-            logger.debug("found %d manifest(s) matching pattern %r", counter, pat)
+        results: list[ShardResult] = await asyncio.gather(
+            *map(asyncio.wrap_future, futures)
+        )
+    except asyncio.CancelledError:
+        # The workers cancel their dispatch and return what they applied so far, which
+        # is merged all the same, since the storage is still pushed on abort
+        stop.set()
+        for fut in futures:
+            fut.cancel()
 
-    def stream_data_from_stdin() -> Iterator[IO[bytes]]:
-        """Yields an iterator of binary data from standard input."""
-        yield click.get_binary_stream("stdin")
+        await asyncio.shield(asyncio.to_thread(functools.partial(wait, futures)))
 
-    async def handle_manifests():
-        await client.authenticate(
-            base_url=ctx.settings.base_url,
-            authn=ctx.settings.auth,
-            namespace=ctx.settings.default_namespace,
+        with suppress(Empty):
+            while True:
+                if (item := events.get_nowait()) is not None:
+                    on_event(item)
+
+        for fut in futures:
+            if not fut.cancelled() and fut.exception() is None:
+                merge(fut.result())
+
+        raise
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    for result in results:
+        merge(result)
+
+    if errors := [result.error for result in results if result.error is not None]:
+        raise CLIError(*errors[0])
+
+
+async def async_apply(
+    ctx: AppContext,
+    patterns: Sequence[str],
+    recursive: bool,
+    stage: ApplyManifestsStage,
+    workers: int = 1,
+    parse_workers: int = 0,
+    manifest_format: ManifestFormat | None = None,
+) -> None:
+    client = ctx.client
+    queue = asyncio.Queue[ManifestObject | None]()
+    unresolved_deps: list[str] = []
+
+    if ctx.timeline is not None:
+        ctx.timeline.activate()
+    if ctx.tracer is not None:
+        ctx.tracer.activate()
+
+    def render_record(update: ResourceUpdate) -> None:
+        if update.status in ("create_success", "update_success"):
+            ctx.profiler.milestone("first write")
+
+        stage.renderer.update(update)
+
+    async def on_resource_update(ev: ResourceEvent) -> None:
+        mark_event(ev)
+
+        if (update := resource_update(ev)) is not None:
+            render_record(update)
+
+    async def on_unresolved_deps_detected(ev: event.UnresolvedDepsDetected) -> None:
+        unresolved_deps.extend(map(str, ev.unresolved_deps))
+
+    async def stream_data_from_stdin() -> AsyncGenerator[tuple[str, bytes], None]:
+        """Yields the binary data read from standard input."""
+        with click.get_binary_stream("stdin") as buf:
+            yield buf.name, await asyncio.to_thread(buf.read)
+
+    def raise_no_data_error() -> NoReturn:
+        raise CLIError(
+            "No data was found in the provided input. Please check your input "
+            "data and try again."
         )
-        await ctx.storage.initialize()
-        await ctx.storage.pull()
 
-        num = await (await configure_dispatcher()).dispatch()
+    async def prepare() -> None:
+        # Runs alongside the parser, which yields to the loop after each file, so the
+        # manifests parsed in the meantime are buffered in the queue until the
+        # dispatcher starts
+        with ctx.profiler.phase("authenticate"):
+            await client.authenticate(
+                base_url=ctx.settings.base_url,
+                authn=ctx.settings.auth,
+                namespace=ctx.settings.default_namespace,
+            )
+
+        with ctx.profiler.phase("storage init/pull"):
+            await ctx.storage.initialize_and_pull()
+
+        ctx.profiler.milestone("ready to dispatch")
+
+    async def handle_manifests():
+        await prepare()
+
+        with ctx.profiler.phase("dispatch"):
+            num = await configure_dispatcher(
+                client,
+                ctx.storage,
+                queue,
+                on_resource_update,
+                on_unresolved_deps_detected,
+                ctx.sem,
+            ).dispatch()
 
         if num == 0:
-            raise CLIError(
-                "No data was found in the provided input. Please check your input "
-                "data and try again."
+            raise_no_data_error()
+
+    async def handle_manifests_sharded():
+        await prepare()
+
+        # The dependency graph is only known once every manifest has been parsed
+        manifests: list[ManifestObject] = []
+        while (item := await queue.get()) is not None:
+            manifests.append(item)
+
+        if not manifests:
+            raise_no_data_error()
+
+        shards = partition(manifests, workers, key=lambda manifest: manifest.root)
+        logger.debug(
+            "split %d manifest(s) into %d shard(s)", len(manifests), len(shards)
+        )
+
+        with ctx.profiler.phase("dispatch"):
+            await apply_shards(
+                ctx.settings,
+                ctx.storage,
+                shards,
+                render_record,
+                unresolved_deps,
+                ctx.timeline,
+                ctx.tracer,
+                ctx.client.rate_limiter,
+                ctx.client.singleflight,
+                ctx.client.read_cache,
             )
 
+    async def parse_manifests() -> None:
+        parser = ManifestParser(
+            (
+                ManifestDiscovery(patterns, recursive=recursive).read()
+                if patterns
+                else stream_data_from_stdin()
+            ),
+            ManifestObject,
+            queue,
+            workers=parse_workers,
+            format=manifest_format,
+            # The sharded mode waits for all the manifests before dispatching
+            prioritize=is_upstream if workers == 1 else None,
+            cache=(
+                ManifestCache(ctx.settings.manifest_cache)
+                if ctx.settings.manifest_cache.enabled
+                else None
+            ),
+        )
+
+        with ctx.profiler.phase("parse"):
+            await parser.execute()
+
+        stage.renderer.expect(parser.parsed)
+
     async with asyncio.TaskGroup() as tg:
-        tg.create_task(handle_manifests())
         tg.create_task(
-            ManifestParser(
-                stream_data_from_files() if patterns else stream_data_from_stdin(),
-                ManifestObject,
-                queue,
-            ).execute()
+            handle_manifests() if workers == 1 else handle_manifests_sharded()
         )
+        tg.create_task(parse_manifests())
 
     if unresolved_deps:
         raise CLIError(
             "Unable to continue due to unresolved dependencies. The following "
             "resources reference undefined dependencies:\n%s\n\nPlease ensure that all "
             "dependencies are defined before they are used."
-            % "\n".join(("  * " + str(err) for err in unresolved_deps))
+            % "\n".join(("  * " + err for err in unresolved_deps))
         )
 
 
@@ -454,7 +1203,9 @@ async def graceful_shutdown(workflow: Workflow, client: asyva.Client, reason: st
 
         if is_failed:
             click.secho(
-                "\nOops! Something went wrong while applying the manifests.\n", fg="red"
+                "\nOops! Something went wrong while applying the manifests.\n",
+                fg="red",
+                err=workflow.console.stderr,
             )
 
     if is_failed:
@@ -488,8 +1239,141 @@ async def graceful_shutdown(workflow: Workflow, client: asyva.Client, reason: st
     is_flag=True,
     default=False,
     help=(
-        "Process the directories used in `-f`, `--filename` recursively. Useful when "
-        "you want to manage related manifests organized within the same directory."
+        "Process the directories used in `-f`, `--filename` recursively, picking up "
+        "the `*.yaml`, `*.yml`, `*.json` and `*.ndjson` files in them, and let `**` "
+        "match any number of "
+        "directories. Useful when you want to manage related manifests organized "
+        "within the same directory. Either way, the paths listed in the "
+        "`.vaultautopilotignore` files (in `.gitignore` syntax) of the current "
+        "directory and of the directories searched are skipped."
+    ),
+)
+@click.option(
+    "-w",
+    "--workers",
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help=(
+        "Number of worker processes to apply the manifests with. When greater than 1, "
+        "the manifests are parsed up front, split into groups of resources that don't "
+        "depend on each other, and each group is applied in a separate process with "
+        "its own connection to Vault."
+    ),
+)
+@click.option(
+    "--parse-workers",
+    type=click.IntRange(min=0),
+    default=0,
+    show_default=True,
+    help=(
+        "Number of worker processes to parse and validate the manifest files in, "
+        "while the main process talks to Vault. The manifests are still applied in "
+        "the order of the files. With 0, the files are parsed in the main process."
+    ),
+)
+@click.option(
+    "--format",
+    "manifest_format",
+    type=click.Choice(typing.get_args(ManifestFormat)),
+    help=(
+        "The format of the manifests: YAML, a JSON document per file, or "
+        "newline-delimited JSON (a document per line). Detected from the extension of "
+        "each file by default (`.json`, `.ndjson`, YAML otherwise), standard input is "
+        "read as YAML unless specified."
+    ),
+)
+@click.option(
+    "--progress",
+    type=click.Choice(("auto", "records", "summary", "plain")),
+    default="auto",
+    show_default=True,
+    help=(
+        "How to show the progress: a line per resource updated in place (records), "
+        "the number of resources of each kind by outcome along with the rate, the "
+        "estimated time left and the last few resources applied and failed (summary), "
+        "or a line printed per resource once applied (plain). With auto, the summary "
+        "is shown on a terminal, and plain lines are printed otherwise."
+    ),
+)
+@click.option(
+    "-o",
+    "--output",
+    type=click.Choice(("text", "ndjson")),
+    default="text",
+    show_default=True,
+    help=(
+        "The format of the results. With ndjson, a JSON object is written per "
+        "resource event instead of showing the progress, with the kind, the absolute "
+        "path, the status, the error message and the timings of the resource, and "
+        "the other messages go to standard error."
+    ),
+)
+@click.option(
+    "--output-file",
+    type=click.Path(dir_okay=False, writable=True, path_type=pathlib.Path),
+    help="Write the results of `--output ndjson` to a file instead of standard output.",
+)
+@click.option(
+    "--timings",
+    type=click.IntRange(min=1),
+    is_flag=False,
+    flag_value=5,
+    default=None,
+    metavar="[N]",
+    help=(
+        "Report where each resource spent its time (waiting for dependencies, "
+        "waiting for a semaphore slot, in Vault requests and in local CPU work) once "
+        "the run is over. Prints the critical path through the dependency graph and "
+        "the N slowest resources by each category (default: 5), followed by how "
+        "many reads were coalesced with an identical read in flight and how many "
+        "were served from the read cache."
+    ),
+)
+@click.option(
+    "--loop-lag",
+    type=click.IntRange(min=1),
+    is_flag=False,
+    flag_value=100,
+    default=None,
+    metavar="[MS]",
+    help=(
+        "Monitor the scheduling delay of the event loop and report the lag histogram "
+        "once the run is over. Callbacks that block the loop for longer than MS "
+        "milliseconds (default: 100) are captured and attributed to a subsystem, "
+        "such as manifest parsing, snapshot diff or rendering. Worker processes "
+        "started with `--workers` are not monitored."
+    ),
+)
+@click.option(
+    "--trace",
+    type=click.Path(dir_okay=False, writable=True, path_type=pathlib.Path),
+    help=(
+        "Write a Trace Event Format file, viewable in Perfetto or chrome://tracing. "
+        "Each resource gets its own track with spans for parsing, waiting for "
+        "dependencies, building the snapshot, diffing and writing, and the HTTP "
+        "requests nested in them."
+    ),
+)
+@click.option(
+    "--max-rps",
+    type=click.FloatRange(min=0, min_open=True),
+    help=(
+        "Limit the rate of requests sent to Vault, in requests per second. Requests "
+        "over the limit are queued rather than failed. Overrides the `maxRps` setting "
+        "of the `rateLimit` configuration section, which also accepts separate limits "
+        "for KV reads and writes, PKI, `sys/*` and password generation. The limits "
+        "are shared by all the worker processes."
+    ),
+)
+@click.option(
+    "--no-cache",
+    is_flag=True,
+    help=(
+        "Send every read to Vault instead of reusing the mount configurations, "
+        "issuers, password policies and PKI roles read earlier in the run, and read "
+        "each issuer and PKI role rather than listing those of each PKI engine once. "
+        "Same as setting `enabled: false` in the `cache` configuration section."
     ),
 )
 @click.pass_context
@@ -497,6 +1381,17 @@ def apply(
     ctx: click.Context,
     filename: Sequence[str],
     recursive: bool,
+    workers: int,
+    parse_workers: int,
+    manifest_format: ManifestFormat | None,
+    progress: str,
+    output: str,
+    output_file: pathlib.Path | None,
+    timings: int | None,
+    loop_lag: int | None,
+    trace: pathlib.Path | None,
+    max_rps: float | None,
+    no_cache: bool,
 ) -> None:
     """
     Apply a manifest to a Vault server from a file, directory, or standard input.
@@ -512,16 +1407,80 @@ def apply(
     \b
       # Apply a manifest from standard input
       $ cat manifest.yaml | vault-autopilot apply
+    \b
+      # Apply newline-delimited JSON manifests from standard input
+      $ generate-manifests | vault-autopilot apply --format ndjson
+    \b
+      # Apply manifests using 4 worker processes
+      $ vault-autopilot apply -w 4 -Rf /path/to/folder/**/*.yaml
+    \b
+      # Parse the manifests in 4 worker processes
+      $ vault-autopilot apply --parse-workers 4 -Rf /path/to/folder/**/*.yaml
+    \b
+      # Report the 10 slowest resources by each category
+      $ vault-autopilot apply --timings 10 -f manifest.yaml
+    \b
+      # Write a trace of the run to open in https://ui.perfetto.dev
+      $ vault-autopilot apply --trace trace.json -f manifest.yaml
+    \b
+      # Stream the results to another tool, a JSON object per line
+      $ vault-autopilot apply -o ndjson -f manifest.yaml | jq .status
+    \b
+      # Send at most 20 requests per second to Vault
+      $ vault-autopilot apply --max-rps 20 -f manifest.yaml
     """
     ev_loop = asyncio.get_event_loop()
 
     if not (settings := ctx.find_object(_conf.Settings)):
         raise RuntimeError("Configuration not found")
 
-    client, workflow = (
-        asyva.Client(),
-        Workflow([ApplyManifestsStage()]),
+    if max_rps is not None:
+        settings = settings.model_copy(
+            update={
+                "rate_limit": dataclasses.replace(settings.rate_limit, max_rps=max_rps)
+            }
+        )
+
+    if no_cache:
+        settings = settings.model_copy(
+            update={"cache": dataclasses.replace(settings.cache, enabled=False)}
+        )
+
+    if output_file is not None and output != "ndjson":
+        raise CLIError("The --output-file option requires --output ndjson")
+
+    if output == "ndjson":
+        # Leave standard output to the results
+        renderer: ResourceRenderer = NdjsonRenderer(
+            ctx.with_resource(output_file.open("w", encoding="utf-8"))
+            if output_file is not None
+            else click.get_text_stream("stdout")
+        )
+        live, console = False, Console(stderr=True)
+    else:
+        if progress == "auto":
+            progress = "summary" if get_console().is_terminal else "plain"
+
+        renderer = RENDERERS[progress]()
+        live, console = progress != "plain", get_console()
+
+    client, workflow, timeline, tracer = (
+        create_client(settings),
+        Workflow([ApplyManifestsStage(renderer=renderer)], live=live, console=console),
+        Timeline() if timings is not None else None,
+        tracing.Tracer() if trace is not None else None,
     )
+
+    if timeline is not None:
+        client.trace_configs.append(create_trace_config())
+    if tracer is not None:
+        client.trace_configs.append(tracing.create_trace_config())
+
+    monitor = LoopLagMonitor(threshold=loop_lag / 1000) if loop_lag else None
+
+    if monitor is not None:
+        monitor.start(ev_loop)
+
     app_ctx = AppContext(
         settings,
         client,
@@ -531,6 +1490,10 @@ def apply(
             client=client,
         ),
         workflow,
+        Profiler.from_context(ctx),
+        timeline,
+        tracer,
+        create_semaphore(settings, client),
     )
 
     for sig in (
@@ -551,20 +1514,58 @@ def apply(
         stage = ev_loop.run_until_complete(stages.__anext__())
         assert isinstance(stage, ApplyManifestsStage), stage
 
-        ev_loop.run_until_complete(async_apply(app_ctx, filename, recursive, stage))
+        ev_loop.run_until_complete(
+            async_apply(
+                app_ctx,
+                filename,
+                recursive,
+                stage,
+                workers,
+                parse_workers,
+                manifest_format,
+            )
+        )
     except asyncio.CancelledError:
         raise click.Abort()
     except Exception as ex:
         handle_exception(ex, app_ctx)
     finally:
         try:
-            ev_loop.run_until_complete(app_ctx.storage.push())
+            with app_ctx.profiler.phase("push"):
+                ev_loop.run_until_complete(app_ctx.storage.push())
         except Exception as ex:
             handle_exception(ex, app_ctx)
 
         ev_loop.run_until_complete(graceful_shutdown(workflow, client, "finished"))
 
-    click.secho("\nThanks for choosing Vault Autopilot!", fg="yellow")
+        if timeline is not None and timings is not None:
+            click.echo("\n" + timeline.report(top=timings), err=True)
+            click.echo("\n" + client.singleflight.report(), err=True)
+
+            if (cache := client.read_cache) is not None:
+                click.echo("\n" + cache.report(), err=True)
+
+        if monitor is not None:
+            monitor.stop()
+            click.echo("\n" + monitor.report(), err=True)
+
+        if tracer is not None and trace is not None:
+            with trace.open("w") as fp:
+                tracer.dump(fp)
+
+            click.echo("\nTrace written to %s" % trace, err=True)
+
+        if (limiter := client.rate_limiter) is not None:
+            click.echo("\n" + limiter.report(), err=True)
+
+        if isinstance(app_ctx.sem, AdaptiveSemaphore):
+            click.echo("\n" + app_ctx.sem.report(), err=True)
+
+    click.secho(
+        "\nThanks for choosing Vault Autopilot!", fg="yellow", err=console.stderr
+    )
+
+    ev_loop.run_until_complete(client.close())
 
     # Zero-sleep to allow underlying connections to close
     # https://docs.aiohttp.org/en/stable/client_advanced.html?highlight=sleep#graceful-shutdown
@@ -0,0 +1,373 @@
+import asyncio
+import collections
+import fnmatch
+import glob
+import logging
+import os
+import pathlib
+import re
+import threading
+from collections.abc import AsyncGenerator, Iterator, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+
+from .exc import CLIError
+
+__all__ = ("ManifestDiscovery", "IGNORE_FILENAME")
+
+IGNORE_FILENAME = ".vaultautopilotignore"
+
+MANIFEST_SUFFIXES = (".yaml", ".yml", ".json", ".ndjson")
+"""The suffixes of the files picked up when walking a directory. The files matched by a
+pattern are taken whatever their suffix is."""
+
+MAGIC_RE = re.compile(r"[*?[]")
+
+logger = logging.getLogger(__name__)
+
+
+def read_files(fns: Sequence[str]) -> list[bytes]:
+    result: list[bytes] = []
+
+    for fn in fns:
+        with open(fn, "rb") as fp:
+            result.append(fp.read())
+
+    return result
+
+
+def pattern_root(pat: str) -> str:
+    """Returns the directory the matches of a glob pattern are found under."""
+    parts = pathlib.PurePath(pat).parts
+
+    for index, part in enumerate(parts):
+        if MAGIC_RE.search(part):
+            return os.path.abspath(os.path.join("", *parts[:index]))
+
+    return os.path.dirname(os.path.abspath(pat))
+
+
+def relative_parts(path: str, root: str) -> tuple[str, ...] | None:
+    """Splits an absolute path into the names below the root directory, or returns
+    ``None`` if the path isn't below it."""
+    if path == root:
+        return ()
+
+    prefix = root if root.endswith(os.sep) else root + os.sep
+
+    return tuple(path[len(prefix) :].split(os.sep)) if path.startswith(prefix) else None
+
+
+@dataclass(slots=True)
+class IgnoreRule:
+    pattern: str
+    negated: bool = False
+    dir_only: bool = False
+    anchored: bool = False
+
+    @classmethod
+    def parse(cls, line: str) -> "IgnoreRule | None":
+        if not (line := line.rstrip()) or line.startswith("#"):
+            return None
+
+        rule = cls(pattern="")
+
+        if line.startswith("!"):
+            rule.negated, line = True, line[1:]
+        elif line.startswith("\\"):
+            line = line[1:]
+
+        if line.endswith("/"):
+            rule.dir_only, line = True, line.rstrip("/")
+
+        if line.startswith("**/"):
+            line = line[3:]
+
+        # A slash at the beginning or in the middle anchors the pattern to the
+        # directory of the ignore file, otherwise it matches at any depth
+        rule.anchored, rule.pattern = "/" in line, line.lstrip("/")
+
+        return rule if rule.pattern else None
+
+    def matches(self, rel: str, is_dir: bool) -> bool:
+        if self.dir_only and not is_dir:
+            return False
+
+        return fnmatch.fnmatchcase(
+            rel if self.anchored else rel.rpartition("/")[2], self.pattern
+        )
+
+
+@dataclass(slots=True)
+class IgnoreFile:
+    """
+    A ``.vaultautopilotignore`` file, which lists the paths to leave out of the
+    discovery, relative to the directory it's in. Supports a subset of the
+    ``.gitignore`` syntax: comments, ``!`` to negate a pattern, a trailing slash to
+    match directories only, and a leading or middle slash to anchor a pattern to the
+    directory of the file.
+    """
+
+    rules: list[IgnoreRule]
+
+    @classmethod
+    def parse(cls, text: str) -> "IgnoreFile":
+        return cls(
+            rules=[
+                rule
+                for line in text.splitlines()
+                if (rule := IgnoreRule.parse(line)) is not None
+            ]
+        )
+
+    def match(self, rel: str, is_dir: bool) -> bool | None:
+        """Returns whether the path is ignored, or ``None`` if no rule matches it. The
+        last matching rule wins."""
+        result = None
+
+        for rule in self.rules:
+            if rule.matches(rel, is_dir):
+                result = not rule.negated
+
+        return result
+
+
+@dataclass(slots=True)
+class ManifestDiscovery:
+    """
+    Finds the manifest files matching the given patterns and reads them off the event
+    loop.
+
+    The directories are walked with :func:`os.scandir` in a worker thread, and the files
+    are read in a thread pool, a few files ahead of the consumer, so that listing and
+    reading large trees (e.g. on network filesystems) overlaps with parsing and with
+    the requests to Vault. Each file is closed as soon as it's read.
+
+    The paths listed in the ``.vaultautopilotignore`` files found in the current
+    directory, the directory a pattern starts at and the directories below are left
+    out (see :class:`IgnoreFile`).
+
+    Attributes:
+        patterns: The file names or glob patterns to match.
+        recursive: Whether ``**`` matches any number of directories, and the matched
+            directories are walked for manifest files (see :data:`MANIFEST_SUFFIXES`).
+            Otherwise, the directories are skipped.
+        read_ahead: The number of files read ahead of the consumer, at most.
+        read_workers: The number of threads to read the files in.
+    """
+
+    patterns: Sequence[str]
+    recursive: bool = False
+    read_ahead: int = 16
+    read_workers: int = 4
+    _cwd: str = field(init=False, default_factory=os.getcwd)
+    _ignore_files: dict[str, IgnoreFile | None] = field(
+        init=False, default_factory=dict
+    )
+    _excluded_dirs: dict[tuple[str, tuple[str, ...]], bool] = field(
+        init=False, default_factory=dict
+    )
+
+    async def read(self) -> AsyncGenerator[tuple[str, bytes], None]:
+        """Yields the name and content of each manifest file, in discovery order."""
+        loop = asyncio.get_running_loop()
+        pool = ThreadPoolExecutor(
+            max_workers=self.read_workers, thread_name_prefix="manifest-reader"
+        )
+        # The files are read a few at a time, to save on the round trips between the
+        # loop and the threads
+        chunk_size = max(1, self.read_ahead // self.read_workers)
+        pending: collections.deque[tuple[list[str], asyncio.Future[list[bytes]]]] = (
+            collections.deque()
+        )
+        pending_files = 0
+        batches = self.batches()
+
+        try:
+            async for batch in batches:
+                for index in range(0, len(batch), chunk_size):
+                    chunk = batch[index : index + chunk_size]
+                    pending.append(
+                        (chunk, loop.run_in_executor(pool, read_files, chunk))
+                    )
+                    pending_files += len(chunk)
+
+                    while pending_files >= self.read_ahead:
+                        chunk, future = pending.popleft()
+                        pending_files -= len(chunk)
+
+                        for fn, data in zip(chunk, await future):
+                            yield fn, data
+
+            while pending:
+                chunk, future = pending.popleft()
+
+                for fn, data in zip(chunk, await future):
+                    yield fn, data
+        finally:
+            for _, future in pending:
+                future.cancel()
+
+            pool.shutdown(wait=False, cancel_futures=True)
+            await batches.aclose()
+
+    async def batches(self) -> AsyncGenerator[list[str], None]:
+        """Yields the paths of the manifest files, as listed by :meth:`iter_paths` in a
+        worker thread. The paths are yielded in batches of the paths found since the
+        previous batch was taken."""
+        loop = asyncio.get_running_loop()
+        lock = threading.Lock()
+        found: list[str] = []
+        ready = asyncio.Event()
+        done = stop = False
+
+        def put(paths: list[str], is_done: bool = False) -> None:
+            nonlocal done
+
+            with lock:
+                # Only wake up the loop if the paths found earlier were all taken
+                if not found and not done:
+                    loop.call_soon_threadsafe(ready.set)
+                found.extend(paths)
+                done = is_done
+
+        def walk() -> None:
+            try:
+                for path in self.iter_paths():
+                    if stop:
+                        return
+                    put([path])
+            finally:
+                put([], is_done=True)
+
+        walker = asyncio.ensure_future(asyncio.to_thread(walk))
+
+        try:
+            while True:
+                with lock:
+                    batch, is_done = found[:], done
+                    found.clear()
+                    if not batch and not is_done:
+                        ready.clear()
+
+                if batch:
+                    yield batch
+                elif is_done:
+                    break
+                else:
+                    await ready.wait()
+        finally:
+            stop = True
+            # Re-raises the errors of the walk, e.g. a pattern that matches nothing
+            await walker
+
+    def iter_paths(self) -> Iterator[str]:
+        """Lists the paths of the manifest files. Blocks on the filesystem."""
+        seen: set[str] = set()
+
+        for pat in self.patterns:
+            root, counter = pattern_root(pat), 0
+
+            for fn in glob.iglob(pat, recursive=self.recursive):
+                for path in self._expand(fn, root):
+                    counter += 1
+
+                    if (key := os.path.abspath(path)) not in seen:
+                        seen.add(key)
+                        logger.debug("streaming manifest %r", path)
+                        yield path
+
+            if counter == 0:
+                raise CLIError(
+                    "No files were found that match the pattern %r. Make sure the "
+                    "pattern matches at least one existing regular file that isn't "
+                    "listed in %s, or use the -R option to search recursively."
+                    % (pat, IGNORE_FILENAME)
+                )
+
+            logger.debug("found %d manifest(s) matching pattern %r", counter, pat)
+
+    def _expand(self, fn: str, root: str) -> Iterator[str]:
+        path = os.path.abspath(fn)
+
+        # The ignore files of the current directory apply to the manifests below it
+        if (parts := relative_parts(path, self._cwd)) is not None:
+            root = self._cwd
+        elif (parts := relative_parts(path, root)) is None:
+            parts = ()
+
+        if is_dir := os.path.isdir(fn):
+            if not self.recursive:
+                return
+        elif not os.path.exists(fn):
+            return
+
+        if self._is_excluded(root, parts, is_dir):
+            logger.debug("ignoring %r", fn)
+            return
+
+        if is_dir:
+            yield from self._walk(fn, root, parts)
+        else:
+            yield fn
+
+    def _walk(self, top: str, root: str, parts: tuple[str, ...]) -> Iterator[str]:
+        with os.scandir(top) as it:
+            entries = sorted(it, key=lambda entry: entry.name)
+
+        for entry in entries:
+            entry_parts = (*parts, entry.name)
+
+            if entry.is_dir(follow_symlinks=False):
+                if not self._is_ignored(root, entry_parts, True):
+                    yield from self._walk(entry.path, root, entry_parts)
+            elif entry.name.endswith(MANIFEST_SUFFIXES) and entry.is_file():
+                if not self._is_ignored(root, entry_parts, False):
+                    yield entry.path
+
+    def _ignore_file(self, directory: str) -> IgnoreFile | None:
+        try:
+            return self._ignore_files[directory]
+        except KeyError:
+            pass
+
+        fn = os.path.join(directory, IGNORE_FILENAME)
+
+        try:
+            with open(fn, encoding="utf-8") as fp:
+                ignore_file = IgnoreFile.parse(fp.read())
+            logger.debug("using %s", fn)
+        except (FileNotFoundError, NotADirectoryError):
+            ignore_file = None
+
+        self._ignore_files[directory] = ignore_file
+        return ignore_file
+
+    def _is_ignored(self, root: str, parts: tuple[str, ...], is_dir: bool) -> bool:
+        """Returns whether the ignore files between the root and the path ignore it,
+        assuming its parent directories aren't ignored."""
+        result = False
+
+        for index in range(len(parts)):
+            if (
+                ignore_file := self._ignore_file(os.path.join(root, *parts[:index]))
+            ) is not None and (
+                match := ignore_file.match("/".join(parts[index:]), is_dir)
+            ) is not None:
+                result = match
+
+        return result
+
+    def _is_excluded(self, root: str, parts: tuple[str, ...], is_dir: bool) -> bool:
+        """Returns whether the path or one of its parent directories below the root is
+        ignored."""
+        for index in range(1, len(parts)):
+            if (excluded := self._excluded_dirs.get((root, parts[:index]))) is None:
+                excluded = self._excluded_dirs[root, parts[:index]] = self._is_ignored(
+                    root, parts[:index], True
+                )
+
+            if excluded:
+                return True
+
+        return self._is_ignored(root, parts, is_dir)
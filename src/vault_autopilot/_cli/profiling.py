@@ -0,0 +1,105 @@
+import cProfile
+import pathlib
+import time
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+from dataclasses import dataclass, field
+from typing import Iterator
+
+import click
+
+__all__ = ("Profiler", "PROFILER_KEY")
+
+PROFILER_KEY = "vault_autopilot.profiler"
+
+
+@dataclass(slots=True)
+class Profiler:
+    """
+    Runs the pipeline under :mod:`cProfile` and keeps track of the wall time spent in
+    each pipeline phase, along with the wall time it took to reach a few milestones,
+    e.g. the first write to Vault.
+
+    The instance is stored in :attr:`click.Context.meta` under :data:`PROFILER_KEY` only
+    when profiling is requested. Use :meth:`from_context` to look it up: it returns a
+    disabled profiler otherwise, whose :meth:`phase` is a no-op.
+    """
+
+    path: pathlib.Path | None = None
+    phases: dict[str, float] = field(init=False, default_factory=dict)
+    milestones: dict[str, float] = field(init=False, default_factory=dict)
+    _started_at: float = field(init=False, default_factory=time.perf_counter)
+    _profile: cProfile.Profile | None = field(init=False, default=None)
+
+    @property
+    def enabled(self) -> bool:
+        return self.path is not None
+
+    @classmethod
+    def from_context(cls, ctx: click.Context) -> "Profiler":
+        if isinstance(profiler := ctx.meta.get(PROFILER_KEY), Profiler):
+            return profiler
+        return cls()
+
+    def start(self) -> None:
+        assert self.enabled, "Profiling is disabled"
+
+        self._profile = cProfile.Profile()
+        self._profile.enable()
+
+    def stop(self) -> None:
+        """Stops profiling and writes the collected statistics in the ``pstats``
+        format."""
+        assert self.path is not None, "Profiling is disabled"
+
+        if self._profile is None:
+            return
+
+        self._profile.disable()
+        self._profile.dump_stats(self.path)
+        self._profile = None
+
+    def phase(self, name: str) -> AbstractContextManager[None]:
+        """
+        Returns a context manager that adds the wall time spent within it to the given
+        phase. Phases may overlap (e.g. parsing runs alongside dispatching) and may be
+        entered several times, in which case the time is accumulated.
+        """
+        if not self.enabled:
+            return nullcontext()
+
+        return self._measure(name)
+
+    @contextmanager
+    def _measure(self, name: str) -> Iterator[None]:
+        started_at = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = (
+                self.phases.get(name, 0.0) + time.perf_counter() - started_at
+            )
+
+    def milestone(self, name: str) -> None:
+        """Records the wall time elapsed since the profiler was created, the first time
+        the given milestone is reached."""
+        if self.enabled and name not in self.milestones:
+            self.milestones[name] = time.perf_counter() - self._started_at
+
+    def report(self) -> str:
+        lines = ["Wall time per phase:"]
+        width = max(map(len, (*self.phases, *self.milestones)), default=0)
+
+        lines.extend(
+            "  %s  %8.3fs" % (name.ljust(width), elapsed)
+            for name, elapsed in self.phases.items()
+        )
+
+        if self.milestones:
+            lines.append("Wall time to milestone:")
+            lines.extend(
+                "  %s  %8.3fs" % (name.ljust(width), elapsed)
+                for name, elapsed in self.milestones.items()
+            )
+
+        lines.append("Profile written to %s" % self.path)
+        return "\n".join(lines)
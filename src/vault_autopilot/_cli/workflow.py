@@ -1,3 +1,4 @@
+import time
 from abc import abstractmethod
 from asyncio import Task, get_event_loop, sleep
 from dataclasses import dataclass, field
@@ -5,17 +6,28 @@ from datetime import datetime
 from typing import AsyncGenerator, Optional
 
 from humanize import precisedelta
-from rich.console import Group, RenderableType
+from rich import get_console
+from rich.console import Console, Group, RenderableType
 from rich.live import Live
 from rich.padding import Padding
 from rich.text import Text
 
+# The elapsed time shown in the title moves on even if nothing else changes
+CLOCK_INTERVAL = 1.0
+
 
 @dataclass(slots=True)
 class AbstractRenderer:
+    revision: int = field(init=False, default=0)
+    """Bumped on every change (see :meth:`touch`), so that the display is only redrawn
+    when something changed."""
+
     @abstractmethod
     def compose_renderable(self) -> RenderableType: ...
 
+    def touch(self) -> None:
+        self.revision += 1
+
 
 @dataclass(slots=True)
 class AbstractStage:
@@ -28,13 +40,27 @@ class AbstractStage:
 
 @dataclass(slots=True)
 class Workflow:
+    """
+    Runs the stages one after the other, showing the progress of the current stage.
+
+    Attributes:
+        live: Whether to redraw the progress in place. Otherwise, the title of each
+            stage is printed once it starts and once it stops, and the renderers are
+            expected to print their own output.
+        console: The console to show the progress on.
+    """
+
     _stages: list[AbstractStage]
     _index: int = field(init=False, default=-1)
     _started_at: datetime = field(init=False)
-    _think_task: Task[None] = field(init=False)
+    _think_task: Task[None] | None = field(init=False, default=None)
     _stop_reason: str = ""
+    live: bool = True
+    console: Console = field(default_factory=get_console)
 
-    _live: Live = field(init=False)
+    _live: Live | None = field(init=False, default=None)
+    _rendered_revision: int = field(init=False, default=-1)
+    _rendered_at: float = field(init=False, default=0.0)
 
     @property
     def current_stage(self) -> Optional[AbstractStage]:
@@ -45,40 +71,61 @@ class Workflow:
         return bool(self._stop_reason)
 
     def __del__(self) -> None:
-        self.stop("cancelled")
+        if not self.is_stopped:
+            self.stop("cancelled")
 
     async def run(self) -> AsyncGenerator[AbstractStage, None]:
-        self._think_task = get_event_loop().create_task(self.think())
+        if self.live:
+            self._think_task = get_event_loop().create_task(self.think())
 
         for stage in self._stages:
             self._index += 1
             self._started_at = datetime.now()
             self._stop_reason = ""
 
-            self._live = Live(self._compose_renderable(stage), auto_refresh=False)
-            self._live.start()
+            if self.live:
+                self._live = Live(
+                    self._compose_renderable(stage),
+                    console=self.console,
+                    auto_refresh=False,
+                )
+                self._live.start()
+            else:
+                self.console.print(self._compose_label(stage))
 
             yield stage
 
     async def think(self) -> None:
         while True:
-            self.render()
+            if self._is_outdated():
+                self.render()
             await sleep(0.1)
 
     def render(self) -> None:
         assert self.current_stage is not None
-        assert self._live.is_started is True
+        assert self._live is not None and self._live.is_started is True
 
+        self._rendered_revision = self.current_stage.renderer.revision
+        self._rendered_at = time.monotonic()
         self._live.update(self._compose_renderable(self.current_stage), refresh=True)
 
-    def _compose_renderable(self, stage: AbstractStage) -> RenderableType:
+    def _is_outdated(self) -> bool:
+        return self.current_stage is not None and (
+            self.current_stage.renderer.revision != self._rendered_revision
+            or time.monotonic() - self._rendered_at >= CLOCK_INTERVAL
+        )
+
+    def _compose_label(self, stage: AbstractStage) -> Text:
         label = f"[+] {stage.title} ({self._time_elapsed()})"
 
         if self._stop_reason:
             label += f" {self._stop_reason.upper()}"
 
+        return Text(label)
+
+    def _compose_renderable(self, stage: AbstractStage) -> RenderableType:
         return Group(
-            Text(label),
+            self._compose_label(stage),
             Padding(stage.compose_renderable(), (0, 0, 0, 1)),
         )
 
@@ -93,9 +140,14 @@ class Workflow:
     def stop(self, reason: str) -> None:
         self._stop_reason = reason
 
-        if not self._think_task.cancelling():
+        if self._think_task is not None and not self._think_task.cancelling():
             self._think_task.cancel()
 
+        if self._live is None:
+            if not self.live and self.current_stage is not None:
+                self.console.print(self._compose_label(self.current_stage))
+            return
+
         # apply final update before shutting down
         if self._live.is_started:
             self.render()
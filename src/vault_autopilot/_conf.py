@@ -11,8 +11,10 @@ from pydantic_settings import (
 from typing_extensions import TypedDict
 
 from ._pkg import asyva
+from .manifest_cache import ManifestCacheConfig
+from .util.adaptive import AdaptiveConcurrencyConfig
 
-_config = ConfigDict(alias_generator=to_camel, extra="forbid")
+_config = ConfigDict(alias_generator=to_camel, extra="forbid", populate_by_name=True)
 
 
 @dataclass(slots=True, config=_config, kw_only=True)
@@ -27,6 +29,46 @@ class TokenAuthMethod(asyva.TokenAuthenticator):
     method: Literal["token"]
 
 
+@dataclass(slots=True, config=_config, kw_only=True)
+class AgentAuthMethod(asyva.AgentAuthenticator):
+    method: Literal["agent"]
+
+
+@dataclass(slots=True, config=_config, kw_only=True)
+class Transport(asyva.TransportConfig):
+    pass
+
+
+@dataclass(slots=True, config=_config, kw_only=True)
+class Retry(asyva.RetryConfig):
+    pass
+
+
+@dataclass(slots=True, config=_config, kw_only=True)
+class RateLimit(asyva.RateLimitConfig):
+    pass
+
+
+@dataclass(slots=True, config=_config, kw_only=True)
+class Cache(asyva.CacheConfig):
+    pass
+
+
+@dataclass(slots=True, config=_config, kw_only=True)
+class TokenCache(asyva.TokenCacheConfig):
+    pass
+
+
+@dataclass(slots=True, config=_config, kw_only=True)
+class Concurrency(AdaptiveConcurrencyConfig):
+    pass
+
+
+@dataclass(slots=True, config=_config, kw_only=True)
+class ManifestCache(ManifestCacheConfig):
+    pass
+
+
 class VaultSecretStorage(TypedDict):
     type: Literal["kvv1-secret"]
     secrets_engine_path: Annotated[
@@ -45,8 +87,17 @@ class Settings(BaseSettings):
 
     base_url: str
     storage: VaultSecretStorage
-    auth: KubernetesAuthMethod | TokenAuthMethod = Field(discriminator="method")
+    auth: KubernetesAuthMethod | TokenAuthMethod | AgentAuthMethod = Field(
+        discriminator="method"
+    )
     default_namespace: str = ""
+    transport: Transport = Field(default_factory=Transport)
+    retry: Retry = Field(default_factory=Retry)
+    rate_limit: RateLimit = Field(default_factory=RateLimit)
+    concurrency: Concurrency = Field(default_factory=Concurrency)
+    cache: Cache = Field(default_factory=Cache)
+    token_cache: TokenCache = Field(default_factory=TokenCache)
+    manifest_cache: ManifestCache = Field(default_factory=ManifestCache)
 
     @classmethod
     def settings_customise_sources(
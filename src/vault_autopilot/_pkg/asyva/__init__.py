@@ -4,22 +4,35 @@ __all__ = (
     "AbstractAuthenticator",
     "KubernetesAuthenticator",
     "TokenAuthenticator",
+    "AgentAuthenticator",
     "Client",
     "IssuerType",
     "PasswordPolicy",
     "GenerateIntmdCSRResult",
     "GenerateRootResult",
     "SignIntmdResult",
+    "TransportConfig",
+    "RetryConfig",
+    "RateLimitConfig",
+    "CacheConfig",
+    "TokenCacheConfig",
+    "AuthToken",
 )
 __version__ = "0.1.0"
 
 from . import dto, exc
 from .authenticator import (
     AbstractAuthenticator,
+    AgentAuthenticator,
     KubernetesAuthenticator,
     TokenAuthenticator,
 )
+from .cache import CacheConfig
 from .client import Client
 from .dto.issuer import IssuerType
 from .dto.password_policy import PasswordPolicy
+from .executor import RetryConfig
 from .manager.pki import GenerateIntmdCSRResult, GenerateRootResult, SignIntmdResult
+from .ratelimit import RateLimitConfig
+from .token_cache import AuthToken, TokenCacheConfig
+from .transport import TransportConfig
@@ -5,13 +5,19 @@ import pathlib
 from dataclasses import dataclass
 from typing import Literal
 
-import aiohttp
 import pydantic
 from typing_extensions import override
 
 from . import constants, exc
+from .token_cache import AuthToken
+from .transport import AbstractSession
 
-__all__ = "AbstractAuthenticator", "KubernetesAuthenticator", "TokenAuthenticator"
+__all__ = (
+    "AbstractAuthenticator",
+    "KubernetesAuthenticator",
+    "TokenAuthenticator",
+    "AgentAuthenticator",
+)
 
 
 logger = logging.getLogger(__name__)
@@ -32,9 +38,15 @@ class AbstractAuthenticator(abc.ABC):
     """
 
     @abc.abstractmethod
-    async def authenticate(self, sess: aiohttp.ClientSession) -> pydantic.SecretStr:
-        """Returns a string value representing the client token obtained through
-        successful authentication."""
+    async def authenticate(self, sess: AbstractSession) -> AuthToken | None:
+        """Returns the client token obtained through successful authentication, or
+        ``None`` if the requests are to be sent without a token."""
+
+    @abc.abstractmethod
+    def identity(self) -> str:
+        """Returns a string that tells apart the identities the authenticator may log
+        in as, e.g. the role and the credentials. The tokens are cached by a hash of
+        it (see :class:`TokenCache`)."""
 
 
 @dataclass(slots=True)
@@ -44,18 +56,29 @@ class KubernetesAuthenticator(AbstractAuthenticator):
     jwt: pydantic.SecretStr
 
     @override
-    async def authenticate(self, sess: aiohttp.ClientSession) -> pydantic.SecretStr:
+    def identity(self) -> str:
+        return "\0".join(
+            ("kubernetes", self.mount_path, self.role, self.jwt.get_secret_value())
+        )
+
+    @override
+    async def authenticate(self, sess: AbstractSession) -> AuthToken:
         """
         References:
             https://developer.hashicorp.com/vault/docs/auth/kubernetes#via-the-api
         """
-        resp = await sess.post(
+        resp = await sess.request(
+            "POST",
             f"/v1/auth/{self.mount_path}/login",
             json={"jwt": self.jwt.get_secret_value(), "role": self.role},
         )
-
         if resp.status == http.HTTPStatus.OK:
-            return pydantic.SecretStr(str((await resp.json())["auth"]["client_token"]))
+            auth = (await resp.json())["auth"]
+            return AuthToken(
+                token=pydantic.SecretStr(str(auth["client_token"])),
+                ttl=auth.get("lease_duration") or None,
+                renewable=bool(auth.get("renewable")),
+            )
 
         logger.debug(await resp.json())
         raise await exc.VaultAPIError.from_response(
@@ -68,12 +91,7 @@ class TokenAuthenticator(AbstractAuthenticator):
     token: pydantic.SecretStr
     source: Literal["directvalue", "filebasedvalue"] = "directvalue"
 
-    @override
-    async def authenticate(self, sess: aiohttp.ClientSession) -> pydantic.SecretStr:
-        """
-        References:
-            https://developer.hashicorp.com/vault/api-docs/auth/token#lookup-a-token-self
-        """
+    def read_token(self) -> str:
         # The token is either a string or a file containing the string.
         match self.source:
             case "directvalue":
@@ -86,14 +104,33 @@ class TokenAuthenticator(AbstractAuthenticator):
                     "'directvalue' and `'filebasedvalue'." % self.source
                 )
 
-        resp = await sess.get(
+        return token
+
+    @override
+    def identity(self) -> str:
+        return "\0".join(("token", self.read_token()))
+
+    @override
+    async def authenticate(self, sess: AbstractSession) -> AuthToken:
+        """
+        References:
+            https://developer.hashicorp.com/vault/api-docs/auth/token#lookup-a-token-self
+        """
+        token = self.read_token()
+
+        resp = await sess.request(
+            "GET",
             "/v1/auth/token/lookup-self",
             headers={constants.AUTHORIZATION_HEADER: token},
         )
-
         match resp.status:
             case http.HTTPStatus.OK:
-                return self.token
+                data = (await resp.json())["data"]
+                return AuthToken(
+                    token=pydantic.SecretStr(token),
+                    ttl=data.get("ttl") or None,
+                    renewable=bool(data.get("renewable")),
+                )
             case http.HTTPStatus.FORBIDDEN:
                 raise exc.UnauthorizedError(
                     "The token you provided is invalid or has expired. Please "
@@ -107,3 +144,23 @@ class TokenAuthenticator(AbstractAuthenticator):
         raise await exc.VaultAPIError.from_response(
             "Failed to authenticate with provided token", resp
         )
+
+
+@dataclass(slots=True)
+class AgentAuthenticator(AbstractAuthenticator):
+    """
+    Relies on a Vault Agent or Proxy that authenticates on its own (auto-auth) and adds
+    its token to the requests that come without one (``use_auto_auth_token``), so no
+    login is needed. Usually paired with a ``unix://`` base URL.
+
+    References:
+        https://developer.hashicorp.com/vault/docs/agent-and-proxy/proxy/apiproxy
+    """
+
+    @override
+    def identity(self) -> str:
+        return "agent"
+
+    @override
+    async def authenticate(self, sess: AbstractSession) -> None:
+        return None
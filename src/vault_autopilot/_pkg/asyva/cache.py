@@ -0,0 +1,142 @@
+from collections import OrderedDict
+from collections.abc import Hashable, Mapping
+from dataclasses import dataclass, field
+from typing import Any
+
+__all__ = ("CacheConfig", "CacheStats", "ReadCache")
+
+CacheKey = tuple[str | None, str, *tuple[Hashable, ...]]
+"""The namespace, the kind of the cached object and the components of its path."""
+
+_MISSING = object()
+
+
+@dataclass(slots=True, kw_only=True)
+class CacheConfig:
+    """
+    Attributes:
+        enabled: Whether to cache the reads of the objects that only change when the
+            client writes them: mount and KV configurations, issuers, password
+            policies and PKI roles. The issuers and the roles of each PKI engine are
+            then listed once, so that only the ones that exist are read.
+        max_entries: The number of objects kept, the least recently used ones are
+            evicted first.
+    """
+
+    enabled: bool = True
+    max_entries: int = 1024
+
+    def __post_init__(self) -> None:
+        if self.max_entries < 1:
+            raise ValueError(
+                "max_entries must be greater than 0, got %r" % self.max_entries
+            )
+
+
+@dataclass(slots=True)
+class CacheStats:
+    """
+    Attributes:
+        hits: The number of reads answered from the cache.
+        misses: The number of reads sent to Vault.
+        invalidations: The number of entries dropped because the client wrote them.
+        evictions: The number of entries dropped to make room for others.
+    """
+
+    hits: int = 0
+    misses: int = 0
+    invalidations: int = 0
+    evictions: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        return self.hits / total if (total := self.hits + self.misses) else 0.0
+
+    def merge(self, other: "CacheStats") -> None:
+        self.hits += other.hits
+        self.misses += other.misses
+        self.invalidations += other.invalidations
+        self.evictions += other.evictions
+
+
+@dataclass(slots=True)
+class ReadCache:
+    """
+    A bounded LRU cache of read results, which lives as long as the client.
+
+    The writes invalidate the entries they affect. Since a read may be in flight while
+    a write happens, its result is only stored if its entry wasn't invalidated since
+    the read started (see :attr:`generation`), lest a stale result outlives the write.
+    """
+
+    config: CacheConfig = field(default_factory=CacheConfig)
+    stats: dict[str, CacheStats] = field(default_factory=dict)
+    generation: int = field(init=False, default=0)
+    _entries: OrderedDict[CacheKey, Any] = field(
+        init=False, default_factory=OrderedDict
+    )
+    _invalidated_at: dict[tuple[Hashable, ...], int] = field(
+        init=False, default_factory=dict
+    )
+
+    def _stats(self, key: CacheKey) -> CacheStats:
+        return self.stats.setdefault(str(key[1]), CacheStats())
+
+    def get(self, key: CacheKey) -> tuple[bool, Any]:
+        """Returns whether the result is cached, and the result if it is."""
+        if (value := self._entries.get(key, _MISSING)) is _MISSING:
+            self._stats(key).misses += 1
+            return False, None
+
+        self._entries.move_to_end(key)
+        self._stats(key).hits += 1
+        return True, value
+
+    def put(self, key: CacheKey, value: Any, generation: int) -> None:
+        """Stores the result of a read that started at the given generation."""
+        if any(
+            self._invalidated_at.get(key[:end], -1) >= generation
+            for end in range(2, len(key) + 1)
+        ):
+            return
+
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.config.max_entries:
+            evicted, _ = self._entries.popitem(last=False)
+            self._stats(evicted).evictions += 1
+
+    def invalidate(self, prefix: CacheKey) -> None:
+        """Drops the entries whose key starts with ``prefix``."""
+        self._invalidated_at[prefix] = self.generation
+        self.generation += 1
+
+        for key in [key for key in self._entries if key[: len(prefix)] == prefix]:
+            del self._entries[key]
+            self._stats(key).invalidations += 1
+
+    def merge(self, stats: Mapping[str, CacheStats]) -> None:
+        for kind, other in stats.items():
+            self.stats.setdefault(kind, CacheStats()).merge(other)
+
+    def report(self) -> str:
+        row = "  %-20s %10s %10s %10s %14s %10s"
+        lines = [
+            "Read cache:",
+            row
+            % ("objects", "hits", "misses", "hit rate", "invalidations", "evictions"),
+        ]
+        lines.extend(
+            row
+            % (
+                kind,
+                stats.hits,
+                stats.misses,
+                "%.1f%%" % (stats.hit_rate * 100),
+                stats.invalidations,
+                stats.evictions,
+            )
+            for kind, stats in sorted(self.stats.items())
+        )
+        return "\n".join(lines)
@@ -1,4 +1,9 @@
+import asyncio
+import contextlib
 import functools
+import http
+import logging
+import time
 from collections.abc import Awaitable, Coroutine
 from dataclasses import dataclass, field
 from typing import (
@@ -12,16 +17,25 @@ from typing import (
 
 import aiohttp
 import jinja2
+from aiohttp.client_exceptions import UnixClientConnectorError
 from typing_extensions import Unpack
 
 from . import authenticator, composer, dto
+from .cache import CacheConfig, CacheKey, ReadCache
 from .dto.password_policy import PasswordPolicy
+from .executor import RequestExecutor, RetryConfig
 from .manager import kvv1, kvv2, password_policy, pki, system_backend
+from .ratelimit import RateLimitConfig, RateLimiter
+from .singleflight import Singleflight
+from .token_cache import AuthToken, TokenCache, TokenCacheConfig
+from .transport import AbstractSession, AbstractTransport, TransportConfig
 from .util.hcl import deseralize_password_policy
 
 P = ParamSpec("P")
 T = TypeVar("T")
 
+logger = logging.getLogger(__name__)
+
 
 def login_required(func: Callable[P, T]) -> Callable[P, T]:
     @functools.wraps(func)
@@ -44,6 +58,11 @@ def exception_handler(
     async def wrapper(*args: P.args, **kwargs: P.kwargs) -> T:
         try:
             return await func(*args, **kwargs)
+        except UnixClientConnectorError as ex:
+            raise ConnectionRefusedError(
+                'The connection to the UNIX socket "%s" was refused - is the Vault '
+                "Agent running?" % ex.path
+            ) from ex
         except aiohttp.ClientConnectorError as ex:
             raise ConnectionRefusedError(
                 (
@@ -56,12 +75,108 @@ def exception_handler(
     return wrapper
 
 
+def coalesce(
+    func: Callable[..., Awaitable[T]],
+) -> Callable[..., Coroutine[Any, Any, T]]:
+    """Makes the concurrent calls of a read method with the same arguments share a
+    single request, see :class:`Singleflight`."""
+
+    @functools.wraps(func)
+    async def wrapper(self: "Client", *args: Any, **kwargs: Any) -> T:
+        return await self._singleflight.do(
+            func.__name__,
+            (args, frozenset(kwargs.items())),
+            functools.partial(func, self, *args, **kwargs),
+        )
+
+    return wrapper
+
+
+def _cache_key(
+    namespace: str | None,
+    kind: str,
+    fields: tuple[str, ...],
+    args: tuple[Any, ...],
+    kwargs: dict[str, Any],
+) -> CacheKey:
+    values = dict(zip(fields, args)) | kwargs
+    return (namespace, kind, *(values[name] for name in fields))
+
+
+def cached(
+    kind: str, *fields: str
+) -> Callable[[Callable[..., Awaitable[T]]], Callable[..., Coroutine[Any, Any, T]]]:
+    """
+    Serves a read method from the read cache of the client, if enabled.
+
+    Args:
+        kind: The kind of the object the method reads.
+        fields: The arguments that make up the path of the object.
+    """
+
+    def decorator(
+        func: Callable[..., Awaitable[T]],
+    ) -> Callable[..., Coroutine[Any, Any, T]]:
+        @functools.wraps(func)
+        async def wrapper(self: "Client", *args: Any, **kwargs: Any) -> T:
+            if (cache := self._cache) is None:
+                return await func(self, *args, **kwargs)
+
+            key = _cache_key(self._namespace, kind, fields, args, kwargs)
+            found, value = cache.get(key)
+
+            if not found:
+                generation = cache.generation
+                value = await func(self, *args, **kwargs)
+                cache.put(key, value, generation)
+
+            return value
+
+        return wrapper
+
+    return decorator
+
+
+def invalidates(
+    kind: str, *fields: str
+) -> Callable[[Callable[..., Awaitable[T]]], Callable[..., Coroutine[Any, Any, T]]]:
+    """
+    Drops the cached objects a write method changes, i.e. the objects of the given kind
+    whose path starts with the given arguments. They are dropped both before and after
+    the write, since a failed write may still have changed them.
+    """
+
+    def decorator(
+        func: Callable[..., Awaitable[T]],
+    ) -> Callable[..., Coroutine[Any, Any, T]]:
+        @functools.wraps(func)
+        async def wrapper(self: "Client", *args: Any, **kwargs: Any) -> T:
+            if (cache := self._cache) is None:
+                return await func(self, *args, **kwargs)
+
+            prefix = _cache_key(self._namespace, kind, fields, args, kwargs)
+            cache.invalidate(prefix)
+
+            try:
+                return await func(self, *args, **kwargs)
+            finally:
+                cache.invalidate(prefix)
+
+        return wrapper
+
+    return decorator
+
+
 @dataclass(slots=True)
 class Client:
-    # conn: Optional[aiohttp.BaseConnector] = None
-    # sslcontext: Optional[ssl.SSLContext] = None
     # proxy: Optional[str] = None
     # proxy_auth: Optional[aiohttp.BasicAuth] = None
+    transport: TransportConfig = field(default_factory=TransportConfig)
+    retry: RetryConfig = field(default_factory=RetryConfig)
+    rate_limit: RateLimitConfig = field(default_factory=RateLimitConfig)
+    cache: CacheConfig = field(default_factory=CacheConfig)
+    token_cache: TokenCacheConfig = field(default_factory=TokenCacheConfig)
+    trace_configs: list[aiohttp.TraceConfig] = field(default_factory=list)
 
     _env: jinja2.Environment = field(
         init=False,
@@ -69,7 +184,21 @@ class Client:
             loader=jinja2.PackageLoader("vault_autopilot._pkg.asyva"), enable_async=True
         ),
     )
-    _authn_sess: aiohttp.ClientSession | None = field(init=False, default=None)
+    _transport: AbstractTransport | None = field(init=False, default=None)
+    _executor: RequestExecutor = field(init=False)
+    _singleflight: Singleflight = field(init=False, default_factory=Singleflight)
+    _cache: ReadCache | None = field(init=False, default=None)
+    _namespace: str | None = field(init=False, default=None)
+    _base_url: str = field(init=False, default="")
+    _authn: authenticator.AbstractAuthenticator | None = field(init=False, default=None)
+    _token_cache: TokenCache | None = field(init=False, default=None)
+    _token_key: str = field(init=False, default="")
+    _token: AuthToken | None = field(init=False, default=None)
+    _token_from_cache: bool = field(init=False, default=False)
+    _login_lock: asyncio.Lock = field(init=False, default_factory=asyncio.Lock)
+    _renew_task: asyncio.Task[None] | None = field(init=False, default=None)
+    _authn_sess: AbstractSession | None = field(init=False, default=None)
+    _stale_sessions: list[AbstractSession] = field(init=False, default_factory=list)
     _kvv1_mgr: kvv1.KvV1Manager = field(init=False, default_factory=kvv1.KvV1Manager)
     _kvv2_mgr: kvv2.KvV2Manager = field(init=False, default_factory=kvv2.KvV2Manager)
     _pwd_policy_mgr: password_policy.PasswordPolicyManager = field(
@@ -87,11 +216,38 @@ class Client:
         self._render_password_policy = functools.partial(
             self._env.get_template("password_policy.jinja").render_async
         )
+        # All the managers share the executor, so that the circuit breaker sees the
+        # failures of every endpoint
+        self._executor = RequestExecutor(
+            self.retry,
+            RateLimiter(self.rate_limit) if self.rate_limit.enabled else None,
+        )
+
+        if self.cache.enabled:
+            self._cache = ReadCache(self.cache)
+
+        if self.token_cache.enabled:
+            self._token_cache = TokenCache(self.token_cache)
 
     @property
     def is_authenticated(self) -> bool:
         return bool(self._authn_sess)
 
+    @property
+    def rate_limiter(self) -> RateLimiter | None:
+        """The limiter of the request rate, if any limit is configured."""
+        return self._executor.limiter
+
+    @property
+    def singleflight(self) -> Singleflight:
+        """Coalesces the concurrent identical reads, and counts how many were."""
+        return self._singleflight
+
+    @property
+    def read_cache(self) -> ReadCache | None:
+        """The cache of the reads, if enabled."""
+        return self._cache
+
     @exception_handler
     async def authenticate(
         self,
@@ -99,30 +255,189 @@ class Client:
         authn: authenticator.AbstractAuthenticator,
         namespace: str | None = None,
     ) -> Self:
-        # Obtain the authorization bearer token
-        async with composer.BaseComposer(base_url=base_url).create() as sess:
-            token = await authn.authenticate(sess=sess)
-
-        # Provide the managers with an authenticated session, allowing them to access
-        # the secured endpoints
-        self._authn_sess = composer.StandardComposer(
-            base_url=base_url, token=token, namespace=namespace
-        ).create()
-
-        self._kvv1_mgr.configure(sess=self._authn_sess)
-        self._kvv2_mgr.configure(sess=self._authn_sess)
-        self._pwd_policy_mgr.configure(sess=self._authn_sess)
-        self._pki_mgr.configure(sess=self._authn_sess)
-        self._sb_mgr.configure(sess=self._authn_sess)
+        if self._transport is None:
+            self._transport = self.transport.create_transport()
+
+        self._base_url, self._authn, self._namespace = base_url, authn, namespace
+
+        # Reuse the token of an earlier run, if it is still valid for long enough
+        token = None
+        if self._token_cache is not None:
+            self._token_key = TokenCache.key(base_url, namespace, authn.identity())
+            if (token := await self._token_cache.load(self._token_key)) is not None:
+                logger.debug("reusing the cached token")
+
+        self._token_from_cache = token is not None
+        self._use_token(token or await self._login())
+
+        if (
+            self._token_cache is not None
+            and self.token_cache.renew
+            and self._renew_task is None
+        ):
+            self._renew_task = asyncio.create_task(self._renew_token())
+
+        if self.transport.prewarm_connections > 0:
+            await self._prewarm(self.transport.prewarm_connections)
 
         return self
 
+    async def _login(self) -> AuthToken | None:
+        """Obtains a new token from the authenticator, and caches it if enabled."""
+        assert self._transport is not None and self._authn is not None
+
+        # The login and the API sessions share the transport, so the connection opened
+        # for the login is reused by the first API request
+        async with composer.BaseComposer(base_url=self._base_url).create(
+            self._transport, trace_configs=self.trace_configs
+        ) as sess:
+            token = await self._authn.authenticate(sess=sess)
+
+        if self._token_cache is not None and token is not None:
+            await self._token_cache.store(self._token_key, token)
+
+        return token
+
+    def _use_token(self, token: AuthToken | None) -> None:
+        """Provides the managers with a session authenticated by the token, allowing
+        them to access the secured endpoints. Without a token, the session relies on
+        the server to authenticate the requests, e.g. a Vault Agent."""
+        assert self._transport is not None
+
+        if self._authn_sess is not None:
+            # Requests may still be in flight on the previous session, it is closed
+            # along with the client
+            self._stale_sessions.append(self._authn_sess)
+
+        self._token = token
+        self._authn_sess = (
+            composer.StandardComposer(
+                base_url=self._base_url, token=token.token, namespace=self._namespace
+            )
+            if token is not None
+            else composer.NamespaceComposer(
+                base_url=self._base_url, namespace=self._namespace
+            )
+        ).create(self._transport, trace_configs=self.trace_configs)
+
+        for mgr in (
+            self._kvv1_mgr,
+            self._kvv2_mgr,
+            self._pwd_policy_mgr,
+            self._pki_mgr,
+            self._sb_mgr,
+        ):
+            mgr.configure(
+                sess=self._authn_sess,
+                executor=self._executor,
+                on_forbidden=self._on_forbidden if self._token_cache else None,
+            )
+
+    async def _on_forbidden(self, sess: AbstractSession) -> bool:
+        """Logs in again if a cached token was refused, since it may have been revoked
+        since it was cached. Returns whether the request should be retried."""
+        async with self._login_lock:
+            if sess is not self._authn_sess:
+                # Another request already logged in again
+                return True
+
+            if not self._token_from_cache:
+                return False
+
+            logger.info("the cached token was refused, logging in again")
+            self._token_from_cache = False
+
+            try:
+                token = await self._login()
+            except Exception:
+                if self._token_cache is not None:
+                    await self._token_cache.delete(self._token_key)
+                raise
+
+            self._use_token(token)
+            return True
+
+    async def _renew_token(self) -> None:
+        """Renews the token once two thirds of its TTL have elapsed, for as long as
+        Vault extends it.
+
+        References:
+            https://developer.hashicorp.com/vault/api-docs/auth/token#renew-a-token-self
+        """
+        while (token := self._token) is not None and token.renewable and token.ttl:
+            # The token may be replaced while sleeping, e.g. by a new login, with one
+            # that has no TTL
+            ttl = token.ttl
+            await asyncio.sleep(max(token.issued_at + ttl * 2 / 3 - time.time(), 0))
+
+            if (token := self._token) is None or (sess := self._authn_sess) is None:
+                return
+
+            try:
+                resp = await sess.request("POST", "/v1/auth/token/renew-self", json={})
+                if resp.status != http.HTTPStatus.OK:
+                    logger.warning(
+                        "failed to renew the token: %s %s",
+                        resp.status,
+                        await resp.json(),
+                    )
+                    return
+
+                auth = (await resp.json())["auth"]
+            except Exception:
+                logger.warning("failed to renew the token", exc_info=True)
+                return
+
+            renewed = AuthToken(
+                token=token.token,
+                ttl=auth.get("lease_duration") or None,
+                renewable=bool(auth.get("renewable")),
+            )
+            logger.debug("renewed the token for %s seconds", renewed.ttl)
+
+            if self._token is token:
+                self._token = renewed
+                if self._token_cache is not None:
+                    await self._token_cache.store(self._token_key, renewed)
+
+            if renewed.ttl is not None and renewed.ttl <= ttl * 2 / 3:
+                # The token is close to its max TTL, renewing it further won't help
+                return
+
+    async def _prewarm(self, num: int) -> None:
+        """Opens up to ``num`` connections to the server by sending concurrent health
+        checks, which don't require any permissions."""
+        assert self._authn_sess is not None
+
+        async def ping(sess: AbstractSession) -> None:
+            await sess.request("HEAD", "/v1/sys/health")
+
+        results = await asyncio.gather(
+            *(ping(self._authn_sess) for _ in range(num)), return_exceptions=True
+        )
+
+        for result in results:
+            if isinstance(result, Exception):
+                logger.debug("failed to pre-warm a connection", exc_info=result)
+
     async def __aenter__(self) -> "Client":
         return self
 
     async def __aexit__(self) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        """Closes the authenticated session, if any, and the transport."""
+        if self._renew_task is not None:
+            self._renew_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._renew_task
+        for sess in self._stale_sessions:
+            await sess.close()
         if self._authn_sess:
-            await self._authn_sess.__aexit__(None, None, None)
+            await self._authn_sess.close()
+        if self._transport:
+            await self._transport.close()
 
     @exception_handler
     @login_required
@@ -175,6 +490,7 @@ class Client:
 
     @exception_handler
     @login_required
+    @invalidates("password_policy", "path")
     async def update_or_create_password_policy(
         self, path: str, policy: PasswordPolicy | str
     ) -> None:
@@ -200,6 +516,8 @@ class Client:
 
     @exception_handler
     @login_required
+    @coalesce
+    @cached("password_policy", "path")
     async def read_password_policy(self, path: str) -> PasswordPolicy | None:
         """
         Reads an existing password policy.
@@ -234,6 +552,8 @@ class Client:
 
     @exception_handler
     @login_required
+    @invalidates("issuer", "mount_path")
+    @invalidates("issuer_list", "mount_path")
     async def generate_root(
         self, **payload: Unpack[dto.IssuerGenerateRootDTO]
     ) -> pki.GenerateRootResult:
@@ -241,6 +561,7 @@ class Client:
 
     @exception_handler
     @login_required
+    @invalidates("issuer", "mount_path")
     async def generate_intermediate_csr(
         self, **payload: Unpack[dto.IssuerGenerateIntmdCSRDTO]
     ) -> pki.GenerateIntmdCSRResult:
@@ -255,6 +576,8 @@ class Client:
 
     @exception_handler
     @login_required
+    @invalidates("issuer", "mount_path")
+    @invalidates("issuer_list", "mount_path")
     async def set_signed_intermediate(
         self, **payload: Unpack[dto.IssuerSetSignedIntmdDTO]
     ) -> pki.SetSignedIntmdResult:
@@ -267,6 +590,8 @@ class Client:
 
     @exception_handler
     @login_required
+    @invalidates("issuer", "mount_path")
+    @invalidates("issuer_list", "mount_path")
     async def update_issuer(
         self, **payload: Unpack[dto.IssuerUpdateDTO]
     ) -> pki.IssuerUpdateResult:
@@ -274,6 +599,8 @@ class Client:
 
     @exception_handler
     @login_required
+    @coalesce
+    @cached("issuer", "mount_path", "issuer_ref")
     async def read_issuer(
         self, **payload: Unpack[dto.IssuerReadDTO]
     ) -> pki.IssuerReadResult | None:
@@ -281,12 +608,29 @@ class Client:
 
     @exception_handler
     @login_required
+    @coalesce
+    @cached("issuer_list", "mount_path")
+    async def list_issuers(self, mount_path: str) -> frozenset[str] | None:
+        """
+        Returns the IDs and the names of the issuers of a PKI engine, or ``None`` if
+        the token isn't allowed to list them.
+
+        References:
+            https://developer.hashicorp.com/vault/api-docs/secret/pki#list-issuers
+        """
+        result = await self._pki_mgr.list_issuers(mount_path)
+        return result.refs() if result is not None else None
+
+    @exception_handler
+    @login_required
+    @invalidates("pki_role", "mount_path", "name")
     async def update_or_create_pki_role(
         self, **payload: Unpack[dto.PKIRoleCreateDTO]
     ) -> None:
         return await self._pki_mgr.update_or_create_role(**payload)
 
     @login_required
+    @cached("pki_role", "mount_path", "name")
     async def read_pki_role(
         self, **payload: Unpack[dto.PKIRoleReadDTO]
     ) -> pki.RoleReadResult | None:
@@ -294,6 +638,26 @@ class Client:
 
     @exception_handler
     @login_required
+    @coalesce
+    @cached("pki_role_list", "mount_path")
+    async def list_pki_roles(self, mount_path: str) -> frozenset[str] | None:
+        """
+        Returns the names of the roles of a PKI engine, or ``None`` if the token isn't
+        allowed to list them.
+
+        Unlike the issuers, the list isn't invalidated by the writes of the roles: a
+        write only changes whether the written role exists, and the list is only
+        meant to tell whether a role has to be read before it's written.
+
+        References:
+            https://developer.hashicorp.com/vault/api-docs/secret/pki#list-roles
+        """
+        result = await self._pki_mgr.list_roles(mount_path)
+        return frozenset(result.data["keys"]) if result is not None else None
+
+    @exception_handler
+    @login_required
+    @invalidates("mount", "path")
     async def enable_secrets_engine(
         self, **payload: Unpack[dto.SecretsEngineEnableDTO]
     ) -> None:
@@ -301,6 +665,7 @@ class Client:
 
     @exception_handler
     @login_required
+    @invalidates("kv_config", "secret_mount_path")
     async def configure_secrets_engine(
         self, **payload: Unpack[dto.SecretsEngineConfigureDTO]
     ) -> None:
@@ -308,6 +673,7 @@ class Client:
 
     @exception_handler
     @login_required
+    @invalidates("mount", "path")
     async def tune_mount_configuration(
         self, **payload: Unpack[dto.SecretsEngineTuneMountConfigurationDTO]
     ) -> None:
@@ -315,6 +681,8 @@ class Client:
 
     @exception_handler
     @login_required
+    @coalesce
+    @cached("mount", "path")
     async def read_mount_configuration(
         self, **payload: Unpack[dto.SecretsEngineReadDTO]
     ) -> system_backend.ReadMountConfigurationResult | None:
@@ -322,6 +690,8 @@ class Client:
 
     @exception_handler
     @login_required
+    @coalesce
+    @cached("kv_config", "path")
     async def read_kv_configuration(
         self, **payload: Unpack[dto.SecretsEngineReadDTO]
     ) -> kvv2.ReadConfigurationResult | None:
@@ -329,6 +699,7 @@ class Client:
 
     @exception_handler
     @login_required
+    @coalesce
     async def read_kv_metadata(
         self, **payload: Unpack[dto.SecretReadDTO]
     ) -> kvv2.ReadMetadataResult:
@@ -0,0 +1,107 @@
+"""
+The JSON codec the request and response bodies are encoded and decoded with.
+
+orjson is used when it is installed (see the ``orjson`` extra), the standard library
+otherwise. Another codec can be plugged in with :func:`set_codec`.
+"""
+
+import abc
+import json
+from typing import Any
+
+import pydantic_core
+from typing_extensions import override
+
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore[assignment]
+
+__all__ = (
+    "JSONCodec",
+    "StdlibCodec",
+    "OrjsonCodec",
+    "get_codec",
+    "set_codec",
+    "dumps",
+    "loads",
+)
+
+
+class JSONCodec(abc.ABC):
+    """
+    Encodes values to compact JSON and decodes them back.
+
+    Values that JSON has no type for (e.g. sets, dates or :class:`pydantic.SecretStr`)
+    are encoded the way pydantic encodes them in JSON mode.
+    """
+
+    @abc.abstractmethod
+    def dumps(self, obj: Any) -> bytes:
+        """Returns the UTF-8 encoded JSON representation of ``obj``."""
+
+    @abc.abstractmethod
+    def loads(self, data: bytes | str) -> Any: ...
+
+
+class StdlibCodec(JSONCodec):
+    @override
+    def dumps(self, obj: Any) -> bytes:
+        return json.dumps(
+            obj,
+            separators=(",", ":"),
+            ensure_ascii=False,
+            default=pydantic_core.to_jsonable_python,
+        ).encode()
+
+    @override
+    def loads(self, data: bytes | str) -> Any:
+        return json.loads(data)
+
+
+class OrjsonCodec(StdlibCodec):
+    """Falls back to the standard library for the few values orjson rejects, i.e.
+    integers that don't fit in 64 bits."""
+
+    def __init__(self) -> None:
+        if orjson is None:
+            raise ImportError("orjson is not installed")
+
+    @override
+    def dumps(self, obj: Any) -> bytes:
+        assert orjson is not None, "checked when the codec is created"
+
+        try:
+            return orjson.dumps(
+                obj,
+                default=pydantic_core.to_jsonable_python,
+                option=orjson.OPT_NON_STR_KEYS,
+            )
+        except orjson.JSONEncodeError:
+            return super().dumps(obj)
+
+    @override
+    def loads(self, data: bytes | str) -> Any:
+        assert orjson is not None, "checked when the codec is created"
+        return orjson.loads(data)
+
+
+_codec: JSONCodec = OrjsonCodec() if orjson is not None else StdlibCodec()
+
+
+def get_codec() -> JSONCodec:
+    return _codec
+
+
+def set_codec(codec: JSONCodec) -> None:
+    """Replaces the codec of every client in the process."""
+    global _codec
+    _codec = codec
+
+
+def dumps(obj: Any) -> bytes:
+    return _codec.dumps(obj)
+
+
+def loads(data: bytes | str) -> Any:
+    return _codec.loads(data)
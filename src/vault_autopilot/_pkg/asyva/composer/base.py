@@ -1,21 +1,22 @@
+from collections.abc import Iterable, Sequence
 from dataclasses import dataclass
-from typing import Any, Iterable
 
 import aiohttp
 
+from ..transport import AbstractSession, AbstractTransport
+
 HeadersContainer = dict[str, str]
 
 
 @dataclass
 class BaseComposer:
     """
-    A base class for creating aiohttp ClientSession objects with default
-    headers.
+    A base class for creating sessions with default headers.
 
     Attributes:
-        base_url (str): The base URL for the aiohttp ClientSession.
-        skip_auto_headers (Iterator[str]): An iterable of header names to skip when
-            creating the ClientSession.
+        base_url (str): The base URL for the session.
+        skip_auto_headers (Iterator[str]): An iterable of header names the transport
+            mustn't add on its own.
     """
 
     base_url: str
@@ -26,7 +27,7 @@ class BaseComposer:
 
     def compose_default_headers(self) -> HeadersContainer:
         """
-        Composes default headers for the aiohttp ClientSession.
+        Composes default headers for the session.
 
         Returns:
             Dict[str, str]: A dictionary of headers.
@@ -39,14 +40,17 @@ class BaseComposer:
         }
 
     def create(
-        self, headers: HeadersContainer | None = None, **kwargs: Any
-    ) -> aiohttp.ClientSession:
-        """Creates an aiohttp ClientSession."""
+        self,
+        transport: AbstractTransport,
+        headers: HeadersContainer | None = None,
+        trace_configs: Sequence[aiohttp.TraceConfig] = (),
+    ) -> AbstractSession:
+        """Creates a session that sends its requests over the given transport."""
         headers = headers or {}
 
-        return aiohttp.ClientSession(
+        return transport.create_session(
             base_url=self.base_url,
             headers=self.compose_default_headers() | headers,
             skip_auto_headers=self.skip_auto_headers,
-            **kwargs,
+            trace_configs=trace_configs,
         )
@@ -2,9 +2,10 @@ from collections.abc import Iterable
 from dataclasses import dataclass
 from typing import NotRequired
 
-import aiohttp
 from typing_extensions import TypedDict, override
 
+from .transport import Response
+
 
 @dataclass(slots=True)
 class AsyvaError(Exception):
@@ -25,6 +26,27 @@ class AsyvaError(Exception):
         return self.format_message()
 
 
+@dataclass(slots=True)
+class CircuitOpenError(AsyvaError):
+    """
+    Raised instead of sending a request while Vault is considered unavailable, i.e.
+    after a number of consecutive requests failed because it is sealed or down.
+    """
+
+    class Context(TypedDict):
+        """
+        Attributes:
+            failures: The number of consecutive failed requests.
+            retry_in: The number of seconds until a probe request is let through, ``0``
+                if one is already in flight.
+        """
+
+        failures: int
+        retry_in: float
+
+    ctx: Context
+
+
 @dataclass(slots=True)
 class VaultAPIError(AsyvaError):
     class Context(TypedDict):
@@ -33,7 +55,7 @@ class VaultAPIError(AsyvaError):
         request_url: str
 
     @classmethod
-    async def compose_context(cls, response: aiohttp.ClientResponse) -> "Context":
+    async def compose_context(cls, response: Response) -> "Context":
         return cls.Context(
             response=(await response.json() or {}),
             http_method=response.method,
@@ -41,9 +63,7 @@ class VaultAPIError(AsyvaError):
         )
 
     @classmethod
-    async def from_response(
-        cls, message: str, response: aiohttp.ClientResponse
-    ) -> "VaultAPIError":
+    async def from_response(cls, message: str, response: Response) -> "VaultAPIError":
         _STATUS_EXCEPTION_MAP: dict[int, type[VaultAPIError]] = {
             400: InvalidRequestError,
             401: UnauthorizedError,
@@ -0,0 +1,306 @@
+import asyncio
+import email.utils
+import logging
+import random
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from http import HTTPStatus
+
+import aiohttp
+
+from .exc import CircuitOpenError
+from .ratelimit import EndpointClass, RateLimiter
+from .transport import Response
+
+__all__ = ("RetryConfig", "CircuitBreaker", "RequestExecutor", "IDEMPOTENT_METHODS")
+
+logger = logging.getLogger(__name__)
+
+IDEMPOTENT_METHODS = frozenset(("GET", "HEAD", "OPTIONS", "PUT", "DELETE", "LIST"))
+"""HTTP methods that are retried unless the caller says otherwise."""
+
+RETRYABLE_STATUSES = frozenset(
+    (
+        HTTPStatus.TOO_MANY_REQUESTS,
+        HTTPStatus.BAD_GATEWAY,
+        HTTPStatus.SERVICE_UNAVAILABLE,
+        HTTPStatus.GATEWAY_TIMEOUT,
+    )
+)
+
+REJECTED_STATUSES = frozenset(
+    (HTTPStatus.TOO_MANY_REQUESTS, HTTPStatus.SERVICE_UNAVAILABLE)
+)
+"""Statuses Vault responds with before handling the request (rate limit quotas, sealed
+or standby node), so that any request that got them is safe to send again."""
+
+UNAVAILABLE_STATUSES = frozenset(
+    (HTTPStatus.BAD_GATEWAY, HTTPStatus.SERVICE_UNAVAILABLE)
+)
+"""Statuses that mean Vault is sealed, in standby without a reachable active node, or
+down behind a load balancer. They count towards tripping the circuit breaker."""
+
+
+@dataclass(slots=True, kw_only=True)
+class RetryConfig:
+    """
+    Retry, timeout and circuit breaker settings of the requests sent by a client.
+
+    Attributes:
+        max_attempts: The maximum number of attempts per request, including the first
+            one. ``1`` disables retries.
+        backoff_base: The delay, in seconds, before the first retry. The delay doubles
+            with each retry and a random jitter in ``[0, delay]`` is applied to it.
+        backoff_max: The upper bound, in seconds, of the delay between two attempts,
+            including the delays requested by the server with ``Retry-After``.
+        request_timeout: The number of seconds a single attempt may take. ``None``
+            means no limit.
+        deadline: The number of seconds a request may take overall, retries included.
+            No retry is attempted once it would end past the deadline. ``None`` means no
+            limit.
+        breaker_threshold: The number of consecutive failures indicating that Vault is
+            sealed or down after which the circuit breaker opens. ``0`` disables the
+            circuit breaker.
+        breaker_cooldown: The number of seconds an open circuit breaker fails requests
+            fast before letting a single probe request through. The other requests
+            keep failing fast until the probe succeeds.
+    """
+
+    max_attempts: int = 5
+    backoff_base: float = 0.2
+    backoff_max: float = 10.0
+    request_timeout: float | None = 30.0
+    deadline: float | None = 120.0
+    breaker_threshold: int = 5
+    breaker_cooldown: float = 10.0
+
+    def backoff(self, attempt: int) -> float:
+        """Returns the delay before the given retry, ``1`` being the first one."""
+        return random.uniform(
+            0, min(self.backoff_max, self.backoff_base * 2 ** (attempt - 1))
+        )
+
+
+@dataclass(slots=True)
+class CircuitBreaker:
+    """
+    Fails requests fast while Vault is unavailable, instead of letting every pending
+    resource go through its own retries.
+
+    The breaker opens after ``threshold`` consecutive failures. Once ``cooldown``
+    seconds have passed, it is half-open: a single request, the probe, is let through
+    while the others keep failing fast. A success closes the breaker, whereas a probe
+    that ends otherwise, be it a failure or a timeout, opens it for another cooldown
+    period.
+    """
+
+    threshold: int
+    cooldown: float
+    _failures: int = field(init=False, default=0)
+    _opened_at: float | None = field(init=False, default=None)
+    _probing: bool = field(init=False, default=False)
+
+    @property
+    def is_open(self) -> bool:
+        """Whether requests are failed fast, including while a probe is in flight."""
+        return self._opened_at is not None and (
+            self._probing or time.monotonic() - self._opened_at < self.cooldown
+        )
+
+    def check(self) -> bool:
+        """
+        Returns:
+            Whether the request is the probe of a half-open breaker, in which case
+            :meth:`end_probe` must be called once it is done.
+
+        Raises:
+            CircuitOpenError: If the breaker is open, or a probe is already in flight.
+        """
+        if self._opened_at is None:
+            return False
+
+        if not self.is_open:
+            logger.debug("circuit breaker half-open, letting a probe request through")
+            self._probing = True
+            return True
+
+        if self._probing:
+            raise CircuitOpenError(
+                "Vault appears to be sealed or down ({ctx[failures]} consecutive "
+                "failures), not sending requests until a probe request gets through",
+                ctx=CircuitOpenError.Context(failures=self._failures, retry_in=0.0),
+            )
+
+        raise CircuitOpenError(
+            "Vault appears to be sealed or down ({ctx[failures]} consecutive "
+            "failures), not sending requests for another {ctx[retry_in]:.1f}s",
+            ctx=CircuitOpenError.Context(
+                failures=self._failures,
+                retry_in=self.cooldown - (time.monotonic() - self._opened_at),
+            ),
+        )
+
+    def end_probe(self) -> None:
+        """Opens the breaker for another cooldown period, unless the probe closed it."""
+        if self._probing:
+            self._probing = False
+            self._opened_at = time.monotonic()
+
+    def record_success(self) -> None:
+        self._failures, self._opened_at, self._probing = 0, None, False
+
+    def record_failure(self) -> None:
+        self._failures += 1
+
+        if self.threshold and self._failures >= self.threshold:
+            if self._opened_at is None:
+                logger.warning(
+                    "circuit breaker opened after %d consecutive failures",
+                    self._failures,
+                )
+            self._opened_at = time.monotonic()
+
+
+def parse_retry_after(resp: Response) -> float | None:
+    """Returns the delay requested by the ``Retry-After`` header of the response, in
+    seconds, if any."""
+    if (value := resp.headers.get("Retry-After")) is None:
+        return None
+
+    if value.strip().isdigit():
+        return float(value)
+
+    try:
+        retry_at = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+
+    return max(retry_at.timestamp() - time.time(), 0.0)
+
+
+@dataclass(slots=True)
+class RequestExecutor:
+    """
+    Sends requests on behalf of the managers, retrying the ones that failed
+    transiently.
+
+    A request is retried when it fails with a connection error, times out, or gets one
+    of the :data:`RETRYABLE_STATUSES`, but only if it is safe to send it again: either
+    Vault rejected it without handling it (see :data:`REJECTED_STATUSES`), or the
+    caller tells that the request is idempotent, i.e. that repeating it has the same
+    effect as sending it once (e.g. a write guarded by a check-and-set parameter). The
+    responses of the last attempt are returned as is, so the callers keep mapping them
+    to exceptions.
+
+    If a rate limiter is given, each attempt waits for the budget of its class of
+    endpoints first. The wait doesn't count towards the timeout of the attempt, but
+    does count towards the deadline of the request.
+    """
+
+    config: RetryConfig = field(default_factory=RetryConfig)
+    limiter: RateLimiter | None = None
+    breaker: CircuitBreaker = field(init=False)
+
+    def __post_init__(self) -> None:
+        self.breaker = CircuitBreaker(
+            self.config.breaker_threshold, self.config.breaker_cooldown
+        )
+
+    async def execute(
+        self,
+        send: Callable[[], Awaitable[Response]],
+        idempotent: bool,
+        endpoint: EndpointClass,
+        description: str = "request",
+    ) -> Response:
+        """
+        Args:
+            send: Sends a single attempt of the request.
+            idempotent: Whether the request may be sent more than once.
+            endpoint: The class of the endpoint the request is sent to.
+            description: Describes the request in the log messages.
+
+        Raises:
+            CircuitOpenError: If the circuit breaker is open.
+        """
+        probe = self.breaker.check()
+
+        try:
+            return await self._execute(send, idempotent, endpoint, description)
+        finally:
+            if probe:
+                self.breaker.end_probe()
+
+    async def _execute(
+        self,
+        send: Callable[[], Awaitable[Response]],
+        idempotent: bool,
+        endpoint: EndpointClass,
+        description: str,
+    ) -> Response:
+        config, loop = self.config, asyncio.get_running_loop()
+        deadline = loop.time() + config.deadline if config.deadline else None
+        attempt = 0
+
+        while True:
+            attempt += 1
+
+            if self.limiter is not None:
+                await self.limiter.acquire(endpoint)
+
+            timeout = config.request_timeout
+            if deadline is not None:
+                remaining = max(deadline - loop.time(), 0.0)
+                timeout = min(timeout, remaining) if timeout else remaining
+
+            resp: Response | None = None
+            error: Exception | None = None
+
+            try:
+                async with asyncio.timeout(timeout):
+                    resp = await send()
+            except (aiohttp.ClientConnectionError, TimeoutError) as ex:
+                if isinstance(ex, aiohttp.ClientConnectorError):
+                    self.breaker.record_failure()
+                error = ex
+            else:
+                if resp.status in UNAVAILABLE_STATUSES:
+                    self.breaker.record_failure()
+                else:
+                    self.breaker.record_success()
+
+                if resp.status not in RETRYABLE_STATUSES:
+                    return resp
+
+            if attempt >= config.max_attempts or not (
+                idempotent or (resp is not None and resp.status in REJECTED_STATUSES)
+            ):
+                break
+
+            delay = config.backoff(attempt)
+            if resp is not None and (retry_after := parse_retry_after(resp)):
+                delay = min(retry_after, config.backoff_max)
+
+            if deadline is not None and loop.time() + delay >= deadline:
+                break
+
+            # Report the actual failure rather than the breaker opened by it
+            if self.breaker.is_open:
+                break
+
+            logger.debug(
+                "%s failed (%s), retrying in %.2fs (attempt %d/%d)",
+                description,
+                resp.status if resp is not None else repr(error),
+                delay,
+                attempt + 1,
+                config.max_attempts,
+            )
+            await asyncio.sleep(delay)
+
+        if resp is not None:
+            return resp
+
+        assert error is not None
+        raise error
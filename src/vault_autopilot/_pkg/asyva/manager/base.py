@@ -1,11 +1,19 @@
 import contextlib
-from collections.abc import AsyncGenerator
+import http
+from collections.abc import AsyncGenerator, Awaitable, Callable, Mapping
 from dataclasses import dataclass, field
 from typing import Any, Self
 
-import aiohttp
 from pydantic import BaseModel
 
+from ..executor import IDEMPOTENT_METHODS, RequestExecutor
+from ..ratelimit import EndpointClass
+from ..transport import AbstractSession, Response
+
+ForbiddenHandler = Callable[[AbstractSession], Awaitable[bool]]
+"""Called with the session a request was refused on, returns whether the manager was
+configured with a new session the request should be retried on."""
+
 
 class AbstractResult(BaseModel):
     request_id: str
@@ -21,14 +29,101 @@ class AbstractResult(BaseModel):
         return cls.model_construct(**data)  # type: ignore[return-value]
 
 
+@dataclass(slots=True, frozen=True)
+class RequestContext:
+    """
+    Describes a request to the trace configs of the session (see
+    :class:`aiohttp.TraceConfig`), which receive it as ``trace_request_ctx``.
+
+    Attributes:
+        url_template: The URL of the endpoint before the path parameters were
+            substituted, e.g. ``/v1/{mount_path}/data/{path}``.
+    """
+
+    url_template: str
+
+
 @dataclass(slots=True)
 class BaseManager:
-    _sess: aiohttp.ClientSession | None = field(init=False, default=None)
+    _sess: AbstractSession | None = field(init=False, default=None)
+    _executor: RequestExecutor | None = field(init=False, default=None)
+    _on_forbidden: ForbiddenHandler | None = field(init=False, default=None)
 
-    def configure(self, sess: aiohttp.ClientSession) -> None:
+    def configure(
+        self,
+        sess: AbstractSession,
+        executor: RequestExecutor | None = None,
+        on_forbidden: ForbiddenHandler | None = None,
+    ) -> None:
         self._sess = sess
+        self._executor = executor
+        self._on_forbidden = on_forbidden
+
+    def endpoint_class(self, method: str, url_template: str) -> EndpointClass:
+        """Returns the class of endpoints whose rate limit applies to the request."""
+        return "sys"
 
     @contextlib.asynccontextmanager
-    async def new_session(self) -> AsyncGenerator[aiohttp.ClientSession, None]:
+    async def new_session(self) -> AsyncGenerator[AbstractSession, None]:
         assert self._sess, "The manager isn't configured but session is requested"
         yield self._sess
+
+    async def request(
+        self,
+        method: str,
+        url_template: str,
+        path_params: Mapping[str, str] | None = None,
+        idempotent: bool | None = None,
+        **kwargs: Any,
+    ) -> Response:
+        """
+        Sends an HTTP request using the session the manager is configured with.
+
+        The response body is read and the connection is released back to the pool
+        before returning (see :meth:`AbstractSession.request`).
+
+        If the manager is configured with an executor, transient failures are retried
+        as long as the request is idempotent (see :class:`RequestExecutor`). If it is
+        configured with a forbidden handler, a refused request is sent once more on
+        the session the handler provides, e.g. after the token expired.
+
+        Args:
+            method: The HTTP method.
+            url_template: The URL of the endpoint, in the :meth:`str.format` syntax.
+            path_params: The values to substitute into ``url_template``.
+            idempotent: Whether the request can safely be sent more than once. Defaults
+                to ``True`` for the methods in :data:`IDEMPOTENT_METHODS`.
+            **kwargs: Passed to :meth:`AbstractSession.request` as is.
+        """
+        url, ctx = (
+            url_template.format_map(path_params or {}),
+            RequestContext(url_template),
+        )
+
+        async def send() -> Response:
+            async with self.new_session() as sess:
+                resp = await sess.request(method, url, trace_request_ctx=ctx, **kwargs)
+
+            if (
+                resp.status == http.HTTPStatus.FORBIDDEN
+                and self._on_forbidden is not None
+                and await self._on_forbidden(sess)
+            ):
+                async with self.new_session() as sess:
+                    resp = await sess.request(
+                        method, url, trace_request_ctx=ctx, **kwargs
+                    )
+
+            return resp
+
+        if self._executor is None:
+            return await send()
+
+        return await self._executor.execute(
+            send,
+            idempotent=(
+                method in IDEMPOTENT_METHODS if idempotent is None else idempotent
+            ),
+            endpoint=self.endpoint_class(method, url_template),
+            description="%s %s" % (method, url),
+        )
@@ -1,6 +1,5 @@
 import logging
 from http import HTTPStatus
-from os import path
 
 from typing_extensions import Any, Unpack
 
@@ -8,6 +7,7 @@ from .. import dto
 from ..exc import (
     VaultAPIError,
 )
+from ..ratelimit import EndpointClass
 from .base import AbstractResult, BaseManager
 
 logger = logging.getLogger(__name__)
@@ -18,6 +18,9 @@ class ReadResult(AbstractResult):
 
 
 class KvV1Manager(BaseManager):
+    def endpoint_class(self, method: str, url_template: str) -> EndpointClass:
+        return "kv_read" if method == "GET" else "kv_write"
+
     async def update_or_create(
         self, **payload: Unpack[dto.KvV1SecretCreateDTO]
     ) -> None:
@@ -26,11 +29,13 @@ class KvV1Manager(BaseManager):
             <https://developer.hashicorp.com/vault/api-docs/secret/kv/kv-v1#read-secret>
         """
 
-        async with self.new_session() as sess:
-            resp = await sess.post(
-                url=path.join("/v1", payload["mount_path"], payload["path"]),
-                json=payload["data"],
-            )
+        resp = await self.request(
+            "POST",
+            "/v1/{mount_path}/{path}",
+            {"mount_path": payload["mount_path"], "path": payload["path"]},
+            idempotent=True,
+            json=payload["data"],
+        )
 
         if resp.status == HTTPStatus.NO_CONTENT:
             return
@@ -43,10 +48,11 @@ class KvV1Manager(BaseManager):
             <https://developer.hashicorp.com/vault/api-docs/secret/kv/kv-v1#read-secret>
         """
 
-        async with self.new_session() as sess:
-            resp = await sess.get(
-                url=path.join("/v1", payload["mount_path"], payload["path"]),
-            )
+        resp = await self.request(
+            "GET",
+            "/v1/{mount_path}/{path}",
+            {"mount_path": payload["mount_path"], "path": payload["path"]},
+        )
 
         if resp.status == HTTPStatus.OK:
             return ReadResult.from_response(await resp.json())
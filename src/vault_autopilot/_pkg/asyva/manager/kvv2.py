@@ -12,6 +12,7 @@ from ..exc import (
     InvalidPathError,
     VaultAPIError,
 )
+from ..ratelimit import EndpointClass
 from .base import AbstractResult, BaseManager
 
 logger = logging.getLogger(__name__)
@@ -55,6 +56,9 @@ class ReadMetadataResult(AbstractResult):
 
 
 class KvV2Manager(BaseManager):
+    def endpoint_class(self, method: str, url_template: str) -> EndpointClass:
+        return "kv_read" if method == "GET" else "kv_write"
+
     async def update_or_create(
         self, **payload: Unpack[dto.KvV2SecretCreateDTO]
     ) -> UpdateOrCreateResult:
@@ -71,8 +75,15 @@ class KvV2Manager(BaseManager):
         if isinstance((cas := payload.get("cas")), int):
             data.update({"options": {"cas": cas}})
 
-        async with self.new_session() as sess:
-            resp = await sess.post("/v1/%s/data/%s" % (mount_path, path), json=data)
+        resp = await self.request(
+            "POST",
+            "/v1/{mount_path}/data/{path}",
+            {"mount_path": mount_path, "path": path},
+            # Without a check-and-set parameter, a retried write would create another
+            # version of the secret
+            idempotent=cas is not None,
+            json=data,
+        )
 
         result = await resp.json()
 
@@ -118,11 +129,13 @@ class KvV2Manager(BaseManager):
     async def update_or_create_metadata(
         self, **payload: Unpack[dto.SecretUpdateOrCreateMetadata]
     ) -> None:
-        async with self.new_session() as sess:
-            resp = await sess.post(
-                "/v1/%s/metadata/%s" % (payload["mount_path"], payload["path"]),
-                json=model_dump(payload, exclude=("mount_path", "path")),
-            )
+        resp = await self.request(
+            "POST",
+            "/v1/{mount_path}/metadata/{path}",
+            {"mount_path": payload["mount_path"], "path": payload["path"]},
+            idempotent=True,
+            json=model_dump(payload, exclude=("mount_path", "path")),
+        )
 
         if resp.status == HTTPStatus.NO_CONTENT:
             return
@@ -134,10 +147,11 @@ class KvV2Manager(BaseManager):
     async def read_metadata(
         self, **payload: Unpack[dto.SecretReadDTO]
     ) -> ReadMetadataResult:
-        async with self.new_session() as sess:
-            resp = await sess.get(
-                "/v1/%s/metadata/%s" % (payload["mount_path"], payload["path"])
-            )
+        resp = await self.request(
+            "GET",
+            "/v1/{mount_path}/metadata/{path}",
+            {"mount_path": payload["mount_path"], "path": payload["path"]},
+        )
 
         if resp.status == HTTPStatus.OK:
             return ReadMetadataResult.from_response(await resp.json() or {})
@@ -151,10 +165,13 @@ class KvV2Manager(BaseManager):
         References:
             <https://developer.hashicorp.com/vault/api-docs/secret/kv/kv-v2#configure-the-kv-engine>
         """
-        async with self.new_session() as sess:
-            resp = await sess.post(
-                "/v1/%s/config" % payload["secret_mount_path"], json=payload
-            )
+        resp = await self.request(
+            "POST",
+            "/v1/{mount_path}/config",
+            {"mount_path": payload["secret_mount_path"]},
+            idempotent=True,
+            json=payload,
+        )
 
         if resp.status == HTTPStatus.NO_CONTENT:
             return
@@ -170,8 +187,9 @@ class KvV2Manager(BaseManager):
         References:
             <https://developer.hashicorp.com/vault/api-docs/secret/kv/kv-v2#read-kv-engine-configuration>
         """
-        async with self.new_session() as sess:
-            resp = await sess.get("/v1/%s/config" % payload["path"])
+        resp = await self.request(
+            "GET", "/v1/{mount_path}/config", {"mount_path": payload["path"]}
+        )
 
         if resp.status == HTTPStatus.OK:
             return ReadConfigurationResult.from_response(await resp.json())
@@ -5,6 +5,7 @@ from typing_extensions import TypedDict
 
 from ...._pkg.asyva.manager.base import AbstractResult, BaseManager
 from ..exc import PasswordPolicyNotFoundError, VaultAPIError
+from ..ratelimit import EndpointClass
 
 BASE_PATH = "/v1/sys/policies/password"
 
@@ -17,12 +18,17 @@ class ReadResult(AbstractResult):
 
 
 class PasswordPolicyManager(BaseManager):
+    def endpoint_class(self, method: str, url_template: str) -> EndpointClass:
+        return "password_generation" if url_template.endswith("/generate") else "sys"
+
     async def update_or_create(self, path: str, policy: str) -> None:
-        async with self.new_session() as sess:
-            resp = await sess.post(
-                "/".join((BASE_PATH, path)),
-                json={"policy": policy},
-            )
+        resp = await self.request(
+            "POST",
+            BASE_PATH + "/{path}",
+            {"path": path},
+            idempotent=True,
+            json={"policy": policy},
+        )
 
         if resp.status == HTTPStatus.NO_CONTENT:
             return
@@ -32,8 +38,7 @@ class PasswordPolicyManager(BaseManager):
         )
 
     async def read(self, path: str) -> ReadResult | None:
-        async with self.new_session() as sess:
-            resp = await sess.get("/".join((BASE_PATH, path)))
+        resp = await self.request("GET", BASE_PATH + "/{path}", {"path": path})
 
         result = await resp.json() or {}
 
@@ -46,8 +51,9 @@ class PasswordPolicyManager(BaseManager):
         raise await VaultAPIError.from_response("Failed to read password policy", resp)
 
     async def generate_password(self, policy_ref: str) -> str:
-        async with self.new_session() as sess:
-            resp = await sess.get("/".join((BASE_PATH, policy_ref, "generate")))
+        resp = await self.request(
+            "GET", BASE_PATH + "/{path}/generate", {"path": policy_ref}
+        )
 
         resp_body = await resp.json()
         if resp.status == HTTPStatus.OK:
@@ -1,16 +1,17 @@
 from http import HTTPStatus
 from typing import Any, NoReturn, NotRequired
 
-import aiohttp
 import pydantic
 from typing_extensions import TypedDict, Unpack
 
 from vault_autopilot._pkg.asyva.dto.pki_role import PKIRoleFields
 from vault_autopilot._pkg.asyva.exc import IssuerNameTakenError, VaultAPIError
 
-from ....util.model import model_dump, model_dump_json
+from ....util.model import dump_json, model_dump
 from .. import constants, dto
 from ..dto import issuer
+from ..ratelimit import EndpointClass
+from ..transport import Response
 from .base import AbstractResult, BaseManager
 
 __all__ = (
@@ -21,6 +22,8 @@ __all__ = (
     "SetSignedIntmdResult",
     "IssuerUpdateResult",
     "IssuerReadResult",
+    "IssuerListResult",
+    "RoleListResult",
 )
 
 
@@ -101,8 +104,35 @@ class RoleReadResult(AbstractResult):
     data: PKIRoleFields
 
 
+class IssuerKeyInfo(TypedDict):
+    issuer_name: str
+
+
+class IssuerListResult(AbstractResult):
+    class Data(TypedDict):
+        keys: list[str]
+        key_info: NotRequired[dict[str, IssuerKeyInfo]]
+
+    data: Data
+
+    def refs(self) -> frozenset[str]:
+        """Returns the IDs and the names of the issuers."""
+        return frozenset(self.data["keys"]) | {
+            name
+            for info in self.data.get("key_info", {}).values()
+            if (name := info.get("issuer_name"))
+        }
+
+
+class RoleListResult(AbstractResult):
+    class Data(TypedDict):
+        keys: list[str]
+
+    data: Data
+
+
 async def raise_issuer_name_taken_exc(
-    response: aiohttp.ClientResponse, name_collision: str, secrets_engine_ref: str
+    response: Response, name_collision: str, secrets_engine_ref: str
 ) -> NoReturn:
     raise IssuerNameTakenError(
         "Issuer name {ctx[path_collision]!r} (secrets_engine: {ctx[mount_path]!r}) "
@@ -116,18 +146,18 @@ async def raise_issuer_name_taken_exc(
 
 
 class PKIManager(BaseManager):
+    def endpoint_class(self, method: str, url_template: str) -> EndpointClass:
+        return "pki"
+
     async def generate_root(
         self, **payload: Unpack[dto.IssuerGenerateRootDTO]
     ) -> GenerateRootResult:
-        async with self.new_session() as sess:
-            resp = await sess.post(
-                "/v1/{mount_path}/issuers/generate/{issuer_type}/{cert_type}".format(
-                    mount_path=payload["mount_path"],
-                    issuer_type="root",
-                    cert_type=payload["type"],
-                ),
-                data=model_dump_json(payload, exclude=GENERATE_QUERY_PARAMS),
-            )
+        resp = await self.request(
+            "POST",
+            "/v1/{mount_path}/issuers/generate/root/{cert_type}",
+            {"mount_path": payload["mount_path"], "cert_type": payload["type"]},
+            data=dump_json(payload, exclude=GENERATE_QUERY_PARAMS),
+        )
 
         result = await resp.json() or {}
 
@@ -147,15 +177,12 @@ class PKIManager(BaseManager):
     async def generate_intmd_csr(
         self, **payload: Unpack[dto.IssuerGenerateIntmdCSRDTO]
     ) -> GenerateIntmdCSRResult:
-        async with self.new_session() as sess:
-            resp = await sess.post(
-                "/v1/{mount_path}/issuers/generate/{issuer_type}/{cert_type}".format(
-                    mount_path=payload["mount_path"],
-                    issuer_type="intermediate",
-                    cert_type=payload["type"],
-                ),
-                data=model_dump_json(payload, exclude=GENERATE_QUERY_PARAMS),
-            )
+        resp = await self.request(
+            "POST",
+            "/v1/{mount_path}/issuers/generate/intermediate/{cert_type}",
+            {"mount_path": payload["mount_path"], "cert_type": payload["type"]},
+            data=dump_json(payload, exclude=GENERATE_QUERY_PARAMS),
+        )
 
         result = await resp.json() or {}
 
@@ -169,12 +196,12 @@ class PKIManager(BaseManager):
     async def sign_intmd(
         self, **payload: Unpack[dto.IssuerSignIntmdDTO]
     ) -> SignIntmdResult:
-        async with self.new_session() as sess:
-            resp = await sess.post(
-                "/v1/%s/issuer/%s/sign-intermediate"
-                % (payload["mount_path"], payload["issuer_ref"]),
-                data=model_dump_json(payload, exclude={"mount_path", "issuer_ref"}),
-            )
+        resp = await self.request(
+            "POST",
+            "/v1/{mount_path}/issuer/{issuer_ref}/sign-intermediate",
+            {"mount_path": payload["mount_path"], "issuer_ref": payload["issuer_ref"]},
+            data=dump_json(payload, exclude={"mount_path", "issuer_ref"}),
+        )
 
         if resp.status == HTTPStatus.OK:
             return SignIntmdResult.from_response(await resp.json() or {})
@@ -189,11 +216,13 @@ class PKIManager(BaseManager):
         """
         Set a signed intermediate certificate in Vault.
         """
-        async with self.new_session() as sess:
-            resp = await sess.post(
-                "/v1/%s/intermediate/set-signed" % payload["mount_path"],
-                json={"certificate": payload["certificate"]},
-            )
+        resp = await self.request(
+            "POST",
+            "/v1/{mount_path}/intermediate/set-signed",
+            {"mount_path": payload["mount_path"]},
+            idempotent=True,
+            json={"certificate": payload["certificate"]},
+        )
 
         if resp.status == HTTPStatus.OK:
             return SetSignedIntmdResult.from_response(await resp.json() or {})
@@ -203,11 +232,13 @@ class PKIManager(BaseManager):
         )
 
     async def update_key(self, **payload: Unpack[dto.KeyUpdateDTO]) -> None:
-        async with self.new_session() as sess:
-            resp = await sess.post(
-                "/v1/%s/key/%s" % (payload["mount_path"], payload["key_ref"]),
-                json={"key_name": payload["key_name"]},
-            )
+        resp = await self.request(
+            "POST",
+            "/v1/{mount_path}/key/{key_ref}",
+            {"mount_path": payload["mount_path"], "key_ref": payload["key_ref"]},
+            idempotent=True,
+            json={"key_name": payload["key_name"]},
+        )
 
         if resp.status == HTTPStatus.OK:
             return
@@ -217,12 +248,14 @@ class PKIManager(BaseManager):
     async def update_issuer(
         self, **payload: Unpack[dto.IssuerUpdateDTO]
     ) -> IssuerUpdateResult:
-        async with self.new_session() as sess:
-            resp = await sess.patch(
-                "/v1/%s/issuer/%s" % (payload["mount_path"], payload["issuer_ref"]),
-                json=model_dump(payload, exclude={"mount_path", "issuer_ref"}),
-                headers={"Content-Type": "application/merge-patch+json"},
-            )
+        resp = await self.request(
+            "PATCH",
+            "/v1/{mount_path}/issuer/{issuer_ref}",
+            {"mount_path": payload["mount_path"], "issuer_ref": payload["issuer_ref"]},
+            idempotent=True,
+            json=model_dump(payload, exclude={"mount_path", "issuer_ref"}),
+            headers={"Content-Type": "application/merge-patch+json"},
+        )
 
         result = await resp.json() or {}
 
@@ -242,11 +275,13 @@ class PKIManager(BaseManager):
     async def update_or_create_role(
         self, **payload: Unpack[dto.PKIRoleCreateDTO]
     ) -> None:
-        async with self.new_session() as sess:
-            resp = await sess.post(
-                "/v1/%s/roles/%s" % (payload["mount_path"], payload["name"]),
-                data=model_dump_json(payload, exclude={"mount_path", "name"}),
-            )
+        resp = await self.request(
+            "POST",
+            "/v1/{mount_path}/roles/{name}",
+            {"mount_path": payload["mount_path"], "name": payload["name"]},
+            idempotent=True,
+            data=dump_json(payload, exclude={"mount_path", "name"}),
+        )
 
         if resp.status == HTTPStatus.OK:
             return
@@ -258,8 +293,11 @@ class PKIManager(BaseManager):
     async def read_issuer(
         self, mount_path: str, issuer_ref: str
     ) -> IssuerReadResult | None:
-        async with self.new_session() as sess:
-            resp = await sess.get("/v1/%s/issuer/%s" % (mount_path, issuer_ref))
+        resp = await self.request(
+            "GET",
+            "/v1/{mount_path}/issuer/{issuer_ref}",
+            {"mount_path": mount_path, "issuer_ref": issuer_ref},
+        )
 
         result = await resp.json()
 
@@ -275,13 +313,63 @@ class PKIManager(BaseManager):
 
         raise await VaultAPIError.from_response("Failed to read issuer", resp)
 
+    async def list_issuers(self, mount_path: str) -> IssuerListResult | None:
+        """
+        Lists the issuers of a PKI engine, along with their names.
+
+        Returns:
+            ``None`` if the token isn't allowed to list the issuers, in which case the
+            issuers have to be read one by one.
+        """
+        # The same as the LIST method, which not every proxy lets through
+        resp = await self.request(
+            "GET", "/v1/{mount_path}/issuers?list=true", {"mount_path": mount_path}
+        )
+
+        if resp.status == HTTPStatus.OK:
+            return IssuerListResult.from_response(await resp.json() or {})
+
+        # Vault responds with 404 rather than an empty list
+        if resp.status == HTTPStatus.NOT_FOUND:
+            return IssuerListResult.from_response({"data": {"keys": []}})
+
+        if resp.status == HTTPStatus.FORBIDDEN:
+            return None
+
+        raise await VaultAPIError.from_response("Failed to list issuers", resp)
+
+    async def list_roles(self, mount_path: str) -> RoleListResult | None:
+        """
+        Lists the names of the roles of a PKI engine.
+
+        Returns:
+            ``None`` if the token isn't allowed to list the roles, in which case the
+            roles have to be read one by one.
+        """
+        # The same as the LIST method, which not every proxy lets through
+        resp = await self.request(
+            "GET", "/v1/{mount_path}/roles?list=true", {"mount_path": mount_path}
+        )
+
+        if resp.status == HTTPStatus.OK:
+            return RoleListResult.from_response(await resp.json() or {})
+
+        if resp.status == HTTPStatus.NOT_FOUND:
+            return RoleListResult.from_response({"data": {"keys": []}})
+
+        if resp.status == HTTPStatus.FORBIDDEN:
+            return None
+
+        raise await VaultAPIError.from_response("Failed to list pki roles", resp)
+
     async def read_role(
         self, **payload: Unpack[dto.PKIRoleReadDTO]
     ) -> RoleReadResult | None:
-        async with self.new_session() as sess:
-            resp = await sess.get(
-                "/v1/%s/roles/%s" % (payload["mount_path"], payload["name"]),
-            )
+        resp = await self.request(
+            "GET",
+            "/v1/{mount_path}/roles/{name}",
+            {"mount_path": payload["mount_path"], "name": payload["name"]},
+        )
 
         if resp.status == HTTPStatus.OK:
             return RoleReadResult.from_response(await resp.json() or {})
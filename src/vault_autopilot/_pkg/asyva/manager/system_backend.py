@@ -1,5 +1,4 @@
 from http import HTTPStatus
-from os import path
 from typing import NotRequired
 
 from typing_extensions import Unpack
@@ -36,11 +35,12 @@ class SystemBackendManager(BaseManager):
             https://developer.hashicorp.com/vault/api-docs/system/mounts#enable-secrets-engine
         """
 
-        async with self.new_session() as sess:
-            resp = await sess.post(
-                path.join(BASE_PATH, payload["path"]),
-                json=model_dump(payload, exclude=("path",)),
-            )
+        resp = await self.request(
+            "POST",
+            BASE_PATH + "{path}",
+            {"path": payload["path"]},
+            json=model_dump(payload, exclude=("path",)),
+        )
 
         result = await resp.json() or {}
 
@@ -72,11 +72,13 @@ class SystemBackendManager(BaseManager):
         References:
             https://developer.hashicorp.com/vault/api-docs/system/mounts#tune-mount-configuration
         """
-        async with self.new_session() as sess:
-            resp = await sess.post(
-                path.join(BASE_PATH, payload["path"], "tune"),
-                json=model_dump(payload, exclude=("path",)),
-            )
+        resp = await self.request(
+            "POST",
+            BASE_PATH + "{path}/tune",
+            {"path": payload["path"]},
+            idempotent=True,
+            json=model_dump(payload, exclude=("path",)),
+        )
 
         if resp.status == HTTPStatus.NO_CONTENT:
             return
@@ -92,11 +94,12 @@ class SystemBackendManager(BaseManager):
         References:
             https://developer.hashicorp.com/vault/api-docs/system/mounts#read-mount-configuration
         """
-        async with self.new_session() as sess:
-            resp = await sess.get(
-                path.join(BASE_PATH, payload["path"], "tune"),
-                json=model_dump(payload, exclude=("path",)),
-            )
+        resp = await self.request(
+            "GET",
+            BASE_PATH + "{path}/tune",
+            {"path": payload["path"]},
+            json=model_dump(payload, exclude=("path",)),
+        )
 
         if resp.status == HTTPStatus.OK:
             return ReadMountConfigurationResult.from_response(await resp.json() or {})
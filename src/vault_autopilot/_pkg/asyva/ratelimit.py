@@ -0,0 +1,196 @@
+import asyncio
+import dataclasses
+import time
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from typing import Literal, get_args
+
+__all__ = (
+    "EndpointClass",
+    "ENDPOINT_CLASSES",
+    "RateLimitConfig",
+    "RateLimitStats",
+    "TokenBucket",
+    "RateLimiter",
+)
+
+EndpointClass = Literal["kv_read", "kv_write", "pki", "sys", "password_generation"]
+"""The classes of endpoints that have separate request budgets."""
+
+ENDPOINT_CLASSES: tuple[EndpointClass, ...] = get_args(EndpointClass)
+
+
+@dataclass(slots=True, kw_only=True)
+class RateLimitConfig:
+    """
+    Client-side request rate limits, in requests per second. ``None`` means no limit.
+
+    Attributes:
+        max_rps: The limit on all the requests sent by the client.
+        kv_read: The limit on the reads of KV secrets, their metadata and the
+            configuration of KV engines.
+        kv_write: The limit on the writes to KV secrets, their metadata and the
+            configuration of KV engines.
+        pki: The limit on the requests to PKI engines, e.g. generating and signing
+            issuers or configuring roles.
+        sys: The limit on the requests to the system backend (``sys/*``), other than
+            password generation.
+        password_generation: The limit on the passwords generated from password
+            policies.
+        burst: The number of requests a budget allows at once after it has been idle.
+            Defaults to one second's worth of requests.
+    """
+
+    max_rps: float | None = None
+    kv_read: float | None = None
+    kv_write: float | None = None
+    pki: float | None = None
+    sys: float | None = None
+    password_generation: float | None = None
+    burst: int | None = None
+
+    def __post_init__(self) -> None:
+        for name in ("max_rps", "burst") + ENDPOINT_CLASSES:
+            if (value := getattr(self, name)) is not None and value <= 0:
+                raise ValueError("%s must be greater than 0, got %r" % (name, value))
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_rps is not None or any(
+            getattr(self, endpoint) is not None for endpoint in ENDPOINT_CLASSES
+        )
+
+    def split(self, parts: int) -> "RateLimitConfig":
+        """Returns the limits of one of ``parts`` clients that share the budgets."""
+        return dataclasses.replace(
+            self,
+            **{
+                name: value / parts
+                for name in ("max_rps",) + ENDPOINT_CLASSES
+                if (value := getattr(self, name)) is not None
+            },
+        )
+
+
+@dataclass(slots=True)
+class RateLimitStats:
+    """
+    Attributes:
+        requests: The number of requests that went through the limiter.
+        delayed: The number of requests that had to wait for their budget.
+        wait_time: The total time the requests waited, in seconds.
+        max_wait: The longest time a single request waited, in seconds.
+    """
+
+    requests: int = 0
+    delayed: int = 0
+    wait_time: float = 0.0
+    max_wait: float = 0.0
+
+    def record(self, wait: float) -> None:
+        self.requests += 1
+        self.wait_time += wait
+        self.max_wait = max(self.max_wait, wait)
+
+        if wait > 0:
+            self.delayed += 1
+
+    def merge(self, other: "RateLimitStats") -> None:
+        self.requests += other.requests
+        self.delayed += other.delayed
+        self.wait_time += other.wait_time
+        self.max_wait = max(self.max_wait, other.max_wait)
+
+
+@dataclass(slots=True)
+class TokenBucket:
+    """
+    A token bucket refilled with ``rate`` tokens per second and holding at most
+    ``capacity`` of them.
+
+    Instead of counting tokens, the bucket tracks the time at which the next token will
+    be available (the "theoretical arrival time" of the generic cell rate algorithm).
+    Each caller reserves a token by moving that time forward, so the callers are served
+    in the order they arrived without holding a lock while waiting.
+    """
+
+    rate: float
+    capacity: float
+    _available_at: float = field(init=False, default=0.0)
+
+    def reserve(self, now: float) -> float:
+        """Reserves a token for a request sent no earlier than ``now`` and returns the
+        time the request may be sent at."""
+        interval = 1 / self.rate
+        available_at = max(self._available_at, now)
+
+        self._available_at = available_at + interval
+
+        # The bucket lets up to ``capacity`` requests through ahead of schedule
+        return max(available_at - (self.capacity - 1) * interval, now)
+
+
+@dataclass(slots=True)
+class RateLimiter:
+    """
+    Delays requests so that each endpoint class stays within its budget, as well as
+    the client as a whole. Requests over budget are queued, never rejected.
+    """
+
+    config: RateLimitConfig
+    stats: dict[EndpointClass, RateLimitStats] = field(
+        init=False,
+        default_factory=lambda: {ec: RateLimitStats() for ec in ENDPOINT_CLASSES},
+    )
+    _buckets: dict[EndpointClass, TokenBucket] = field(init=False, default_factory=dict)
+    _total: TokenBucket | None = field(init=False, default=None)
+
+    def __post_init__(self) -> None:
+        for endpoint in ENDPOINT_CLASSES:
+            if (rate := getattr(self.config, endpoint)) is not None:
+                self._buckets[endpoint] = self._create_bucket(rate)
+
+        if self.config.max_rps is not None:
+            self._total = self._create_bucket(self.config.max_rps)
+
+    def _create_bucket(self, rate: float) -> TokenBucket:
+        return TokenBucket(rate, max(self.config.burst or rate, 1))
+
+    async def acquire(self, endpoint: EndpointClass) -> None:
+        """Waits until a request to the given class of endpoints may be sent."""
+        now = send_at = time.monotonic()
+
+        if (bucket := self._buckets.get(endpoint)) is not None:
+            send_at = bucket.reserve(send_at)
+        if self._total is not None:
+            send_at = self._total.reserve(send_at)
+
+        wait = send_at - now
+        self.stats[endpoint].record(wait)
+
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def merge(self, stats: Mapping[EndpointClass, RateLimitStats]) -> None:
+        for endpoint, other in stats.items():
+            self.stats[endpoint].merge(other)
+
+    def report(self) -> str:
+        row = "  %-20s %10s %10s %10s %10s"
+        lines = [
+            "Rate limiting:",
+            row % ("endpoints", "requests", "delayed", "wait", "max wait"),
+        ]
+        lines.extend(
+            row
+            % (
+                endpoint,
+                stats.requests,
+                stats.delayed,
+                "%.3fs" % stats.wait_time,
+                "%.3fs" % stats.max_wait,
+            )
+            for endpoint, stats in self.stats.items()
+            if stats.requests
+        )
+        return "\n".join(lines)
@@ -0,0 +1,90 @@
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable, Mapping
+from dataclasses import dataclass, field
+from typing import Any, TypeVar
+
+__all__ = ("CoalescingStats", "Singleflight")
+
+T = TypeVar("T")
+
+
+@dataclass(slots=True)
+class CoalescingStats:
+    """
+    Attributes:
+        calls: The number of calls.
+        shared: The number of calls that joined an identical call already in flight
+            instead of sending their own request.
+    """
+
+    calls: int = 0
+    shared: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        return self.shared / self.calls if self.calls else 0.0
+
+    def merge(self, other: "CoalescingStats") -> None:
+        self.calls += other.calls
+        self.shared += other.shared
+
+
+@dataclass(slots=True)
+class Singleflight:
+    """
+    Coalesces identical calls that are in flight at the same time: the first one runs,
+    and the ones that come while it is running wait for its outcome instead of running
+    again. Meant for reads, whose outcome doesn't depend on which caller asked first.
+
+    The call runs in a task of its own, so that a waiter that gets cancelled doesn't
+    cancel it for the others.
+    """
+
+    stats: dict[str, CoalescingStats] = field(default_factory=dict)
+    _in_flight: dict[Hashable, asyncio.Task[Any]] = field(
+        init=False, default_factory=dict
+    )
+
+    async def do(self, name: str, key: Hashable, func: Callable[[], Awaitable[T]]) -> T:
+        """
+        Args:
+            name: The name of the operation the statistics are collected under.
+            key: Identifies the call among the calls of the operation.
+            func: Performs the call.
+        """
+        stats = self.stats.setdefault(name, CoalescingStats())
+        stats.calls += 1
+
+        if (task := self._in_flight.get(flight_key := (name, key))) is not None:
+            stats.shared += 1
+        else:
+            task = self._in_flight[flight_key] = asyncio.ensure_future(func())
+            task.add_done_callback(lambda t: self._forget(flight_key, t))
+
+        return await asyncio.shield(task)
+
+    def _forget(self, key: Hashable, task: asyncio.Task[Any]) -> None:
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+
+        # Every waiter may be gone by now, don't let asyncio complain about an
+        # exception that was never retrieved
+        if not task.cancelled():
+            task.exception()
+
+    def merge(self, stats: Mapping[str, CoalescingStats]) -> None:
+        for name, other in stats.items():
+            self.stats.setdefault(name, CoalescingStats()).merge(other)
+
+    def report(self) -> str:
+        row = "  %-26s %10s %10s %10s"
+        lines = [
+            "Request coalescing:",
+            row % ("operation", "calls", "shared", "hit rate"),
+        ]
+        lines.extend(
+            row % (name, stats.calls, stats.shared, "%.1f%%" % (stats.hit_rate * 100))
+            for name, stats in sorted(self.stats.items())
+            if stats.calls
+        )
+        return "\n".join(lines)
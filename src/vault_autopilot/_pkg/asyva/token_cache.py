@@ -0,0 +1,205 @@
+"""
+A file that keeps the tokens the client obtained, so that later runs reuse them instead
+of logging in again.
+
+The file holds bearer tokens, so it is only ever created with owner-only permissions,
+and it is ignored if anyone else may read or write it. The entries are keyed by a hash
+of the server, the namespace and the identity of the authenticator, which may be
+derived from credentials and is never stored as is.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import stat
+import tempfile
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+import pydantic
+
+__all__ = ("TokenCacheConfig", "AuthToken", "TokenCache")
+
+logger = logging.getLogger(__name__)
+
+
+def _default_path() -> str:
+    return str(
+        Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache")
+        / "vault-autopilot"
+        / "tokens.json"
+    )
+
+
+@dataclass(slots=True, kw_only=True)
+class TokenCacheConfig:
+    """
+    Attributes:
+        enabled: Whether to reuse the tokens obtained by earlier runs.
+        path: The file the tokens are kept in. Defaults to
+            ``$XDG_CACHE_HOME/vault-autopilot/tokens.json``.
+        min_ttl: The number of seconds a cached token must still be valid for to be
+            reused.
+        renew: Whether to renew renewable tokens in the background once two thirds of
+            their TTL have elapsed.
+    """
+
+    enabled: bool = False
+    path: str | None = None
+    min_ttl: float = 60.0
+    renew: bool = True
+
+    @property
+    def file(self) -> Path:
+        return Path(self.path or _default_path()).expanduser()
+
+
+@dataclass(slots=True, kw_only=True)
+class AuthToken:
+    """
+    A token obtained by an authenticator.
+
+    Attributes:
+        token: The token itself.
+        ttl: The number of seconds the token is valid for, as of ``issued_at``.
+            ``None`` means the token never expires.
+        renewable: Whether the TTL of the token can be extended.
+        issued_at: When the TTL started, as returned by :func:`time.time`.
+    """
+
+    token: pydantic.SecretStr
+    ttl: int | None = None
+    renewable: bool = False
+    issued_at: float = 0.0
+
+    def __post_init__(self) -> None:
+        if not self.issued_at:
+            self.issued_at = time.time()
+
+    @property
+    def expires_at(self) -> float | None:
+        return self.issued_at + self.ttl if self.ttl is not None else None
+
+    def remaining(self) -> float | None:
+        """Returns the number of seconds the token is still valid for."""
+        return self.expires_at - time.time() if self.expires_at is not None else None
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "token": self.token.get_secret_value(),
+            "ttl": self.ttl,
+            "renewable": self.renewable,
+            "issued_at": self.issued_at,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "AuthToken":
+        return cls(
+            token=pydantic.SecretStr(data["token"]),
+            ttl=data["ttl"],
+            renewable=data["renewable"],
+            issued_at=data["issued_at"],
+        )
+
+
+@dataclass(slots=True)
+class TokenCache:
+    config: TokenCacheConfig
+
+    @staticmethod
+    def key(base_url: str, namespace: str | None, identity: str) -> str:
+        return hashlib.sha256(
+            "\0".join((base_url.rstrip("/"), namespace or "", identity)).encode()
+        ).hexdigest()
+
+    def _read(self) -> dict[str, Any]:
+        file = self.config.file
+
+        try:
+            with file.open("rb") as fp:
+                st = os.fstat(fp.fileno())
+                shared = st.st_mode & (stat.S_IRWXG | stat.S_IRWXO)
+
+                if st.st_uid != os.getuid() or shared:
+                    logger.warning(
+                        "ignoring the token cache %s, it must be owned by the current "
+                        "user and not be accessible by anyone else (mode 0600)",
+                        file,
+                    )
+                    return {}
+
+                entries = json.load(fp)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as ex:
+            logger.warning("ignoring the unreadable token cache %s: %s", file, ex)
+            return {}
+
+        return entries if isinstance(entries, dict) else {}
+
+    def _write(self, entries: dict[str, Any]) -> None:
+        file = self.config.file
+        file.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+
+        # mkstemp creates the file with mode 0600, and the rename replaces the old file
+        # atomically so that concurrent runs never read a partial file
+        fd, tmp = tempfile.mkstemp(dir=file.parent, prefix=".tokens-")
+        try:
+            with os.fdopen(fd, "w") as fp:
+                json.dump(entries, fp)
+            os.replace(tmp, file)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+    def _update(self, key: str, token: AuthToken | None) -> None:
+        now = time.time()
+        entries = {
+            k: v
+            for k, v in self._read().items()
+            # drop the expired entries along the way
+            if v.get("ttl") is None or v["issued_at"] + v["ttl"] > now
+        }
+
+        if token is None:
+            entries.pop(key, None)
+        else:
+            entries[key] = token.to_dict()
+
+        self._write(entries)
+
+    def _load(self, key: str) -> AuthToken | None:
+        if (data := self._read().get(key)) is None:
+            return None
+
+        try:
+            token = AuthToken.from_dict(data)
+        except (KeyError, TypeError):
+            return None
+
+        if (remaining := token.remaining()) is not None and (
+            remaining < self.config.min_ttl
+        ):
+            return None
+
+        return token
+
+    async def load(self, key: str) -> AuthToken | None:
+        """Returns the cached token, unless it is about to expire."""
+        return await asyncio.to_thread(self._load, key)
+
+    async def store(self, key: str, token: AuthToken) -> None:
+        try:
+            await asyncio.to_thread(self._update, key, token)
+        except OSError as ex:
+            logger.warning("failed to update the token cache: %s", ex)
+
+    async def delete(self, key: str) -> None:
+        try:
+            await asyncio.to_thread(self._update, key, None)
+        except OSError as ex:
+            logger.warning("failed to update the token cache: %s", ex)
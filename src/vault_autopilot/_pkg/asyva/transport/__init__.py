@@ -0,0 +1,11 @@
+__all__ = (
+    "Response",
+    "AbstractSession",
+    "AbstractTransport",
+    "AiohttpTransport",
+    "TransportConfig",
+)
+
+from .base import AbstractSession, AbstractTransport, Response
+from .config import TransportConfig
+from .http1 import AiohttpTransport
@@ -0,0 +1,143 @@
+import abc
+from collections.abc import Iterable, Mapping, Sequence
+from types import TracebackType
+from typing import Any, Protocol
+
+import aiohttp
+import yarl
+
+__all__ = ("Response", "AbstractSession", "AbstractTransport", "split_unix_url")
+
+UNIX_SOCKET_HOST = "http://localhost"
+"""The URL the requests sent over a UNIX socket are addressed to. The server on the
+other end, e.g. a Vault Agent, doesn't look at the host."""
+
+
+def split_unix_url(base_url: str) -> tuple[str | None, str]:
+    """
+    Returns the path of the UNIX socket a ``unix:///path/to/agent.sock`` URL points to,
+    and the URL to address the requests sent over it to. Any other URL is returned as
+    is, along with ``None``.
+
+    Raises:
+        ValueError: If the URL has the ``unix`` scheme but no path.
+    """
+    url = yarl.URL(base_url)
+
+    if url.scheme != "unix":
+        return None, base_url
+
+    if url.host or not url.path or url.path == "/":
+        raise ValueError(
+            "Invalid UNIX socket URL %r, expected an absolute path like "
+            "'unix:///path/to/agent.sock'" % base_url
+        )
+
+    return url.path, UNIX_SOCKET_HOST
+
+
+class Response(Protocol):
+    """
+    The parts of an HTTP response the client relies on. The body is read before the
+    response is handed over, so reading it doesn't do any I/O.
+    """
+
+    @property
+    def status(self) -> int: ...
+
+    @property
+    def method(self) -> str: ...
+
+    @property
+    def url(self) -> yarl.URL: ...
+
+    @property
+    def headers(self) -> Mapping[str, str]: ...
+
+    async def read(self) -> bytes: ...
+
+    async def json(self) -> Any:
+        """Returns the decoded body, or ``None`` if the body is empty."""
+
+
+class AbstractSession(abc.ABC):
+    """
+    Sends requests to a single Vault server with a set of default headers.
+
+    The trace configs the session was created with are notified of every request
+    through their ``on_request_start``, ``on_request_end`` and ``on_request_exception``
+    signals, whatever the backend, so that the telemetry built upon
+    :class:`aiohttp.TraceConfig` keeps working.
+    """
+
+    @abc.abstractmethod
+    async def request(
+        self,
+        method: str,
+        url: str,
+        *,
+        headers: Mapping[str, str] | None = None,
+        json: Any = None,
+        data: str | bytes | None = None,
+        trace_request_ctx: Any = None,
+    ) -> Response:
+        """
+        Sends a request and reads the response.
+
+        Args:
+            method: The HTTP method.
+            url: The URL of the endpoint, relative to the base URL of the session.
+            headers: Headers to send on top of the default ones.
+            json: A value to send as a JSON body.
+            data: A body to send as is.
+            trace_request_ctx: Passed to the trace configs as is.
+
+        Raises:
+            aiohttp.ClientConnectorError: If the connection to the server can't be
+                established.
+            aiohttp.ClientConnectionError: If the connection fails afterwards.
+        """
+
+    @abc.abstractmethod
+    async def close(self) -> None:
+        """Closes the session. The connections are owned by the transport and are left
+        open."""
+
+    async def __aenter__(self) -> "AbstractSession":
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        await self.close()
+
+
+class AbstractTransport(abc.ABC):
+    """
+    Owns the connections to the server and creates the sessions that send requests
+    over them. Must be used from a single event loop.
+    """
+
+    @abc.abstractmethod
+    def create_session(
+        self,
+        base_url: str,
+        headers: Mapping[str, str],
+        skip_auto_headers: Iterable[str] = (),
+        trace_configs: Sequence[aiohttp.TraceConfig] = (),
+    ) -> AbstractSession:
+        """
+        Args:
+            base_url: The URL of the server, or of the UNIX socket it listens on (see
+                :func:`split_unix_url`).
+            headers: The headers sent with every request.
+            skip_auto_headers: Headers the backend mustn't add on its own.
+            trace_configs: The trace configs to notify of the requests.
+        """
+
+    @abc.abstractmethod
+    async def close(self) -> None:
+        """Closes the connections."""
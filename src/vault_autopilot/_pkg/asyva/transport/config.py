@@ -0,0 +1,74 @@
+import ssl
+from dataclasses import dataclass
+from typing import Literal
+
+from .base import AbstractTransport
+from .http1 import AiohttpTransport
+
+__all__ = ("TransportConfig",)
+
+
+@dataclass(slots=True, kw_only=True)
+class TransportConfig:
+    """
+    Connection pool settings shared by all the sessions of a client.
+
+    Attributes:
+        backend: The HTTP implementation. ``aiohttp`` (HTTP/1.1) holds a connection per
+            in-flight request, whereas ``http2`` multiplexes the requests over a few
+            connections (see :mod:`.http2`) and requires the ``http2`` extra.
+        pool_limit: The maximum number of simultaneous connections. ``0`` means no
+            limit.
+        pool_limit_per_host: The maximum number of simultaneous connections to the same
+            endpoint. ``0`` means no limit.
+        keepalive_timeout: The number of seconds an idle connection is kept open for
+            reuse.
+        dns_ttl: The number of seconds resolved addresses are cached for. ``None``
+            caches them forever.
+        ca_bundle: Path to a file with the CA certificates to verify the server with.
+            Defaults to the system trust store.
+        prewarm_connections: The number of connections to open right after the client
+            is authenticated, so that the first requests don't pay for the TCP and TLS
+            handshakes.
+    """
+
+    backend: Literal["aiohttp", "http2"] = "aiohttp"
+    pool_limit: int = 100
+    pool_limit_per_host: int = 0
+    keepalive_timeout: float = 15.0
+    dns_ttl: int | None = 10
+    ca_bundle: str | None = None
+    prewarm_connections: int = 0
+
+    def create_ssl_context(self) -> ssl.SSLContext | bool:
+        if self.ca_bundle is None:
+            # let the backend use its default context
+            return True
+
+        return ssl.create_default_context(cafile=self.ca_bundle)
+
+    def create_transport(self) -> AbstractTransport:
+        """
+        Creates the transport of the configured backend.
+
+        Raises:
+            ImportError: If the dependencies of the backend aren't installed.
+        """
+        match self.backend:
+            case "aiohttp":
+                return AiohttpTransport(self)
+            case "http2":
+                try:
+                    # httpx loads h2 lazily, make sure it is there too
+                    import h2  # noqa: F401
+
+                    from .http2 import HTTP2Transport
+                except ImportError as ex:
+                    raise ImportError(
+                        "The http2 transport requires httpx and h2, install "
+                        "vault-autopilot[http2] to use it"
+                    ) from ex
+
+                return HTTP2Transport(self)
+            case _:
+                raise NotImplementedError("Unknown transport %r" % self.backend)
@@ -0,0 +1,125 @@
+from collections.abc import Iterable, Mapping, Sequence
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, cast
+
+import aiohttp
+from typing_extensions import override
+
+from .. import codec
+from .base import AbstractSession, AbstractTransport, Response, split_unix_url
+
+if TYPE_CHECKING:
+    from .config import TransportConfig
+
+__all__ = ("AiohttpResponse", "AiohttpSession", "AiohttpTransport")
+
+
+class AiohttpResponse(aiohttp.ClientResponse):
+    @override
+    async def json(self, *_: Any, **__: Any) -> Any:
+        """Decodes the body with the client's codec, whatever the content type."""
+        if self._body is None:
+            await self.read()
+
+        if not (body := (self._body or b"").strip()):
+            return None
+
+        return codec.loads(body)
+
+
+@dataclass(slots=True)
+class AiohttpSession(AbstractSession):
+    sess: aiohttp.ClientSession
+
+    @override
+    async def request(
+        self,
+        method: str,
+        url: str,
+        *,
+        headers: Mapping[str, str] | None = None,
+        json: Any = None,
+        data: str | bytes | None = None,
+        trace_request_ctx: Any = None,
+    ) -> Response:
+        resp = await self.sess.request(
+            method,
+            url,
+            headers=headers,
+            data=codec.dumps(json) if json is not None else data,
+            trace_request_ctx=trace_request_ctx,
+        )
+
+        # Release the connection back to the pool right away, the body is kept by the
+        # response
+        try:
+            await resp.read()
+        finally:
+            resp.release()
+
+        # The response does satisfy the protocol, but aiohttp caches its url and headers
+        # with its own descriptor, which type checkers don't take for a property
+        return cast(Response, resp)
+
+    @override
+    async def close(self) -> None:
+        await self.sess.close()
+
+
+@dataclass(slots=True)
+class AiohttpTransport(AbstractTransport):
+    """
+    HTTP/1.1 transport backed by aiohttp. Each connection carries one request at a
+    time, so the pool grows with the number of concurrent requests, up to
+    :attr:`TransportConfig.pool_limit`.
+
+    The connections are made over a UNIX socket instead of TCP if the base URL points
+    to one, e.g. that of a local Vault Agent or Proxy.
+    """
+
+    config: "TransportConfig"
+    _connector: aiohttp.BaseConnector | None = field(init=False, default=None)
+
+    @override
+    def create_session(
+        self,
+        base_url: str,
+        headers: Mapping[str, str],
+        skip_auto_headers: Iterable[str] = (),
+        trace_configs: Sequence[aiohttp.TraceConfig] = (),
+    ) -> AiohttpSession:
+        socket_path, base_url = split_unix_url(base_url)
+
+        if self._connector is None and socket_path is not None:
+            self._connector = aiohttp.UnixConnector(
+                socket_path,
+                limit=self.config.pool_limit,
+                limit_per_host=self.config.pool_limit_per_host,
+                keepalive_timeout=self.config.keepalive_timeout,
+            )
+        elif self._connector is None:
+            self._connector = aiohttp.TCPConnector(
+                limit=self.config.pool_limit,
+                limit_per_host=self.config.pool_limit_per_host,
+                keepalive_timeout=self.config.keepalive_timeout,
+                ttl_dns_cache=self.config.dns_ttl,
+                use_dns_cache=self.config.dns_ttl != 0,
+                ssl=self.config.create_ssl_context(),
+            )
+
+        return AiohttpSession(
+            aiohttp.ClientSession(
+                base_url=base_url,
+                headers=headers,
+                skip_auto_headers=skip_auto_headers,
+                connector=self._connector,
+                connector_owner=False,
+                trace_configs=list(trace_configs),
+                response_class=AiohttpResponse,
+            )
+        )
+
+    @override
+    async def close(self) -> None:
+        if self._connector is not None:
+            await self._connector.close()
@@ -0,0 +1,223 @@
+"""
+HTTP/2 transport backed by httpx, which requires the ``http2`` extra.
+
+Instead of holding a connection per in-flight request, requests are multiplexed as
+concurrent streams over a few connections: a new connection is only opened once the
+existing ones carry as many streams as the server allows (250 for Vault).
+
+Over TLS, the protocol is negotiated with ALPN, falling back to HTTP/1.1 if the server
+doesn't support HTTP/2. A plain ``http://`` server is assumed to speak HTTP/2 without
+negotiation (h2c with prior knowledge), since there is nothing to negotiate with.
+"""
+
+from collections.abc import Awaitable, Callable, Iterable, Mapping, Sequence
+from dataclasses import dataclass, field
+from types import SimpleNamespace
+from typing import TYPE_CHECKING, Any
+
+import aiohttp
+import httpx
+import yarl
+from aiohttp.client_reqrep import ConnectionKey
+from multidict import CIMultiDict
+from typing_extensions import override
+
+from .. import codec
+from .base import AbstractSession, AbstractTransport, split_unix_url
+
+if TYPE_CHECKING:
+    from .config import TransportConfig
+
+__all__ = ("HTTP2Response", "HTTP2Session", "HTTP2Transport")
+
+
+@dataclass(slots=True)
+class HTTP2Response:
+    method: str
+    url: yarl.URL
+    _resp: httpx.Response
+
+    @property
+    def status(self) -> int:
+        return self._resp.status_code
+
+    @property
+    def headers(self) -> Mapping[str, str]:
+        return self._resp.headers
+
+    async def read(self) -> bytes:
+        return self._resp.content
+
+    async def json(self) -> Any:
+        if not (content := self._resp.content.strip()):
+            return None
+
+        return codec.loads(content)
+
+
+def translate_exception(ex: httpx.TransportError, url: yarl.URL) -> Exception:
+    """Maps an httpx error to the aiohttp error the rest of the client expects."""
+    if isinstance(ex, httpx.ConnectError):
+        return aiohttp.ClientConnectorError(
+            ConnectionKey(
+                url.host or "", url.port, url.scheme == "https", True, None, None, None
+            ),
+            OSError(None, str(ex) or type(ex).__name__),
+        )
+
+    if isinstance(ex, httpx.TimeoutException):
+        return aiohttp.ServerTimeoutError(str(ex))
+
+    return aiohttp.ClientConnectionError(str(ex) or type(ex).__name__)
+
+
+async def send_trace_signal(
+    signal: Iterable[Callable[..., Awaitable[object]]],
+    session: AbstractSession,
+    ctx: SimpleNamespace,
+    params: object,
+) -> None:
+    """
+    Notifies the receivers of a trace config signal of a request, like
+    :meth:`aiosignal.Signal.send` does for the requests aiohttp sends itself.
+
+    The receivers are called with the session of whatever backend sent the request,
+    although aiohttp annotates them as taking a :class:`aiohttp.ClientSession`, and
+    the annotation of the signals themselves depends on the version of aiosignal.
+    """
+    for receiver in signal:
+        await receiver(session, ctx, params)
+
+
+@dataclass(slots=True)
+class HTTP2Session(AbstractSession):
+    client: httpx.AsyncClient
+    base_url: yarl.URL
+    headers: Mapping[str, str]
+    skip_auto_headers: frozenset[str] = frozenset()
+    trace_configs: Sequence[aiohttp.TraceConfig] = ()
+
+    @override
+    async def request(
+        self,
+        method: str,
+        url: str,
+        *,
+        headers: Mapping[str, str] | None = None,
+        json: Any = None,
+        data: str | bytes | None = None,
+        trace_request_ctx: Any = None,
+    ) -> HTTP2Response:
+        url_ = self.base_url.join(yarl.URL(url))
+        headers = {**self.headers, **(headers or {})}
+        traces = [
+            (tc, tc.trace_config_ctx(trace_request_ctx=trace_request_ctx))
+            for tc in self.trace_configs
+        ]
+
+        req = self.client.build_request(
+            method,
+            str(url_),
+            headers=headers,
+            content=codec.dumps(json) if json is not None else data,
+        )
+        explicit = {name.lower() for name in headers}
+        for name in self.skip_auto_headers - explicit:
+            req.headers.pop(name, None)
+
+        for tc, ctx in traces:
+            await send_trace_signal(
+                tc.on_request_start,
+                self,
+                ctx,
+                aiohttp.TraceRequestStartParams(method, url_, CIMultiDict(req.headers)),
+            )
+
+        try:
+            resp = HTTP2Response(method, url_, await self.client.send(req))
+        except httpx.TransportError as ex:
+            error = translate_exception(ex, url_)
+
+            for tc, ctx in traces:
+                await send_trace_signal(
+                    tc.on_request_exception,
+                    self,
+                    ctx,
+                    aiohttp.TraceRequestExceptionParams(
+                        method, url_, CIMultiDict(req.headers), error
+                    ),
+                )
+
+            raise error from ex
+
+        for tc, ctx in traces:
+            await send_trace_signal(
+                tc.on_request_end,
+                self,
+                ctx,
+                aiohttp.TraceRequestEndParams(
+                    method,
+                    url_,
+                    CIMultiDict(req.headers),
+                    resp,  # type: ignore[arg-type]
+                ),
+            )
+
+        return resp
+
+    @override
+    async def close(self) -> None:
+        pass
+
+
+@dataclass(slots=True)
+class HTTP2Transport(AbstractTransport):
+    config: "TransportConfig"
+    _client: httpx.AsyncClient | None = field(init=False, default=None)
+
+    @override
+    def create_session(
+        self,
+        base_url: str,
+        headers: Mapping[str, str],
+        skip_auto_headers: Iterable[str] = (),
+        trace_configs: Sequence[aiohttp.TraceConfig] = (),
+    ) -> HTTP2Session:
+        if split_unix_url(base_url)[0] is not None:
+            raise ValueError(
+                "UNIX sockets are only supported by the aiohttp transport backend, "
+                "local agents don't speak HTTP/2"
+            )
+
+        url = yarl.URL(base_url)
+
+        if self._client is None:
+            limit = self.config.pool_limit_per_host or self.config.pool_limit or None
+            self._client = httpx.AsyncClient(
+                http1=url.scheme == "https",
+                http2=True,
+                verify=self.config.create_ssl_context(),
+                limits=httpx.Limits(
+                    max_connections=limit,
+                    max_keepalive_connections=limit,
+                    keepalive_expiry=self.config.keepalive_timeout,
+                ),
+                # The timeouts are enforced by the request executor
+                timeout=None,
+            )
+
+        for trace_config in trace_configs:
+            trace_config.freeze()
+
+        return HTTP2Session(
+            self._client,
+            url,
+            headers,
+            frozenset(name.lower() for name in skip_auto_headers),
+            tuple(trace_configs),
+        )
+
+    @override
+    async def close(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
@@ -56,11 +56,13 @@ class PasswordApplicationInitiated:
 @dataclass(slots=True)
 class PasswordCreateError:
     resource: dto.PasswordApplyDTO
+    error: Exception | None = None
 
 
 @dataclass(slots=True)
 class PasswordUpdateError:
     resource: dto.PasswordApplyDTO
+    error: Exception | None = None
 
 
 @dataclass(slots=True)
@@ -81,6 +83,7 @@ class PasswordVerifySuccess:
 @dataclass(slots=True)
 class PasswordVerifyError:
     resource: dto.PasswordApplyDTO
+    error: Exception | None = None
 
 
 @dataclass(slots=True)
@@ -96,11 +99,13 @@ class IssuerApplicationInitiated:
 @dataclass(slots=True)
 class IssuerCreateError:
     resource: dto.IssuerApplyDTO
+    error: Exception | None = None
 
 
 @dataclass(slots=True)
 class IssuerUpdateError:
     resource: dto.IssuerApplyDTO
+    error: Exception | None = None
 
 
 @dataclass(slots=True)
@@ -121,6 +126,7 @@ class IssuerVerifySuccess:
 @dataclass(slots=True)
 class IssuerVerifyError:
     resource: dto.IssuerApplyDTO
+    error: Exception | None = None
 
 
 @dataclass(slots=True)
@@ -136,16 +142,19 @@ class PasswordPolicyApplicationInitiated:
 @dataclass(slots=True)
 class PasswordPolicyCreateError:
     resource: dto.PasswordPolicyApplyDTO
+    error: Exception | None = None
 
 
 @dataclass(slots=True)
 class PasswordPolicyUpdateError:
     resource: dto.PasswordPolicyApplyDTO
+    error: Exception | None = None
 
 
 @dataclass(slots=True)
 class PasswordPolicyVerifyError:
     resource: dto.PasswordPolicyApplyDTO
+    error: Exception | None = None
 
 
 @dataclass(slots=True)
@@ -176,16 +185,19 @@ class PKIRoleApplicationInitiated:
 @dataclass(slots=True)
 class PKIRoleCreateError:
     resource: dto.PKIRoleApplyDTO
+    error: Exception | None = None
 
 
 @dataclass(slots=True)
 class PKIRoleUpdateError:
     resource: dto.PKIRoleApplyDTO
+    error: Exception | None = None
 
 
 @dataclass(slots=True)
 class PKIRoleVerifyError:
     resource: dto.PKIRoleApplyDTO
+    error: Exception | None = None
 
 
 @dataclass(slots=True)
@@ -216,16 +228,19 @@ class SecretsEngineApplicationInitiated:
 @dataclass(slots=True)
 class SecretsEngineCreateError:
     resource: dto.SecretsEngineApplyDTO
+    error: Exception | None = None
 
 
 @dataclass(slots=True)
 class SecretsEngineUpdateError:
     resource: dto.SecretsEngineApplyDTO
+    error: Exception | None = None
 
 
 @dataclass(slots=True)
 class SecretsEngineVerifyError:
     resource: dto.SecretsEngineApplyDTO
+    error: Exception | None = None
 
 
 @dataclass(slots=True)
@@ -256,16 +271,19 @@ class SSHKeyApplicationInitiated:
 @dataclass(slots=True)
 class SSHKeyCreateError:
     resource: dto.SSHKeyApplyDTO
+    error: Exception | None = None
 
 
 @dataclass(slots=True)
 class SSHKeyUpdateError:
     resource: dto.SSHKeyApplyDTO
+    error: Exception | None = None
 
 
 @dataclass(slots=True)
 class SSHKeyVerifyError:
     resource: dto.SSHKeyApplyDTO
+    error: Exception | None = None
 
 
 @dataclass(slots=True)
@@ -32,6 +32,12 @@ class ApplicationError(Exception):
     def __str__(self) -> str:
         return self.format_message()
 
+    @override
+    def __reduce__(self) -> tuple[Any, ...]:
+        # The fields aren't passed to Exception.__init__, so the default reduction would
+        # lose them, e.g. when the error is raised in a worker process
+        return type(self), (self.message, self.ctx)
+
 
 class Location(TypedDict):
     filename: pathlib.Path
@@ -40,6 +46,18 @@ class Location(TypedDict):
     offset: NotRequired[int]
 
 
+def format_location(loc: Location) -> str:
+    """Returns e.g. ``'manifest.yaml' (line 3, column 5)``."""
+    if "line" not in loc:
+        return repr(str(loc["filename"]))
+
+    return "%r (line %d, column %d)" % (
+        str(loc["filename"]),
+        loc["line"],
+        loc.get("col", 1),
+    )
+
+
 @dataclass(slots=True)
 class ManifestError(ApplicationError): ...
 
@@ -57,8 +75,8 @@ class ManifestSyntaxError(ManifestError):
 
     @override
     def format_message(self) -> str:
-        return "Decoding failed for manifest file %r.\n\n%s" % (
-            str(self.ctx["loc"]["filename"]),
+        return "Decoding failed for manifest file %s.\n\n%s" % (
+            format_location(self.ctx["loc"]),
             self.message,
         )
 
@@ -76,8 +94,8 @@ class ManifestValidationError(ManifestError):
 
     @override
     def format_message(self) -> str:
-        return "Validation failed for manifest file %r.\n\n%s" % (
-            str(self.ctx["loc"]["filename"]),
+        return "Validation failed for manifest file %s.\n\n%s" % (
+            format_location(self.ctx["loc"]),
             self.message,
         )
 
@@ -0,0 +1,119 @@
+import heapq
+from collections.abc import Callable, Sequence
+from typing import TypeVar
+
+from networkx import DiGraph, weakly_connected_components
+
+from . import dto
+
+__all__ = ("resource_key", "upstream_keys", "build_graph", "partition")
+
+T = TypeVar("T")
+
+
+def resource_key(kind: str, absolute_path: str) -> str:
+    """Returns a string that uniquely identifies a resource within the manifests."""
+    return "/".join((kind, absolute_path))
+
+
+def upstream_keys(payload: dto.AbstractDTO) -> tuple[str, ...]:
+    """
+    Returns the keys of the resources the given resource depends on.
+
+    The result mirrors the dependencies the processors wait for, with one exception:
+    intermediate issuers also depend on the secrets engine they are mounted at. The
+    extra edge never hurts, since the engine must exist before the issuer can be
+    created anyway.
+    """
+    match payload:
+        case dto.PasswordApplyDTO():
+            return (
+                resource_key("SecretsEngine", payload.spec["secrets_engine_ref"]),
+                resource_key("PasswordPolicy", payload.spec["policy_ref"]),
+            )
+        case dto.SSHKeyApplyDTO():
+            return (resource_key("SecretsEngine", payload.spec["secrets_engine_ref"]),)
+        case dto.IssuerApplyDTO():
+            keys: tuple[str, ...] = (
+                resource_key("SecretsEngine", payload.spec["secrets_engine_ref"]),
+            )
+
+            if payload.spec.get("chaining"):
+                keys += (
+                    resource_key("Issuer", payload.upstream_issuer_absolute_path()),
+                )
+
+            return keys
+        case dto.PKIRoleApplyDTO():
+            return (resource_key("Issuer", payload.spec["role"]["issuer_ref"]),)
+        case _:
+            return ()
+
+
+def build_graph(payloads: Sequence[dto.AbstractDTO]) -> "DiGraph[str]":
+    """
+    Builds a directed graph in which an edge ``u -> v`` means that ``v`` depends on
+    ``u``. The ``index`` attribute of a node points to the position of the resource in
+    ``payloads``; nodes without it are referenced but not defined in the manifests.
+    """
+    graph: "DiGraph[str]" = DiGraph()
+
+    for index, payload in enumerate(payloads):
+        key = resource_key(payload.kind, payload.absolute_path())
+        graph.add_node(key, index=index)
+
+        for upstream in upstream_keys(payload):
+            graph.add_edge(upstream, key)  # pyright: ignore[reportUnknownMemberType]
+
+    return graph
+
+
+def partition(
+    payloads: Sequence[T],
+    bins: int,
+    key: Callable[[T], dto.AbstractDTO],
+) -> list[list[T]]:
+    """
+    Splits the payloads into at most ``bins`` groups that can be applied independently.
+
+    The dependency graph is split into weakly connected components, so a resource and
+    all of its (transitive) upstreams and downstreams always end up in the same group.
+    The components are then bin-packed, largest first, into the group that currently
+    holds the fewest resources. Each group preserves the original order of payloads.
+
+    Args:
+        payloads: The payloads to split.
+        bins: The maximum number of groups to return.
+        key: A function that extracts the resource from a payload.
+
+    Returns:
+        A list of non-empty groups.
+    """
+    assert bins > 0, "Expected a positive number of bins, got %r" % bins
+
+    graph = build_graph([key(payload) for payload in payloads])
+    nodes: dict[str, int | None] = {
+        node: data.get("index") for node, data in graph.nodes(data=True)
+    }
+
+    components = sorted(
+        (
+            sorted(index for node in comp if (index := nodes[node]) is not None)
+            for comp in weakly_connected_components(graph)
+        ),
+        key=len,
+        reverse=True,
+    )
+
+    groups: list[list[int]] = [[] for _ in range(bins)]
+    heap = [(0, bin_index) for bin_index in range(bins)]
+
+    for comp in components:
+        if not comp:
+            continue
+
+        size, bin_index = heapq.heappop(heap)
+        groups[bin_index].extend(comp)
+        heapq.heappush(heap, (size + len(comp), bin_index))
+
+    return [[payloads[index] for index in sorted(group)] for group in groups if group]
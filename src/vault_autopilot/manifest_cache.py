@@ -0,0 +1,190 @@
+"""
+A local cache of validated manifests, so that the files that didn't change since the
+previous run skip YAML loading and model validation.
+
+Each entry holds the objects built from a file, pickled, and is keyed by a hash of the
+content of the file, the version of the tool and a fingerprint of the schema the
+objects were validated against. An entry therefore never goes stale, it just stops
+being used, and the least recently used entries are evicted once the cache grows past
+its size limit.
+
+Since unpickling an entry may run arbitrary code, the cache is only used if its
+directory is owned by the current user and isn't writable by anyone else.
+"""
+
+import functools
+import hashlib
+import json
+import logging
+import os
+import pickle
+import platform
+import stat
+import tempfile
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+import pydantic
+from pydantic import BaseModel
+
+from . import __version__
+
+__all__ = ("ManifestCacheConfig", "ManifestCache")
+
+logger = logging.getLogger(__name__)
+
+
+def _default_path() -> str:
+    return str(
+        Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache")
+        / "vault-autopilot"
+        / "manifests"
+    )
+
+
+@dataclass(slots=True, kw_only=True)
+class ManifestCacheConfig:
+    """
+    Attributes:
+        enabled: Whether to reuse the manifests validated by earlier runs.
+        path: The directory the manifests are kept in. Defaults to
+            ``$XDG_CACHE_HOME/vault-autopilot/manifests``.
+        max_size: The number of bytes the cache may take up on disk, the least
+            recently used entries are evicted first.
+    """
+
+    enabled: bool = False
+    path: str | None = None
+    max_size: int = 256 * 1024 * 1024
+
+    def __post_init__(self) -> None:
+        if self.max_size < 0:
+            raise ValueError("max_size must not be negative, got %r" % self.max_size)
+
+    @property
+    def directory(self) -> Path:
+        return Path(self.path or _default_path()).expanduser()
+
+
+@functools.cache
+def schema_fingerprint(object_builder: type[BaseModel]) -> bytes:
+    """Returns a digest of everything the validated objects depend on besides the
+    content of the file."""
+    return hashlib.sha256(
+        json.dumps(
+            (
+                __version__,
+                pydantic.VERSION,
+                platform.python_version(),
+                object_builder.model_json_schema(),
+            ),
+            sort_keys=True,
+        ).encode()
+    ).digest()
+
+
+@dataclass(slots=True)
+class ManifestCache:
+    config: ManifestCacheConfig = field(default_factory=ManifestCacheConfig)
+
+    def key(self, data: bytes, object_builder: type[BaseModel]) -> str:
+        return hashlib.sha256(schema_fingerprint(object_builder) + data).hexdigest()
+
+    def _entry(self, key: str) -> Path:
+        return self.config.directory / key[:2] / key
+
+    def is_usable(self) -> bool:
+        """Creates the directory if needed, and checks that no one else can write
+        entries in it."""
+        directory = self.config.directory
+
+        try:
+            directory.mkdir(mode=0o700, parents=True, exist_ok=True)
+            st = directory.stat()
+        except OSError as ex:
+            logger.warning("the manifest cache %s is unusable: %s", directory, ex)
+            return False
+
+        if st.st_uid != os.getuid() or st.st_mode & (stat.S_IWGRP | stat.S_IWOTH):
+            logger.warning(
+                "ignoring the manifest cache %s, it must be owned by the current user "
+                "and not be writable by anyone else",
+                directory,
+            )
+            return False
+
+        return True
+
+    def load(self, key: str) -> list[Any] | None:
+        """Returns the objects cached under the key, if any."""
+        entry = self._entry(key)
+
+        try:
+            with entry.open("rb") as fp:
+                objs = pickle.load(fp)
+        except FileNotFoundError:
+            return None
+        except Exception as ex:
+            logger.debug("dropping the unreadable manifest cache entry %s: %s", key, ex)
+            entry.unlink(missing_ok=True)
+            return None
+
+        # Keep track of the last use for the eviction
+        try:
+            os.utime(entry)
+        except OSError:
+            pass
+
+        return objs if isinstance(objs, list) else None
+
+    def store(self, key: str, objs: list[Any]) -> None:
+        entry = self._entry(key)
+
+        try:
+            entry.parent.mkdir(mode=0o700, exist_ok=True)
+
+            # The rename replaces the entry atomically, so that concurrent runs never
+            # read a partial entry
+            fd, tmp = tempfile.mkstemp(dir=entry.parent, prefix=".tmp-")
+            try:
+                with os.fdopen(fd, "wb") as fp:
+                    pickle.dump(objs, fp, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(tmp, entry)
+            except BaseException:
+                os.unlink(tmp)
+                raise
+        except OSError as ex:
+            logger.warning("failed to update the manifest cache: %s", ex)
+
+    def evict(self) -> int:
+        """Removes the least recently used entries until the cache fits in
+        :attr:`ManifestCacheConfig.max_size`. Returns the number of removed entries."""
+        entries: list[tuple[float, int, Path]] = []
+
+        for bucket in os.scandir(self.config.directory):
+            if not bucket.is_dir(follow_symlinks=False):
+                continue
+
+            for entry in os.scandir(bucket.path):
+                try:
+                    st = entry.stat(follow_symlinks=False)
+                except OSError:
+                    continue
+
+                entries.append((st.st_mtime, st.st_size, Path(entry.path)))
+
+        size, removed = sum(size for _, size, _ in entries), 0
+
+        for _, entry_size, path in sorted(entries):
+            if size <= self.config.max_size:
+                break
+
+            path.unlink(missing_ok=True)
+            size -= entry_size
+            removed += 1
+
+        if removed:
+            logger.debug("evicted %d manifest cache entries", removed)
+
+        return removed
@@ -1,25 +1,62 @@
 import asyncio
+import collections
+import contextlib
+import functools
+import io
+import itertools
+import json
 import logging
+import multiprocessing
 import pathlib
-from collections.abc import Generator, Iterator
-from dataclasses import dataclass
-from typing import IO, Any, Generic, TypeVar
+import re
+import time
+import typing
+from collections.abc import AsyncGenerator, Callable, Iterator, Mapping, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import IO, Any, Generic, Literal, TypeVar
 
 import ruamel.yaml as yaml
-from pydantic import ConfigDict, RootModel, ValidationError
+from pydantic import BaseModel, ConfigDict, RootModel, ValidationError
 from pydantic.alias_generators import to_camel
-from ruamel.yaml.error import YAMLError
+from ruamel.yaml.error import MarkedYAMLError, YAMLError
 
-from vault_autopilot.exc import ManifestSyntaxError, ManifestValidationError
+from vault_autopilot.exc import (
+    Location,
+    ManifestError,
+    ManifestSyntaxError,
+    ManifestValidationError,
+)
 
 from . import util
+from .dto.abstract import AbstractDTO
+from .manifest_cache import ManifestCache
+from .telemetry import tracing
 
-__all__ = ("ManifestParser",)
+__all__ = ("ManifestParser", "ManifestFormat")
 
 T = TypeVar("T", bound="AbstractManifestObject")  # type: ignore
 
 logger = logging.getLogger(__name__)
-loader = yaml.YAML(typ="rt")
+
+# The safe loader is backed by libyaml when ruamel.yaml.clib is installed, and builds
+# plain dicts and lists. The round-trip loader is several times slower and keeps the
+# comments and the position of every node, so it is only used to describe errors.
+loader = yaml.YAML(typ="safe")
+rt_loader = yaml.YAML(typ="rt")
+
+ManifestFormat = Literal["yaml", "json", "ndjson"]
+"""The format of a manifest file: YAML (several documents separated by ``---``), a
+single JSON document, or newline-delimited JSON (a document per line)."""
+
+FORMAT_SUFFIXES: dict[str, ManifestFormat] = {".json": "json", ".ndjson": "ndjson"}
+"""The formats detected from the file name suffixes, YAML otherwise."""
+
+KIND_RE = re.compile(rb"^kind:[ \t]*[\"']?(\w+)|\"kind\"\s*:\s*\"(\w+)\"", re.MULTILINE)
+
+ParsedDocument = tuple[T, float, float]
+"""A parsed object, along with the times the parsing of its document started and
+finished at, as returned by :func:`time.perf_counter`."""
 
 
 class AbstractManifestObject(RootModel[T]):
@@ -28,6 +65,286 @@ class AbstractManifestObject(RootModel[T]):
     root: Any
 
 
+@functools.cache
+def kind_validators(object_builder: type[BaseModel]) -> dict[str, type[BaseModel]]:
+    """
+    Maps each kind the object builder accepts to the model of that kind, so that a
+    document can be validated against its own model rather than the whole union.
+
+    Returns an empty mapping if the root of the object builder isn't a union of models
+    with a literal ``kind`` field.
+    """
+    validators: dict[str, type[BaseModel]] = {}
+
+    for model in typing.get_args(object_builder.model_fields["root"].annotation):
+        if not (isinstance(model, type) and issubclass(model, BaseModel)):
+            continue
+
+        if (field := model.model_fields.get("kind")) is None:
+            continue
+
+        for kind in typing.get_args(field.annotation):
+            validators[kind] = model
+
+    return validators
+
+
+def validate(object_builder: type[T], payload: Any) -> T:
+    """Validates a document, peeking at its ``kind`` to pick the model to validate it
+    against. Falls back on the object builder, which reports unknown kinds."""
+    if isinstance(payload, Mapping) and isinstance(kind := payload.get("kind"), str):
+        # The object builders are hashable classes, whatever the type checkers infer
+        # from the type variable
+        validators = kind_validators(typing.cast(type[BaseModel], object_builder))
+
+        if (model := validators.get(kind)) is not None:
+            # The model is one of the members of the root union of the object builder
+            root = typing.cast(Any, model.model_validate(payload))
+            return object_builder.model_construct(root)
+
+    return object_builder.model_validate(payload)
+
+
+def open_bytes(data: bytes, fn: str) -> IO[bytes]:
+    buf = io.BytesIO(data)
+    # The name shows up in the syntax errors
+    buf.name = fn  # type: ignore[attr-defined]
+    return buf
+
+
+def syntax_error(data: bytes, fn: str, ex: YAMLError) -> ManifestSyntaxError:
+    """
+    Describes the syntax error the safe loader ran into, as the round-trip loader
+    does, since libyaml leaves out the offending characters from its messages.
+    """
+    try:
+        for _ in rt_loader.load_all(open_bytes(data, fn)):
+            pass
+    except YAMLError as rt_ex:
+        ex = rt_ex
+
+    loc = Location(filename=pathlib.Path(fn))
+
+    if isinstance(ex, MarkedYAMLError) and (mark := ex.problem_mark):
+        loc.update(line=mark.line + 1, col=mark.column + 1)
+
+    return ManifestSyntaxError(str(ex), ManifestSyntaxError.Context(loc=loc))
+
+
+def rt_document(data: bytes, fn: str, index: int) -> Any:
+    """Returns the document at the given index as loaded by the round-trip loader."""
+    for i, doc in enumerate(rt_loader.load_all(open_bytes(data, fn))):
+        if i == index:
+            return doc
+
+    return None
+
+
+def locate(doc: Any, path: Sequence[int | str]) -> tuple[int, int] | None:
+    """
+    Returns the 0-based line and column of the deepest node along ``path`` in a
+    document loaded by the round-trip loader, or of the document itself if none of the
+    nodes is found.
+    """
+    if (lc := getattr(doc, "lc", None)) is None:
+        return None
+
+    pos, node = (lc.line, lc.col), doc
+
+    for key in path:
+        if (lc := getattr(node, "lc", None)) is None:
+            break
+
+        try:
+            pos = lc.key(key) if isinstance(node, Mapping) else lc.item(key)
+            node = node[key]
+        except (KeyError, IndexError, TypeError):
+            break
+
+    return pos
+
+
+def scan_kinds(data: bytes) -> set[str]:
+    """
+    Returns the kinds of the documents of a manifest file, without parsing it, by
+    looking for the ``kind:`` keys at the start of a line (YAML) or the ``"kind":``
+    keys (JSON). Good enough to tell which files to parse first, but may be fooled by
+    e.g. a flow style mapping or a string that happens to contain such a key.
+    """
+    return {
+        (yaml_kind or json_kind).decode()
+        for yaml_kind, json_kind in KIND_RE.findall(data)
+    }
+
+
+def detect_format(fn: str) -> ManifestFormat:
+    return FORMAT_SUFFIXES.get(pathlib.PurePath(fn).suffix.lower(), "yaml")
+
+
+def validation_error(
+    ex: ValidationError, fn: str, rt_doc: Any, line_offset: int = 0
+) -> ManifestValidationError:
+    """Describes a validation error, located in the document loaded by the round-trip
+    loader, since the other loaders don't keep track of the positions."""
+    errors = util.model.convert_errors(ex)
+    loc = Location(filename=pathlib.Path(fn))
+
+    if pos := locate(rt_doc, errors[0]["loc"] if errors else ()):
+        loc.update(line=line_offset + pos[0] + 1, col=pos[1] + 1)
+
+    return ManifestValidationError(
+        str(errors), ManifestValidationError.Context(loc=loc)
+    )
+
+
+def json_error(
+    ex: ValidationError, doc: bytes, fn: str, line_offset: int, object_builder: type[T]
+) -> ManifestError:
+    """
+    Describes the error a JSON document failed validation with, the same way as for a
+    YAML document: the errors of the JSON validator are worded and located a bit
+    differently, so the document is loaded and validated again.
+    """
+    loc = Location(filename=pathlib.Path(fn))
+
+    try:
+        payload = json.loads(doc)
+    except json.JSONDecodeError as decode_ex:
+        loc.update(line=line_offset + decode_ex.lineno, col=decode_ex.colno)
+        return ManifestSyntaxError(decode_ex.msg, ManifestSyntaxError.Context(loc=loc))
+    except UnicodeDecodeError as decode_ex:
+        return ManifestSyntaxError(str(decode_ex), ManifestSyntaxError.Context(loc=loc))
+
+    try:
+        validate(object_builder, payload)
+    except ValidationError as validation_ex:
+        ex = validation_ex
+
+    # JSON is valid YAML, so the round-trip loader can locate the error
+    return validation_error(ex, fn, rt_document(doc, fn, 0), line_offset)
+
+
+def load_yaml(
+    data: bytes, fn: str, object_builder: type[T]
+) -> Iterator[ParsedDocument[T]]:
+    iter_ = iter(loader.load_all(open_bytes(data, fn)))
+
+    for index in itertools.count():
+        started_at = time.perf_counter()
+
+        try:
+            payload = next(iter_)
+        except YAMLError as ex:
+            raise syntax_error(data, fn, ex) from ex
+        except StopIteration:
+            return
+
+        try:
+            obj = validate(object_builder, payload)
+        except ValidationError as ex:
+            raise validation_error(ex, fn, rt_document(data, fn, index))
+
+        yield obj, started_at, time.perf_counter()
+
+
+def load_json(
+    docs: Iterator[tuple[int, bytes]], fn: str, object_builder: type[T]
+) -> Iterator[ParsedDocument[T]]:
+    """Validates each JSON document, along with the line it starts at, straight from
+    bytes, without building the intermediate dicts and lists."""
+    for line_offset, doc in docs:
+        started_at = time.perf_counter()
+
+        try:
+            obj = object_builder.model_validate_json(doc)
+        except ValidationError as ex:
+            raise json_error(ex, doc, fn, line_offset, object_builder) from None
+
+        yield obj, started_at, time.perf_counter()
+
+
+def load_file(
+    data: bytes,
+    fn: str,
+    object_builder: type[T],
+    format: ManifestFormat | None = None,
+) -> Iterator[ParsedDocument[T]]:
+    """
+    Yields the objects built from the documents of a manifest file, in order.
+
+    Args:
+        format: The format of the file, detected from its name if not given.
+
+    Raises:
+        ManifestSyntaxError: If a document isn't valid YAML or JSON.
+        ManifestValidationError: If a document fails model validation.
+    """
+    match format or detect_format(fn):
+        case "json":
+            return load_json(iter(((0, data),)), fn, object_builder)
+        case "ndjson":
+            return load_json(
+                (
+                    (line_offset, doc)
+                    for line_offset, doc in enumerate(data.splitlines())
+                    if doc.strip()
+                ),
+                fn,
+                object_builder,
+            )
+        case _:
+            return load_yaml(data, fn, object_builder)
+
+
+def load_file_cached(
+    data: bytes,
+    fn: str,
+    object_builder: type[T],
+    cache: ManifestCache | None,
+    format: ManifestFormat | None = None,
+) -> Iterator[ParsedDocument[T]]:
+    """Same as :func:`load_file`, but reuses the objects cached for the same content,
+    and caches the objects built otherwise."""
+    if cache is None:
+        yield from load_file(data, fn, object_builder, format)
+        return
+
+    if (objs := cache.load(key := cache.key(data, object_builder))) is not None:
+        logger.debug("reusing the cached manifests of %r", fn)
+        now = time.perf_counter()
+
+        for obj in objs:
+            yield obj, now, now
+
+        return
+
+    objs = []
+
+    for doc in load_file(data, fn, object_builder, format):
+        objs.append(doc[0])
+        yield doc
+
+    cache.store(key, objs)
+
+
+def load_files(
+    files: Sequence[tuple[str, bytes]],
+    object_builder: type[T],
+    cache: ManifestCache | None = None,
+    format: ManifestFormat | None = None,
+) -> list[tuple[str, list[ParsedDocument[T]]]]:
+    """Parses a batch of files in a worker process (see
+    :attr:`ManifestParser.workers`)."""
+    result: list[tuple[str, list[ParsedDocument[T]]]] = []
+
+    for fn, data in files:
+        result.append(
+            (fn, list(load_file_cached(data, fn, object_builder, cache, format)))
+        )
+
+    return result
+
+
 @dataclass(slots=True)
 class ManifestParser(Generic[T]):
     """
@@ -39,9 +356,25 @@ class ManifestParser(Generic[T]):
 
     Attributes:
         manifest_iterator: An iterator yielding open file objects containing the
-            manifest data in bytes.
+            manifest data in bytes, or an async iterator yielding the name and the
+            content of each file, e.g. to read the files off the event loop.
         object_builder: The class type of the desired output objects.
         queue: A queue to store the parsed objects.
+        workers: The number of processes to parse the files in. The files are parsed
+            on the event loop if 0. Either way, the objects are put into the queue in
+            the order of the files.
+        batch_size: The number of files sent to a worker process at once.
+        cache: The cache of the objects built from the files parsed by earlier runs,
+            if any (see :class:`ManifestCache`).
+        format: The format of the files. Detected from the name of each file if not
+            given: ``.json`` and ``.ndjson`` files are read as JSON, and the other
+            files as YAML.
+        prioritize: Tells, from its content, whether to parse a file as soon as it's
+            read, e.g. a file defining the resources that the others depend on (see
+            :func:`scan_kinds`). The other files are held back until all the files
+            are read, and then parsed in order. The files are parsed in order if not
+            given.
+        parsed: The number of objects put into the queue so far.
 
     Raises:
         ManifestSyntaxError: Raised when there is a syntax error in the manifest file.
@@ -70,44 +403,142 @@ class ManifestParser(Generic[T]):
         print(await parser.queue.get())
     """
 
-    manifest_iterator: Iterator[IO[bytes]]
+    manifest_iterator: Iterator[IO[bytes]] | AsyncGenerator[tuple[str, bytes], None]
     object_builder: type[T]
     queue: asyncio.Queue[T | None]
+    workers: int = 0
+    batch_size: int = 16
+    cache: ManifestCache | None = None
+    format: ManifestFormat | None = None
+    prioritize: Callable[[bytes], bool] | None = None
+    parsed: int = field(init=False, default=0)
 
     async def execute(self) -> asyncio.Queue[T | None]:
         logger.debug("parsing files")
 
-        def stream_documents(buf: IO[bytes]) -> Generator[Any, Any, Any]:
-            return (obj for obj in loader.load_all(buf))
-
-        for buf in self.manifest_iterator:
-            iter_, fn = stream_documents(buf), buf.name
-
-            while True:
-                try:
-                    payload = next(iter_)
-                except YAMLError as ex:
-                    raise ManifestSyntaxError(
-                        str(ex),
-                        ManifestSyntaxError.Context(loc={"filename": pathlib.Path(fn)}),
-                    ) from ex
-                except StopIteration:
-                    break
-
-                try:
-                    payload = self.object_builder.model_validate(payload)
-                except ValidationError as ex:
-                    raise ManifestValidationError(
-                        str(util.model.convert_errors(ex)),
-                        ManifestValidationError.Context(
-                            loc={"filename": pathlib.Path(fn)}
-                        ),
-                    )
+        if self.cache is not None and not await asyncio.to_thread(self.cache.is_usable):
+            self.cache = None
 
-                logger.debug("parsed %r", payload)
-                await self.queue.put(payload)
+        if self.workers > 0:
+            await self._execute_in_pool()
+        else:
+            async with contextlib.aclosing(self._read()) as files:
+                async for fn, data in files:
+                    for obj, started_at, finished_at in load_file_cached(
+                        data, fn, self.object_builder, self.cache, self.format
+                    ):
+                        await self._put(obj, started_at, finished_at, fn)
+
+                    # Putting into an unbounded queue never suspends, give the
+                    # requests in flight (e.g. the login) a chance to make progress
+                    # between files
+                    await asyncio.sleep(0)
 
         logger.debug("parsed files successfully")
+
+        if self.cache is not None:
+            try:
+                await asyncio.to_thread(self.cache.evict)
+            except OSError as ex:
+                logger.warning("failed to evict manifest cache entries: %s", ex)
+
         await self.queue.put(None)
 
         return self.queue
+
+    async def _put(
+        self, obj: T, started_at: float, finished_at: float, fn: str
+    ) -> None:
+        if isinstance(root := obj.root, AbstractDTO):
+            tracing.record("parse", root, started_at, finished_at, filename=fn)
+
+        logger.debug("parsed %r", obj)
+        self.parsed += 1
+        await self.queue.put(obj)
+
+    async def _read(self) -> AsyncGenerator[tuple[str, bytes], None]:
+        if self.prioritize is None:
+            async with contextlib.aclosing(self._read_files()) as files:
+                async for fn, data in files:
+                    yield fn, data
+            return
+
+        held_back: list[tuple[str, bytes]] = []
+
+        async with contextlib.aclosing(self._read_files()) as files:
+            async for fn, data in files:
+                if self.prioritize(data):
+                    yield fn, data
+                else:
+                    held_back.append((fn, data))
+
+        if held_back:
+            logger.debug("parsing %d held back file(s)", len(held_back))
+
+        for fn, data in held_back:
+            yield fn, data
+
+    async def _read_files(self) -> AsyncGenerator[tuple[str, bytes], None]:
+        if isinstance(self.manifest_iterator, AsyncGenerator):
+            async with contextlib.aclosing(self.manifest_iterator) as files:
+                async for fn, data in files:
+                    yield fn, data
+        else:
+            for buf in self.manifest_iterator:
+                with buf:
+                    fn, data = buf.name, buf.read()
+
+                yield fn, data
+
+    async def _read_batches(self) -> AsyncGenerator[list[tuple[str, bytes]], None]:
+        batch: list[tuple[str, bytes]] = []
+
+        async for fn, data in self._read():
+            batch.append((fn, data))
+
+            if len(batch) == self.batch_size:
+                yield batch
+                batch = []
+
+        if batch:
+            yield batch
+
+    async def _execute_in_pool(self) -> None:
+        loop = asyncio.get_running_loop()
+        pool = ProcessPoolExecutor(
+            max_workers=self.workers, mp_context=multiprocessing.get_context("spawn")
+        )
+        # The batches are awaited in the order they were submitted in, so that the
+        # objects come out in file order. Only a few batches per worker are in flight
+        # to bound the memory held by the results waiting for an earlier batch.
+        pending: collections.deque[
+            asyncio.Future[list[tuple[str, list[ParsedDocument[T]]]]]
+        ] = collections.deque()
+
+        async def drain(max_pending: int) -> None:
+            while len(pending) > max_pending:
+                for fn, docs in await pending.popleft():
+                    for obj, started_at, finished_at in docs:
+                        await self._put(obj, started_at, finished_at, fn)
+
+        try:
+            async with contextlib.aclosing(self._read_batches()) as batches:
+                async for batch in batches:
+                    pending.append(
+                        loop.run_in_executor(
+                            pool,
+                            load_files,
+                            batch,
+                            self.object_builder,
+                            self.cache,
+                            self.format,
+                        )
+                    )
+                    await drain(2 * self.workers)
+
+            await drain(0)
+        finally:
+            for future in pending:
+                future.cancel()
+
+            pool.shutdown(wait=False, cancel_futures=True)
@@ -1,9 +1,10 @@
+import contextlib
 import logging
 from abc import ABC, abstractmethod
 from asyncio import Semaphore, TaskGroup
-from collections.abc import Sequence
+from collections.abc import AsyncIterator, Sequence
 from dataclasses import dataclass
-from typing import Generic, Iterable, TypeVar
+from typing import Any, Generic, Iterable, TypeVar
 
 from ironfence import Mutex
 from typing_extensions import TYPE_CHECKING, override
@@ -11,7 +12,7 @@ from typing_extensions import TYPE_CHECKING, override
 from vault_autopilot.exc import UnresolvedDependencyError
 
 from .._pkg import asyva
-from ..util.coro import create_task_limited
+from ..telemetry import timeline, tracing
 from ..util.dependency_chain import AbstractNode as Node
 from ..util.dependency_chain import DependencyChain
 
@@ -24,6 +25,12 @@ P = TypeVar("P")
 logger = logging.getLogger(__name__)
 
 
+def _payload_of(node: Node) -> Any:
+    """Returns the payload of a node built from a manifest, or ``None`` for fallback
+    nodes."""
+    return getattr(node, "payload", None)
+
+
 @dataclass(slots=True)
 class AbstractNode(Node):
     absolute_path: str
@@ -46,6 +53,19 @@ class AbstractProcessor(ABC, Generic[P]):
     @abstractmethod
     def initialize(self) -> None: ...
 
+    @contextlib.asynccontextmanager
+    async def slot(self, payload: Any) -> AsyncIterator[None]:
+        """
+        Holds a slot of :attr:`sem` while the given resource is applied.
+
+        Warning:
+            The slot must not be held while triggering events: their handlers may
+            apply downstream resources, which wait for slots of their own.
+        """
+        async with self.sem:
+            timeline.mark(payload, "initiated")
+            yield
+
 
 @dataclass(slots=True)
 class ChainBasedProcessor(AbstractProcessor[P], Generic[T, P]):
@@ -143,6 +163,9 @@ class ChainBasedProcessor(AbstractProcessor[P], Generic[T, P]):
         Returns:
             None
         """
+        if (payload := _payload_of(node)) is not None:
+            tracing.begin("dependency wait", payload)
+
         if upstream_fbs := await self._build_fallback_upstream_nodes(node):
             async with self.dep_chain.lock() as mgr:
                 mgr.add_node(node)
@@ -204,10 +227,17 @@ class ChainBasedProcessor(AbstractProcessor[P], Generic[T, P]):
             )
 
     async def flush_nodes(self, node_bunch: Sequence[T]) -> None:
+        for node in node_bunch:
+            if (payload := _payload_of(node)) is not None:
+                timeline.mark(payload, "ready")
+                tracing.end("dependency wait", payload)
+
+        # The concurrency is limited by the processors while applying the nodes, see
+        # :meth:`slot`
         async with TaskGroup() as tg:
             for node in node_bunch:
                 logger.debug("creating task for flushing node %s", node)
-                await create_task_limited(tg, self.sem, self._flush(node))
+                tg.create_task(self._traced_flush(node))
 
         async with self.dep_chain.lock() as mgr:
             for node in node_bunch:
@@ -215,9 +245,11 @@ class ChainBasedProcessor(AbstractProcessor[P], Generic[T, P]):
 
         async with TaskGroup() as tg:
             for node in node_bunch:
-                await create_task_limited(
-                    tg, self.sem, self.flush_pending_downstreams_for(node)
-                )
+                tg.create_task(self.flush_pending_downstreams_for(node))
+
+    async def _traced_flush(self, node: T) -> None:
+        with tracing.span("apply", _payload_of(node)):
+            await self._flush(node)
 
     async def _on_shutdown_requested(self, _: P) -> None:
         async with self.dep_chain.lock() as mgr:
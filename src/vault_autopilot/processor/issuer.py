@@ -10,6 +10,7 @@ from ..dispatcher import event
 from ..processor.secrets_engine import SecretsEngineFallbackNode
 from ..service import IssuerService
 from ..service.abstract import ApplyResult
+from ..util.hashing import stable_hash
 from .abstract import (
     AbstractFallbackNode,
     AbstractNode,
@@ -32,7 +33,7 @@ class IssuerNode(AbstractNode):
 
     @override
     def __hash__(self) -> int:
-        return hash(NODE_PREFIX + self.absolute_path)
+        return stable_hash(NODE_PREFIX + self.absolute_path)
 
     @classmethod
     def from_payload(cls, payload: dto.IssuerApplyDTO) -> "IssuerNode":
@@ -52,7 +53,7 @@ class IssuerNode(AbstractNode):
 class IssuerFallbackNode(AbstractFallbackNode):
     @override
     def __hash__(self) -> int:
-        return hash(NODE_PREFIX + self.absolute_path)
+        return stable_hash(NODE_PREFIX + self.absolute_path)
 
 
 NodeType = IssuerNode | IssuerFallbackNode | SecretsEngineFallbackNode
@@ -86,10 +87,11 @@ class IssuerApplyProcessor(ChainBasedProcessor[NodeType, event.EventType]):
         result = {}
 
         try:
-            result = await self.iss_svc.apply(payload)
+            async with self.slot(payload):
+                result = await self.iss_svc.apply(payload)
         except Exception as exc:
             ev, result = (
-                event.IssuerVerifyError(payload),
+                event.IssuerVerifyError(payload, exc),
                 ApplyResult(status="verify_error", error=exc),
             )
         else:
@@ -97,15 +99,15 @@ class IssuerApplyProcessor(ChainBasedProcessor[NodeType, event.EventType]):
                 case "verify_success":
                     ev = event.IssuerVerifySuccess(payload)
                 case "verify_error":
-                    ev = event.IssuerVerifyError(payload)
+                    ev = event.IssuerVerifyError(payload, result.get("error"))
                 case "update_success":
                     ev = event.IssuerUpdateSuccess(payload)
                 case "update_error":
-                    ev = event.IssuerUpdateError(payload)
+                    ev = event.IssuerUpdateError(payload, result.get("error"))
                 case "create_success":
                     ev = event.IssuerCreateSuccess(payload)
                 case "create_error":
-                    ev = event.IssuerCreateError(payload)
+                    ev = event.IssuerCreateError(payload, result.get("error"))
                 case _ as status:
                     raise NotImplementedError(status)
         finally:
@@ -10,6 +10,7 @@ from .. import dto
 from ..dispatcher import event
 from ..service import PasswordService
 from ..service.abstract import ApplyResult
+from ..util.hashing import stable_hash
 from .abstract import (
     AbstractNode,
     ChainBasedProcessor,
@@ -27,7 +28,7 @@ class PasswordNode(AbstractNode):
 
     @override
     def __hash__(self) -> int:
-        return hash(NODE_HASH + self.absolute_path)
+        return stable_hash(NODE_HASH + self.absolute_path)
 
     @classmethod
     def from_payload(cls, payload: dto.PasswordApplyDTO) -> "PasswordNode":
@@ -105,10 +106,11 @@ class PasswordApplyProcessor(ChainBasedProcessor[NodeType, event.EventType]):
         ev: event.PasswordApplySuccess | event.PasswordApplyError
 
         try:
-            result = await self.pwd_svc.apply(payload)
+            async with self.slot(payload):
+                result = await self.pwd_svc.apply(payload)
         except Exception as exc:
             ev, result = (
-                event.PasswordVerifyError(payload),
+                event.PasswordVerifyError(payload, exc),
                 ApplyResult(status="verify_error", error=exc),
             )
         else:
@@ -116,15 +118,15 @@ class PasswordApplyProcessor(ChainBasedProcessor[NodeType, event.EventType]):
                 case "verify_success":
                     ev = event.PasswordVerifySuccess(payload)
                 case "verify_error":
-                    ev = event.PasswordVerifyError(payload)
+                    ev = event.PasswordVerifyError(payload, result.get("error"))
                 case "update_success":
                     ev = event.PasswordUpdateSuccess(payload)
                 case "update_error":
-                    ev = event.PasswordUpdateError(payload)
+                    ev = event.PasswordUpdateError(payload, result.get("error"))
                 case "create_success":
                     ev = event.PasswordCreateSuccess(payload)
                 case "create_error":
-                    ev = event.PasswordCreateError(payload)
+                    ev = event.PasswordCreateError(payload, result.get("error"))
                 case _ as status:
                     raise NotImplementedError(status)
         finally:
@@ -8,6 +8,8 @@ from vault_autopilot.service.abstract import ApplyResult
 from .. import dto
 from ..dispatcher import event
 from ..service import PasswordPolicyService
+from ..telemetry import tracing
+from ..util.hashing import stable_hash
 from .abstract import AbstractFallbackNode, AbstractProcessor
 
 logger = logging.getLogger(__name__)
@@ -20,7 +22,7 @@ NODE_PREFIX = "password-policies/"
 class PasswordPolicyFallbackNode(AbstractFallbackNode):
     @override
     def __hash__(self) -> int:
-        return hash(NODE_PREFIX + self.absolute_path)
+        return stable_hash(NODE_PREFIX + self.absolute_path)
 
 
 @dataclass(slots=True)
@@ -36,7 +38,7 @@ class PasswordPolicyApplyProcessor(AbstractProcessor[event.EventType]):
             Responds to the :class:`event.PasswordPolicyApplicationRequested` event by
             creating/updating the policy on the Vault server.
             """
-            async with self.sem:
+            with tracing.span("apply", ev.resource):
                 await self.apply(ev.resource)
 
         self.observer.register(
@@ -48,10 +50,11 @@ class PasswordPolicyApplyProcessor(AbstractProcessor[event.EventType]):
         await self.observer.trigger(event.PasswordPolicyApplicationInitiated(payload))
 
         try:
-            result = await self.pwd_policy_svc.apply(payload)
+            async with self.slot(payload):
+                result = await self.pwd_policy_svc.apply(payload)
         except Exception as exc:
             ev, result = (
-                event.PasswordPolicyVerifyError(payload),
+                event.PasswordPolicyVerifyError(payload, exc),
                 ApplyResult(status="verify_error", error=exc),
             )
         else:
@@ -59,15 +62,15 @@ class PasswordPolicyApplyProcessor(AbstractProcessor[event.EventType]):
                 case "verify_success":
                     ev = event.PasswordPolicyVerifySuccess(payload)
                 case "verify_error":
-                    ev = event.PasswordPolicyVerifyError(payload)
+                    ev = event.PasswordPolicyVerifyError(payload, result.get("error"))
                 case "update_success":
                     ev = event.PasswordPolicyUpdateSuccess(payload)
                 case "update_error":
-                    ev = event.PasswordPolicyUpdateError(payload)
+                    ev = event.PasswordPolicyUpdateError(payload, result.get("error"))
                 case "create_success":
                     ev = event.PasswordPolicyCreateSuccess(payload)
                 case "create_error":
-                    ev = event.PasswordPolicyCreateError(payload)
+                    ev = event.PasswordPolicyCreateError(payload, result.get("error"))
                 case _ as status:
                     raise NotImplementedError(status)
         finally:
@@ -10,6 +10,7 @@ from vault_autopilot.service.abstract import ApplyResult
 from .. import dto
 from ..dispatcher import event
 from ..service import PKIRoleService
+from ..util.hashing import stable_hash
 from .abstract import AbstractNode, ChainBasedProcessor
 from .issuer import IssuerFallbackNode
 
@@ -25,7 +26,7 @@ class PKIRoleNode(AbstractNode):
 
     @override
     def __hash__(self) -> int:
-        return hash(NODE_PREFIX + self.absolute_path)
+        return stable_hash(NODE_PREFIX + self.absolute_path)
 
     @classmethod
     def from_payload(cls, payload: dto.PKIRoleApplyDTO) -> "PKIRoleNode":
@@ -92,10 +93,11 @@ class PKIRoleApplyProcessor(
         result = {}
 
         try:
-            result = await self.pki_role_svc.apply(payload)
+            async with self.slot(payload):
+                result = await self.pki_role_svc.apply(payload)
         except Exception as exc:
             ev, result = (
-                event.PKIRoleVerifyError(payload),
+                event.PKIRoleVerifyError(payload, exc),
                 ApplyResult(status="verify_error", error=exc),
             )
         else:
@@ -103,15 +105,15 @@ class PKIRoleApplyProcessor(
                 case "verify_success":
                     ev = event.PKIRoleVerifySuccess(payload)
                 case "verify_error":
-                    ev = event.PKIRoleVerifyError(payload)
+                    ev = event.PKIRoleVerifyError(payload, result.get("error"))
                 case "update_success":
                     ev = event.PKIRoleUpdateSuccess(payload)
                 case "update_error":
-                    ev = event.PKIRoleUpdateError(payload)
+                    ev = event.PKIRoleUpdateError(payload, result.get("error"))
                 case "create_success":
                     ev = event.PKIRoleCreateSuccess(payload)
                 case "create_error":
-                    ev = event.PKIRoleCreateError(payload)
+                    ev = event.PKIRoleCreateError(payload, result.get("error"))
                 case _ as status:
                     raise NotImplementedError(status)
         finally:
@@ -8,6 +8,8 @@ from vault_autopilot.service.abstract import ApplyResult
 from .. import dto
 from ..dispatcher import event
 from ..service import SecretsEngineService
+from ..telemetry import tracing
+from ..util.hashing import stable_hash
 from .abstract import AbstractFallbackNode, AbstractProcessor
 
 logger = logging.getLogger(__name__)
@@ -19,7 +21,7 @@ NODE_PREFIX = "secrets-engines/"
 class SecretsEngineFallbackNode(AbstractFallbackNode):
     @override
     def __hash__(self) -> int:
-        return hash(NODE_PREFIX + self.absolute_path)
+        return stable_hash(NODE_PREFIX + self.absolute_path)
 
 
 @dataclass(slots=True)
@@ -31,7 +33,7 @@ class SecretsEngineApplyProcessor(AbstractProcessor[event.EventType]):
         async def _on_application_requested(
             ev: event.SecretsEngineApplicationRequested,
         ) -> None:
-            async with self.sem:
+            with tracing.span("apply", ev.resource):
                 await self._apply(ev.resource)
 
         self.observer.register(
@@ -44,10 +46,11 @@ class SecretsEngineApplyProcessor(AbstractProcessor[event.EventType]):
         ev: event.SecretsEngineApplySuccess | event.SecretsEngineApplyError
 
         try:
-            result = await self.secrets_engine_svc.apply(payload)
+            async with self.slot(payload):
+                result = await self.secrets_engine_svc.apply(payload)
         except Exception as exc:
             ev, result = (
-                event.SecretsEngineVerifyError(payload),
+                event.SecretsEngineVerifyError(payload, exc),
                 ApplyResult(status="verify_error", error=exc),
             )
         else:
@@ -55,15 +58,15 @@ class SecretsEngineApplyProcessor(AbstractProcessor[event.EventType]):
                 case "verify_success":
                     ev = event.SecretsEngineVerifySuccess(payload)
                 case "verify_error":
-                    ev = event.SecretsEngineVerifyError(payload)
+                    ev = event.SecretsEngineVerifyError(payload, result.get("error"))
                 case "update_success":
                     ev = event.SecretsEngineUpdateSuccess(payload)
                 case "update_error":
-                    ev = event.SecretsEngineUpdateError(payload)
+                    ev = event.SecretsEngineUpdateError(payload, result.get("error"))
                 case "create_success":
                     ev = event.SecretsEngineCreateSuccess(payload)
                 case "create_error":
-                    ev = event.SecretsEngineCreateError(payload)
+                    ev = event.SecretsEngineCreateError(payload, result.get("error"))
                 case _ as status:
                     raise NotImplementedError(status)
         finally:
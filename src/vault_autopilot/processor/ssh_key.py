@@ -10,6 +10,7 @@ from vault_autopilot.service.abstract import ApplyResult
 from .. import dto
 from ..dispatcher import event
 from ..service import SSHKeyService
+from ..util.hashing import stable_hash
 from .abstract import (
     AbstractNode,
     ChainBasedProcessor,
@@ -26,7 +27,7 @@ class SSHKeyNode(AbstractNode):
 
     @override
     def __hash__(self) -> int:
-        return hash(NODE_PREFIX + self.absolute_path)
+        return stable_hash(NODE_PREFIX + self.absolute_path)
 
     @classmethod
     def from_payload(cls, payload: dto.SSHKeyApplyDTO) -> "SSHKeyNode":
@@ -94,10 +95,11 @@ class SSHKeyApplyProcessor(
         result = {}
 
         try:
-            result = await self.ssh_key_svc.apply(payload)
+            async with self.slot(payload):
+                result = await self.ssh_key_svc.apply(payload)
         except Exception as exc:
             ev, result = (
-                event.SSHKeyVerifyError(payload),
+                event.SSHKeyVerifyError(payload, exc),
                 ApplyResult(status="verify_error", error=exc),
             )
         else:
@@ -105,15 +107,15 @@ class SSHKeyApplyProcessor(
                 case "verify_success":
                     ev = event.SSHKeyVerifySuccess(payload)
                 case "verify_error":
-                    ev = event.SSHKeyVerifyError(payload)
+                    ev = event.SSHKeyVerifyError(payload, result.get("error"))
                 case "update_success":
                     ev = event.SSHKeyUpdateSuccess(payload)
                 case "update_error":
-                    ev = event.SSHKeyUpdateError(payload)
+                    ev = event.SSHKeyUpdateError(payload, result.get("error"))
                 case "create_success":
                     ev = event.SSHKeyCreateSuccess(payload)
                 case "create_error":
-                    ev = event.SSHKeyCreateError(payload)
+                    ev = event.SSHKeyCreateError(payload, result.get("error"))
                 case _ as status:
                     raise NotImplementedError(status)
         finally:
@@ -118,7 +118,25 @@ class IssuerService(ResourceApplyMixin[dto.IssuerApplyDTO, IssuerSnapshot]):
             **payload.spec.get("options", {}),  # type: ignore[reportArgumentTypie]
         )
 
+    async def _is_known_missing(self, mount_path: str, issuer_ref: str) -> bool:
+        """
+        Tells whether the issuer is missing from the list of the issuers of its engine.
+
+        The list is fetched once per engine and kept in the read cache, so that only the
+        issuers that exist are read, along with their certificates. Without the cache,
+        or if the token isn't allowed to list the issuers, every issuer is read
+        instead.
+        """
+        if self.client.read_cache is None:
+            return False
+
+        refs = await self.client.list_issuers(mount_path=mount_path)
+        return refs is not None and issuer_ref not in refs
+
     async def get(self, **payload: Unpack[dto.IssuerGetDTO]) -> IssuerReadResult | None:
+        if await self._is_known_missing(payload["mount_path"], payload["issuer_ref"]):
+            return None
+
         return await self.client.read_issuer(**payload)
 
     @cached_property
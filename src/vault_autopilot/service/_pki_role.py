@@ -47,7 +47,21 @@ class PKIRoleService(ResourceApplyMixin[dto.PKIRoleApplyDTO, Snapshot]):
             verbose_level=2,
         )
 
+    async def _is_known_missing(self, payload: dto.PKIRoleApplyDTO) -> bool:
+        """Tells whether the role is missing from the list of the roles of its engine,
+        see :meth:`IssuerService._is_known_missing`."""
+        if self.client.read_cache is None:
+            return False
+
+        names = await self.client.list_pki_roles(
+            mount_path=payload.secrets_engine_ref()
+        )
+        return names is not None and payload.spec["name"] not in names
+
     async def build_snapshot(self, payload: dto.PKIRoleApplyDTO) -> Snapshot | None:
+        if await self._is_known_missing(payload):
+            return None
+
         result = await self.client.read_pki_role(
             mount_path=payload.secrets_engine_ref(),
             name=payload.spec["name"],
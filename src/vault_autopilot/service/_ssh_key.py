@@ -8,6 +8,7 @@ from vault_autopilot.util.model import model_dump_json
 
 from .. import dto
 from .._pkg import asyva
+from ..telemetry import timeline
 from ..util.encoding import encode
 from . import abstract
 
@@ -28,20 +29,21 @@ class SSHKeyService(abstract.VersionedSecretApplyMixin[dto.SSHKeyApplyDTO]):
         """
         spec = payload.spec
 
-        match spec["key_options"]["type"]:
-            case "rsa":
-                key = rsa.generate_private_key(
-                    public_exponent=65537,
-                    key_size=spec["key_options"].get("bits", 4096),
-                )
-            case "ec":
-                key = ec.generate_private_key(
-                    curve=ec._CURVE_TYPES[spec["key_options"]["curve"]]
-                )
-            case "ed25519":
-                key = ed25519.Ed25519PrivateKey.generate()
-            case _ as key:
-                raise NotImplementedError(key)
+        with timeline.measure_cpu():
+            match spec["key_options"]["type"]:
+                case "rsa":
+                    key = rsa.generate_private_key(
+                        public_exponent=65537,
+                        key_size=spec["key_options"].get("bits", 4096),
+                    )
+                case "ec":
+                    key = ec.generate_private_key(
+                        curve=ec._CURVE_TYPES[spec["key_options"]["curve"]]
+                    )
+                case "ed25519":
+                    key = ed25519.Ed25519PrivateKey.generate()
+                case _ as key:
+                    raise NotImplementedError(key)
 
         private_key, public_key = (
             spec.get("private_key", {}),
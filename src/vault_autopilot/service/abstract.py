@@ -1,4 +1,3 @@
-import json
 from abc import abstractmethod
 from dataclasses import dataclass
 from fnmatch import fnmatch
@@ -20,6 +19,7 @@ from deepdiff import DeepDiff
 from humps import camelize
 
 from vault_autopilot._pkg.asyva import Client as AsyvaClient
+from vault_autopilot._pkg.asyva import codec
 from vault_autopilot._pkg.asyva.exc import CASParameterMismatchError
 from vault_autopilot._pkg.asyva.manager.kvv2 import ReadMetadataResult
 from vault_autopilot.exc import (
@@ -30,6 +30,7 @@ from vault_autopilot.exc import (
 )
 
 from ..dto.abstract import AbstractDTO, VersionedSecretApplyDTO
+from ..telemetry import timeline, tracing
 
 __all__ = ("VersionedSecretApplyMixin", "ResourceApplyMixin")
 
@@ -80,10 +81,22 @@ class ResourceApplyMixin(Generic[P, S]):
         )
 
     async def apply(self, payload: P) -> ApplyResult:
-        snapshot = await self.build_snapshot(payload)
+        with timeline.track(payload):
+            return await self._apply(payload)
+
+    async def _apply(self, payload: P) -> ApplyResult:
+        with tracing.span("build_snapshot"):
+            snapshot = await self.build_snapshot(payload)
+
         is_create = snapshot is None
 
-        if not is_create and (diff := self.diff(payload, snapshot)):
+        if not is_create:
+            with timeline.measure_cpu(), tracing.span("diff"):
+                diff = self.diff(payload, snapshot)
+        else:
+            diff = {}
+
+        if diff:
             logger.debug("[%s] diff: %r", self.__class__.__name__, diff)
             is_update = True
 
@@ -108,7 +121,8 @@ class ResourceApplyMixin(Generic[P, S]):
             return ApplyResult(status="verify_success")
 
         try:
-            await self.update_or_create_executor(payload)
+            with tracing.span("write"):
+                await self.update_or_create_executor(payload)
         except Exception as exc:
             return ApplyResult(
                 status="create_error" if is_create else "update_error", error=exc
@@ -137,12 +151,13 @@ class VersionedSecretApplyMixin(Generic[T]):
                 ctx=ResourceIntegrityError.Context(resource=payload),
             )
 
-        return DeepDiff(
-            json.loads(snapshot) or {},
-            camelize(payload.__dict__),
-            ignore_order=True,
-            verbose_level=2,
-        )
+        with timeline.measure_cpu(), tracing.span("diff"):
+            return DeepDiff(
+                codec.loads(snapshot) or {},
+                camelize(payload.__dict__),
+                ignore_order=True,
+                verbose_level=2,
+            )
 
     async def apply(self, payload: T) -> ApplyResult:
         """
@@ -151,9 +166,13 @@ class VersionedSecretApplyMixin(Generic[T]):
         If the provided version matches the current version of the secret, verify its
         integrity. Otherwise, Check-and-Set the secret with the given payload.
         """
+        with timeline.track(payload):
+            return await self._apply(payload)
 
+    async def _apply(self, payload: T) -> ApplyResult:
         try:
-            await self.check_and_set(payload)
+            with tracing.span("write"):
+                await self.check_and_set(payload)
         except CASParameterMismatchError as ex:
             if (required_cas := ex.ctx.get("required_cas")) is None:
                 raise RuntimeError("'required_cas' field must not be null")
@@ -1,3 +1,4 @@
+import asyncio
 from collections import UserDict
 from dataclasses import dataclass, field
 from logging import getLogger
@@ -24,35 +25,70 @@ class KvV2SecretStorage(UserDict):
     client: AsyvaClient
     data: dict[Any, Any] = field(init=False, default_factory=dict)
 
-    async def initialize(self) -> None:
-        try:
-            await self.client.enable_secrets_engine(
-                type="kv-v1",
-                path=self.secrets_engine_path,
-                description=DESCRIPTION,
-            )
-        except SecretsEnginePathInUseError:
-            logger.debug(
-                "the secrets engine %r is already created", self.secrets_engine_path
-            )
+    async def initialize(self) -> bool:
+        """
+        Creates the secrets engine the snapshots are kept in, unless it exists already.
 
-            result = await self.client.read_mount_configuration(
-                path=self.secrets_engine_path
-            )
+        Returns:
+            Whether the secrets engine was created.
+        """
+        # The engine only needs to be created by the very first run, so look it up
+        # first instead of sending a write that usually fails with path-in-use
+        result = await self.client.read_mount_configuration(
+            path=self.secrets_engine_path
+        )
 
-            if result is None:
-                raise RuntimeError("Unexpected behavior")
+        if result is None:
+            try:
+                await self.client.enable_secrets_engine(
+                    type="kv-v1",
+                    path=self.secrets_engine_path,
+                    description=DESCRIPTION,
+                )
+            except SecretsEnginePathInUseError:
+                # Created by another run in the meantime
+                result = await self.client.read_mount_configuration(
+                    path=self.secrets_engine_path
+                )
 
-            if result.data.get("options", {}).get("version", None) != "1":
-                raise RuntimeError(
-                    f"Expected {self.secrets_engine_path!r} to point to a 'kv-v1' "
-                    "secrets engine, but it doesn't"
+                if result is None:
+                    raise RuntimeError("Unexpected behavior")
+            else:
+                logger.debug(
+                    "the secrets engine %r has been created", self.secrets_engine_path
                 )
-        else:
-            logger.debug(
-                "the secrets engine %r has been created", self.secrets_engine_path
+                return True
+
+        logger.debug(
+            "the secrets engine %r is already created", self.secrets_engine_path
+        )
+
+        if result.data.get("options", {}).get("version", None) != "1":
+            raise RuntimeError(
+                f"Expected {self.secrets_engine_path!r} to point to a 'kv-v1' "
+                "secrets engine, but it doesn't"
             )
 
+        return False
+
+    async def initialize_and_pull(self) -> None:
+        """Initializes the storage and pulls the snapshots at the same time, since
+        there is nothing to pull anyway if the secrets engine turns out to be missing.
+        """
+        created, pulled = await asyncio.gather(
+            self.initialize(), self.pull(), return_exceptions=True
+        )
+
+        if isinstance(created, BaseException):
+            raise created
+
+        if isinstance(pulled, BaseException):
+            if not created:
+                raise pulled
+
+            # The snapshots were read before the secrets engine existed
+            self.data = {}
+
     async def pull(self) -> None:
         self.data = (
             result.data
@@ -0,0 +1,3 @@
+from . import loop_lag, timeline, tracing
+
+__all__ = ("timeline", "loop_lag", "tracing")
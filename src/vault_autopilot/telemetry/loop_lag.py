@@ -0,0 +1,183 @@
+import asyncio
+import bisect
+import sys
+import threading
+import time
+import traceback
+from dataclasses import dataclass, field
+from types import FrameType
+
+__all__ = ("LoopLagMonitor", "SUBSYSTEMS")
+
+SUBSYSTEMS = (
+    ("ruamel", "manifest parsing"),
+    ("vault_autopilot.parser", "manifest parsing"),
+    ("pydantic", "manifest validation"),
+    ("deepdiff", "snapshot diff"),
+    ("cryptography", "key generation"),
+    ("rich", "rendering"),
+    ("vault_autopilot._cli.workflow", "rendering"),
+    ("glob", "file discovery"),
+    ("vault_autopilot._cli.discovery", "file discovery"),
+    ("aiohttp", "http client"),
+    ("ssl", "http client"),
+    ("json", "serialization"),
+)
+"""Module (or ``module:function``) prefixes mapped to the subsystem they belong to. The
+innermost frame of a captured stack that matches one of the prefixes wins."""
+
+BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+"""Upper bounds of the lag histogram buckets, in seconds."""
+
+
+def attribute(frame: FrameType | None) -> str:
+    """Returns the subsystem the innermost matching frame of the stack belongs to."""
+    while frame is not None:
+        module = frame.f_globals.get("__name__", "")
+        qualname = "%s:%s" % (module, frame.f_code.co_name)
+
+        for prefix, subsystem in SUBSYSTEMS:
+            if ":" in prefix:
+                if qualname.startswith(prefix):
+                    return subsystem
+            elif module == prefix or module.startswith(prefix + "."):
+                return subsystem
+
+        frame = frame.f_back
+
+    return "other"
+
+
+@dataclass(slots=True)
+class Stall:
+    count: int = 0
+    total: float = 0.0
+    longest: float = 0.0
+    stack: str = ""
+
+
+@dataclass(slots=True)
+class LoopLagMonitor:
+    """
+    Samples the scheduling delay of the event loop.
+
+    A sampling task sleeps for ``interval`` seconds and measures how late it wakes up.
+    Meanwhile a watchdog thread checks that the task keeps waking up: once the loop has
+    been stuck for longer than ``threshold`` seconds, it captures the stack of the
+    event loop thread, i.e. the stack of the callback that blocks it, and attributes
+    it to a subsystem (see :data:`SUBSYSTEMS`).
+
+    Attributes:
+        threshold: The lag, in seconds, above which the blocking callback is captured.
+        interval: The sampling interval, in seconds.
+        histogram: The number of samples per bucket of :data:`BUCKETS`, followed by the
+            number of samples above the last bucket.
+        stalls: The stalls above the threshold, by subsystem.
+    """
+
+    threshold: float = 0.1
+    interval: float = 0.01
+    histogram: list[int] = field(
+        init=False, default_factory=lambda: [0] * (len(BUCKETS) + 1)
+    )
+    stalls: dict[str, Stall] = field(init=False, default_factory=dict)
+    max_lag: float = field(init=False, default=0.0)
+
+    _heartbeat: float = field(init=False, default=0.0)
+    _capture: tuple[float, str, str] | None = field(init=False, default=None)
+    _task: "asyncio.Task[None] | None" = field(init=False, default=None)
+    _watchdog: threading.Thread | None = field(init=False, default=None)
+    _stopped: threading.Event = field(init=False, default_factory=threading.Event)
+
+    def start(self, loop: asyncio.AbstractEventLoop) -> None:
+        self._heartbeat = time.perf_counter()
+        self._task = loop.create_task(self._sample())
+        self._watchdog = threading.Thread(
+            target=self._watch,
+            args=(threading.get_ident(),),
+            name="loop-lag-watchdog",
+            daemon=True,
+        )
+        self._watchdog.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+
+        if self._task is not None:
+            self._task.cancel()
+        if self._watchdog is not None:
+            self._watchdog.join()
+
+    async def _sample(self) -> None:
+        while True:
+            self._heartbeat = heartbeat = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            lag = max(time.perf_counter() - heartbeat - self.interval, 0.0)
+
+            self.histogram[bisect.bisect_left(BUCKETS, lag)] += 1
+            self.max_lag = max(self.max_lag, lag)
+
+            if lag < self.threshold:
+                continue
+
+            # The watchdog may miss stalls that end before it wakes up
+            subsystem, stack = "unknown", ""
+            if (capture := self._capture) is not None and capture[0] == heartbeat:
+                _, subsystem, stack = capture
+
+            stall = self.stalls.setdefault(subsystem, Stall())
+            stall.count += 1
+            stall.total += lag
+
+            if lag > stall.longest:
+                stall.longest, stall.stack = lag, stack
+
+    def _watch(self, loop_thread_id: int) -> None:
+        while not self._stopped.wait(self.threshold / 2):
+            heartbeat = self._heartbeat
+
+            if time.perf_counter() - heartbeat < self.threshold + self.interval or (
+                self._capture is not None and self._capture[0] == heartbeat
+            ):
+                continue
+
+            if (frame := sys._current_frames().get(loop_thread_id)) is None:
+                continue
+
+            self._capture = (
+                heartbeat,
+                attribute(frame),
+                "".join(traceback.format_stack(frame, limit=8)),
+            )
+
+    def report(self) -> str:
+        samples = sum(self.histogram)
+        lines = [
+            "Event loop lag (%d samples, max %.3fs):" % (samples, self.max_lag),
+        ]
+
+        bounds = ["<%gms" % (bound * 1000) for bound in BUCKETS]
+        bounds.append(">=%gms" % (BUCKETS[-1] * 1000))
+
+        lines.extend(
+            "  %8s %8d" % (bound, count)
+            for bound, count in zip(bounds, self.histogram)
+            if count
+        )
+
+        if not self.stalls:
+            return "\n".join(lines)
+
+        lines.append(
+            "\nBlocking callbacks above %gms by subsystem:" % (self.threshold * 1000)
+        )
+        for subsystem, stall in sorted(
+            self.stalls.items(), key=lambda item: item[1].total, reverse=True
+        ):
+            lines.append(
+                "  %-20s %4d stall(s), %.3fs total, %.3fs longest"
+                % (subsystem, stall.count, stall.total, stall.longest)
+            )
+            lines.extend("      " + line for line in stall.stack.rstrip().splitlines())
+
+        return "\n".join(lines)
@@ -0,0 +1,231 @@
+"""
+Per-resource timing breakdown of an apply run.
+
+The hooks in this module are called from the processors and the services. They look
+up the active :class:`Timeline` in a context variable and do nothing when there is
+none, so the instrumentation costs a single lookup per call unless it is enabled.
+"""
+
+import time
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from types import SimpleNamespace
+from typing import Literal
+
+import aiohttp
+
+from .. import dto
+from ..graph import resource_key, upstream_keys
+from ..util import trace_config
+
+__all__ = (
+    "ResourceTiming",
+    "Timeline",
+    "mark",
+    "track",
+    "measure_cpu",
+    "create_trace_config",
+)
+
+Boundary = Literal["requested", "ready", "initiated", "finished"]
+
+_timeline: ContextVar["Timeline | None"] = ContextVar("timeline", default=None)
+_current: ContextVar["ResourceTiming | None"] = ContextVar(
+    "resource_timing", default=None
+)
+
+
+@dataclass(slots=True)
+class ResourceTiming:
+    """
+    Timestamps (as returned by :func:`time.perf_counter`) and accumulated durations
+    of a single resource.
+
+    Attributes:
+        requested_at: The time the dispatcher handed the resource to its processor.
+        ready_at: The time all the upstream dependencies of the resource were
+            satisfied. Resources without dependencies are ready once requested.
+        initiated_at: The time the processor acquired a semaphore slot and started
+            applying the resource.
+        finished_at: The time the processor reported the result.
+        vault_time: Total time spent in HTTP requests to Vault.
+        cpu_time: Total time spent in CPU-bound work, such as diffing snapshots and
+            generating keys.
+    """
+
+    key: str
+    upstreams: tuple[str, ...] = ()
+    requested_at: float | None = None
+    ready_at: float | None = None
+    initiated_at: float | None = None
+    finished_at: float | None = None
+    vault_time: float = 0.0
+    cpu_time: float = 0.0
+
+    @property
+    def dependency_wait(self) -> float:
+        if self.requested_at is None or self.ready_at is None:
+            return 0.0
+        return max(self.ready_at - self.requested_at, 0.0)
+
+    @property
+    def queue_wait(self) -> float:
+        if self.initiated_at is None:
+            return 0.0
+
+        ready_at = self.ready_at if self.ready_at is not None else self.requested_at
+        return max(self.initiated_at - ready_at, 0.0) if ready_at is not None else 0.0
+
+    @property
+    def apply_time(self) -> float:
+        if self.initiated_at is None or self.finished_at is None:
+            return 0.0
+        return self.finished_at - self.initiated_at
+
+
+CATEGORIES = {
+    "dependency wait": lambda rt: rt.dependency_wait,
+    "semaphore wait": lambda rt: rt.queue_wait,
+    "vault requests": lambda rt: rt.vault_time,
+    "local cpu": lambda rt: rt.cpu_time,
+}
+
+
+@dataclass(slots=True)
+class Timeline:
+    resources: dict[str, ResourceTiming] = field(default_factory=dict)
+
+    def activate(self) -> None:
+        """Makes the timeline collect the timings of the current context and the tasks
+        created from it."""
+        _timeline.set(self)
+
+    def get(self, payload: dto.AbstractDTO) -> ResourceTiming:
+        key = resource_key(payload.kind, payload.absolute_path())
+
+        if (timing := self.resources.get(key)) is None:
+            timing = self.resources[key] = ResourceTiming(key, upstream_keys(payload))
+
+        return timing
+
+    def merge(self, timings: Iterable[ResourceTiming]) -> None:
+        for timing in timings:
+            self.resources[timing.key] = timing
+
+    def critical_path(self) -> list[ResourceTiming]:
+        """
+        Returns the chain of resources that determined the end of the run, starting
+        with the earliest one.
+
+        The path begins at the resource that finished last and follows, at each step,
+        the upstream dependency that finished last, i.e. the one the resource actually
+        waited for.
+        """
+        finished = [rt for rt in self.resources.values() if rt.finished_at is not None]
+        if not finished:
+            return []
+
+        path = [max(finished, key=lambda rt: rt.finished_at or 0.0)]
+
+        while upstreams := [
+            rt
+            for key in path[-1].upstreams
+            if (rt := self.resources.get(key)) is not None
+            and rt.finished_at is not None
+            and rt not in path
+        ]:
+            path.append(max(upstreams, key=lambda rt: rt.finished_at or 0.0))
+
+        return path[::-1]
+
+    def report(self, top: int = 5) -> str:
+        """Formats the critical path and the slowest resources by each category."""
+        lines = ["Critical path:"]
+        row = "  %-48s %10s %10s %10s %10s %10s"
+        header = row % ("resource", "deps", "semaphore", "vault", "cpu", "apply")
+
+        lines.append(header)
+        lines.extend(
+            row
+            % (
+                rt.key,
+                "%.3fs" % rt.dependency_wait,
+                "%.3fs" % rt.queue_wait,
+                "%.3fs" % rt.vault_time,
+                "%.3fs" % rt.cpu_time,
+                "%.3fs" % rt.apply_time,
+            )
+            for rt in self.critical_path()
+        )
+
+        for category, getter in CATEGORIES.items():
+            lines.append("\nTop %d by %s:" % (top, category))
+            lines.extend(
+                "  %-48s %10s" % (rt.key, "%.3fs" % getter(rt))
+                for rt in sorted(self.resources.values(), key=getter, reverse=True)[
+                    :top
+                ]
+            )
+
+        return "\n".join(lines)
+
+
+def mark(payload: dto.AbstractDTO, boundary: Boundary) -> None:
+    if (timeline := _timeline.get()) is None:
+        return
+
+    setattr(timeline.get(payload), boundary + "_at", time.perf_counter())
+
+
+@contextmanager
+def track(payload: dto.AbstractDTO) -> Iterator[None]:
+    """Attributes the Vault requests and the CPU-bound work done within the context to
+    the given resource."""
+    if (timeline := _timeline.get()) is None:
+        yield
+        return
+
+    token = _current.set(timeline.get(payload))
+    try:
+        yield
+    finally:
+        _current.reset(token)
+
+
+@contextmanager
+def measure_cpu() -> Iterator[None]:
+    if (timing := _current.get()) is None:
+        yield
+        return
+
+    started_at = time.perf_counter()
+    try:
+        yield
+    finally:
+        timing.cpu_time += time.perf_counter() - started_at
+
+
+def create_trace_config() -> aiohttp.TraceConfig:
+    """Returns a trace config that attributes the duration of HTTP requests to the
+    resource being tracked."""
+
+    async def on_request_start(
+        _: aiohttp.ClientSession,
+        ctx: SimpleNamespace,
+        __: aiohttp.TraceRequestStartParams,
+    ) -> None:
+        ctx.timing, ctx.started_at = _current.get(), time.perf_counter()
+
+    async def on_request_end(
+        _: aiohttp.ClientSession,
+        ctx: SimpleNamespace,
+        __: aiohttp.TraceRequestEndParams | aiohttp.TraceRequestExceptionParams,
+    ) -> None:
+        if ctx.timing is not None:
+            ctx.timing.vault_time += time.perf_counter() - ctx.started_at
+
+    return trace_config.create_trace_config(
+        on_request_start, on_request_end, on_request_end
+    )
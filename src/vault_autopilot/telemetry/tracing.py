@@ -0,0 +1,230 @@
+"""
+Trace Event Format export of an apply run, viewable in Perfetto or chrome://tracing.
+
+Every resource gets its own track (a "thread" in the format's terms) that holds the
+spans of its lifecycle, with the HTTP requests nested in them. Like the timeline, the
+hooks do nothing unless a :class:`Tracer` is active in the current context.
+"""
+
+import json
+import os
+import time
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from types import SimpleNamespace
+from typing import IO, Any
+
+import aiohttp
+
+from .. import dto
+from .._pkg.asyva.manager.base import RequestContext
+from ..graph import resource_key
+from ..util import trace_config
+
+__all__ = (
+    "Tracer",
+    "span",
+    "record",
+    "begin",
+    "end",
+    "create_trace_config",
+)
+
+TraceEvent = dict[str, Any]
+
+_tracer: ContextVar["Tracer | None"] = ContextVar("tracer", default=None)
+_track: ContextVar[int] = ContextVar("trace_track", default=0)
+
+
+def _timestamp(seconds: float) -> float:
+    """Converts a :func:`time.perf_counter` value into trace microseconds."""
+    return seconds * 1_000_000
+
+
+@dataclass(slots=True)
+class Tracer:
+    """
+    Collects trace events of the current process.
+
+    Timestamps are taken from :func:`time.perf_counter`, which reads the system-wide
+    monotonic clock, so events collected by worker processes can be merged as is.
+    """
+
+    events: list[TraceEvent] = field(default_factory=list)
+    _pid: int = field(init=False, default_factory=os.getpid)
+    _tracks: dict[str, int] = field(init=False, default_factory=dict)
+    _pending: dict[tuple[str, int], float] = field(init=False, default_factory=dict)
+
+    def __post_init__(self) -> None:
+        self._name_track(0, "vault-autopilot")
+
+    def activate(self) -> None:
+        _tracer.set(self)
+
+    def track_for(self, payload: dto.AbstractDTO) -> int:
+        key = resource_key(payload.kind, payload.absolute_path())
+
+        if (tid := self._tracks.get(key)) is None:
+            tid = self._tracks[key] = len(self._tracks) + 1
+            self._name_track(tid, key)
+
+        return tid
+
+    def complete(
+        self,
+        name: str,
+        category: str,
+        tid: int,
+        started_at: float,
+        finished_at: float,
+        args: dict[str, Any] | None = None,
+    ) -> None:
+        self.events.append(
+            {
+                "name": name,
+                "cat": category,
+                "ph": "X",
+                "ts": _timestamp(started_at),
+                "dur": _timestamp(finished_at - started_at),
+                "pid": self._pid,
+                "tid": tid,
+                "args": args or {},
+            }
+        )
+
+    def open(self, name: str, tid: int) -> None:
+        self._pending[(name, tid)] = time.perf_counter()
+
+    def close(self, name: str, tid: int) -> None:
+        if (started_at := self._pending.pop((name, tid), None)) is not None:
+            self.complete(name, "apply", tid, started_at, time.perf_counter())
+
+    def merge(self, events: Iterable[TraceEvent]) -> None:
+        self.events.extend(events)
+
+    def dump(self, fp: IO[str]) -> None:
+        json.dump({"traceEvents": self.events, "displayTimeUnit": "ms"}, fp)
+
+    def _name_track(self, tid: int, name: str) -> None:
+        self.events.append(
+            {
+                "name": "thread_name",
+                "ph": "M",
+                "pid": self._pid,
+                "tid": tid,
+                "args": {"name": name},
+            }
+        )
+
+
+@contextmanager
+def span(
+    name: str, payload: dto.AbstractDTO | None = None, category: str = "apply"
+) -> Iterator[None]:
+    """
+    Records a span on the track of the given resource, or on the track of the
+    enclosing span if no resource is given. The spans and the HTTP requests started
+    within the context are nested in it.
+    """
+    if (tracer := _tracer.get()) is None:
+        yield
+        return
+
+    tid = tracer.track_for(payload) if payload is not None else _track.get()
+    token, started_at = _track.set(tid), time.perf_counter()
+
+    try:
+        yield
+    finally:
+        _track.reset(token)
+        tracer.complete(name, category, tid, started_at, time.perf_counter())
+
+
+def record(
+    name: str,
+    payload: dto.AbstractDTO,
+    started_at: float,
+    finished_at: float | None = None,
+    **args: Any,
+) -> None:
+    """Records a span that started at ``started_at`` and finished at ``finished_at``,
+    or finishes now. The times may come from another process, since
+    :func:`time.perf_counter` is system-wide."""
+    if (tracer := _tracer.get()) is None:
+        return
+
+    tracer.complete(
+        name,
+        "apply",
+        tracer.track_for(payload),
+        started_at,
+        finished_at if finished_at is not None else time.perf_counter(),
+        args,
+    )
+
+
+def begin(name: str, payload: dto.AbstractDTO) -> None:
+    """Opens a span that is closed by :func:`end`, possibly in another task."""
+    if (tracer := _tracer.get()) is None:
+        return
+
+    tracer.open(name, tracer.track_for(payload))
+
+
+def end(name: str, payload: dto.AbstractDTO) -> None:
+    if (tracer := _tracer.get()) is None:
+        return
+
+    tracer.close(name, tracer.track_for(payload))
+
+
+def create_trace_config() -> aiohttp.TraceConfig:
+    """Returns a trace config that records a span for each HTTP request, nested in the
+    span that is active when the request starts."""
+
+    async def on_request_start(
+        _: aiohttp.ClientSession,
+        ctx: SimpleNamespace,
+        params: aiohttp.TraceRequestStartParams,
+    ) -> None:
+        ctx.tid, ctx.started_at = _track.get(), time.perf_counter()
+
+    def complete(
+        ctx: SimpleNamespace, method: str, url: Any, status: int | str
+    ) -> None:
+        if (tracer := _tracer.get()) is None:
+            return
+
+        template = (
+            ctx.trace_request_ctx.url_template
+            if isinstance(ctx.trace_request_ctx, RequestContext)
+            else url.path
+        )
+        tracer.complete(
+            "%s %s" % (method, template),
+            "http",
+            ctx.tid,
+            ctx.started_at,
+            time.perf_counter(),
+            {"method": method, "path_template": template, "status": status},
+        )
+
+    async def on_request_end(
+        _: aiohttp.ClientSession,
+        ctx: SimpleNamespace,
+        params: aiohttp.TraceRequestEndParams,
+    ) -> None:
+        complete(ctx, params.method, params.url, params.response.status)
+
+    async def on_request_exception(
+        _: aiohttp.ClientSession,
+        ctx: SimpleNamespace,
+        params: aiohttp.TraceRequestExceptionParams,
+    ) -> None:
+        complete(ctx, params.method, params.url, type(params.exception).__name__)
+
+    return trace_config.create_trace_config(
+        on_request_start, on_request_end, on_request_exception
+    )
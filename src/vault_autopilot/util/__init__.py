@@ -1,3 +1,19 @@
-from . import coro, dependency_chain, encoding, model
+from . import (
+    adaptive,
+    coro,
+    dependency_chain,
+    encoding,
+    hashing,
+    model,
+    trace_config,
+)
 
-__all__ = ("encoding", "coro", "model", "dependency_chain")
+__all__ = (
+    "adaptive",
+    "encoding",
+    "coro",
+    "model",
+    "dependency_chain",
+    "hashing",
+    "trace_config",
+)
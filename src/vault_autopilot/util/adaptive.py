@@ -0,0 +1,234 @@
+"""
+AIMD (additive-increase/multiplicative-decrease) concurrency limiting.
+
+The limit grows by one slot after every window of requests whose tail latency stayed
+close to the best one observed, as long as the limit was actually reached, and shrinks
+by a factor as soon as the latency rises or Vault pushes back (see
+:data:`PUSHBACK_STATUSES`). Only the requests sent after an adjustment are taken into
+account for the next one, so a burst of failures shrinks the limit once.
+
+The latency and the statuses are observed through an :class:`aiohttp.TraceConfig`, so
+every request sent by the client counts.
+"""
+
+import asyncio
+import collections
+import math
+import time
+from dataclasses import dataclass
+from types import SimpleNamespace
+from typing import Literal
+
+import aiohttp
+from typing_extensions import override
+
+from .trace_config import create_trace_config
+
+__all__ = ("AdaptiveConcurrencyConfig", "AdaptiveSemaphore", "PUSHBACK_STATUSES")
+
+PUSHBACK_STATUSES = frozenset((429, 502, 503, 504))
+"""Statuses that mean Vault, or a proxy in front of it, is overloaded. Other 5xx
+statuses aren't among them since Vault also uses 500 for some regular errors, e.g.
+when an issuer doesn't exist."""
+
+
+@dataclass(slots=True, kw_only=True)
+class AdaptiveConcurrencyConfig:
+    """
+    Attributes:
+        adaptive: Whether to limit the number of resources applied concurrently. When
+            disabled, there is no limit.
+        floor: The lowest the limit can go.
+        ceiling: The highest the limit can go.
+        initial: The limit to start with. Defaults to ``floor``.
+        window: The number of request latencies the p95 latency is computed over
+            before each adjustment.
+        tolerance: How many times higher than the best p95 latency observed the p95
+            latency of a window may be before the limit is decreased.
+        backoff: The factor the limit is multiplied by when decreased.
+    """
+
+    adaptive: bool = False
+    floor: int = 2
+    ceiling: int = 64
+    initial: int | None = None
+    window: int = 20
+    tolerance: float = 1.5
+    backoff: float = 0.7
+
+    def __post_init__(self) -> None:
+        if not 1 <= self.floor <= self.ceiling:
+            raise ValueError(
+                "expected 1 <= floor <= ceiling, got floor=%d, ceiling=%d"
+                % (self.floor, self.ceiling)
+            )
+        if self.initial is not None and not self.floor <= self.initial <= self.ceiling:
+            raise ValueError("initial must be between floor and ceiling")
+        if not 0 < self.backoff < 1:
+            raise ValueError("backoff must be between 0 and 1, got %r" % self.backoff)
+        if self.tolerance < 1:
+            raise ValueError("tolerance must be at least 1, got %r" % self.tolerance)
+
+
+class AdaptiveSemaphore(asyncio.Semaphore):
+    """
+    A semaphore whose number of slots follows the AIMD algorithm, see the module
+    documentation. Waiters are woken up in FIFO order.
+
+    Attributes:
+        limit: The current number of slots.
+        history: The limit after each adjustment, along with the time (as returned by
+            :func:`time.perf_counter`) and the reason of the adjustment.
+    """
+
+    def __init__(self, config: AdaptiveConcurrencyConfig) -> None:
+        super().__init__()
+        self.config = config
+        self.limit = config.initial or config.floor
+        self.history: list[tuple[float, int, str]] = [
+            (time.perf_counter(), self.limit, "initial")
+        ]
+
+        self._in_flight = 0
+        self._peak = 0
+        self._queue: collections.deque[asyncio.Future[None]] = collections.deque()
+        self._latencies: list[float] = []
+        self._best_p95: float | None = None
+        self._window_started_at = time.perf_counter()
+
+    @override
+    def locked(self) -> bool:
+        return self._in_flight >= self.limit or bool(self._queue)
+
+    @override
+    async def acquire(self) -> Literal[True]:
+        if not self.locked():
+            self._take()
+            return True
+
+        fut = asyncio.get_running_loop().create_future()
+        self._queue.append(fut)
+
+        try:
+            await fut
+        except asyncio.CancelledError:
+            if fut.done() and not fut.cancelled():
+                # The slot was handed over right before the cancellation
+                self.release()
+            else:
+                self._queue.remove(fut)
+            raise
+
+        return True
+
+    @override
+    def release(self) -> None:
+        self._in_flight -= 1
+        self._wake_up()
+
+    def _take(self) -> None:
+        self._in_flight += 1
+        self._peak = max(self._peak, self._in_flight)
+
+    def _wake_up(self) -> None:
+        while self._queue and self._in_flight < self.limit:
+            if not (fut := self._queue.popleft()).done():
+                self._take()
+                fut.set_result(None)
+
+    def record(self, started_at: float, finished_at: float, status: int | None) -> None:
+        """Records the outcome of a request. ``status`` is ``None`` for requests that
+        failed without a response."""
+        if started_at < self._window_started_at:
+            return
+
+        if status is None or status in PUSHBACK_STATUSES:
+            self._decrease("%s response" % status if status else "request failure")
+            return
+
+        self._latencies.append(finished_at - started_at)
+
+        if len(self._latencies) < self.config.window:
+            return
+
+        p95 = sorted(self._latencies)[math.ceil(0.95 * len(self._latencies)) - 1]
+        best = self._best_p95 = min(p95, self._best_p95 or p95)
+
+        if p95 > best * self.config.tolerance:
+            self._decrease("p95 latency %.3fs > %.3fs" % (p95, best))
+        elif self._peak >= self.limit:
+            # Only grow the limit if it is what holds the resources back
+            self._adjust(min(self.limit + 1, self.config.ceiling), "stable latency")
+        else:
+            self._reset_window()
+
+    def _decrease(self, reason: str) -> None:
+        self._adjust(
+            max(math.floor(self.limit * self.config.backoff), self.config.floor),
+            reason,
+        )
+
+    def _adjust(self, limit: int, reason: str) -> None:
+        if limit != self.limit:
+            self.limit = limit
+            self.history.append((time.perf_counter(), limit, reason))
+            self._wake_up()
+
+        self._reset_window()
+
+    def _reset_window(self) -> None:
+        self._latencies.clear()
+        self._peak = self._in_flight
+        self._window_started_at = time.perf_counter()
+
+    def create_trace_config(self) -> aiohttp.TraceConfig:
+        """Returns a trace config that feeds the limiter with the outcome of the
+        requests sent by a client."""
+
+        async def on_request_start(
+            _: aiohttp.ClientSession,
+            ctx: SimpleNamespace,
+            __: aiohttp.TraceRequestStartParams,
+        ) -> None:
+            ctx.started_at = time.perf_counter()
+
+        async def on_request_end(
+            _: aiohttp.ClientSession,
+            ctx: SimpleNamespace,
+            params: aiohttp.TraceRequestEndParams,
+        ) -> None:
+            self.record(ctx.started_at, time.perf_counter(), params.response.status)
+
+        async def on_request_exception(
+            _: aiohttp.ClientSession,
+            ctx: SimpleNamespace,
+            __: aiohttp.TraceRequestExceptionParams,
+        ) -> None:
+            self.record(ctx.started_at, time.perf_counter(), None)
+
+        return create_trace_config(
+            on_request_start, on_request_end, on_request_exception
+        )
+
+    def report(self) -> str:
+        limits = [limit for _, limit, _ in self.history]
+        decreases = sum(1 for a, b in zip(limits, limits[1:]) if b < a)
+
+        lines = [
+            "Adaptive concurrency: final limit %d (min %d, max %d), %d increase(s), "
+            "%d decrease(s)"
+            % (
+                self.limit,
+                min(limits),
+                max(limits),
+                len(limits) - 1 - decreases,
+                decreases,
+            )
+        ]
+
+        started_at = self.history[0][0]
+        lines.extend(
+            "  %8.3fs %4d  %s" % (at - started_at, limit, reason)
+            for at, limit, reason in self.history[1:][-10:]
+        )
+        return "\n".join(lines)
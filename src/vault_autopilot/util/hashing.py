@@ -0,0 +1,15 @@
+from hashlib import blake2b
+
+__all__ = ("stable_hash",)
+
+
+def stable_hash(value: str) -> int:
+    """
+    Returns a hash of the given string that is stable across interpreter runs.
+
+    Unlike the builtin :func:`hash`, the result does not depend on ``PYTHONHASHSEED``,
+    so it can be used to identify the same object in different processes.
+    """
+    return int.from_bytes(
+        blake2b(value.encode("utf-8"), digest_size=8).digest(), "big", signed=True
+    )
@@ -4,7 +4,7 @@ import pydantic
 import pydantic_core
 from typing_extensions import TypedDict, Unpack
 
-__all__ = ("convert_errors", "model_dump", "model_dump_json")
+__all__ = ("convert_errors", "model_dump", "model_dump_json", "dump_json")
 
 
 CUSTOM_TYPES = {
@@ -114,16 +114,27 @@ class ModelDumpJsonKwargs(AbstractDumpKwargs):
     indent: NotRequired[int]
 
 
+# Serializes any value the way a ``pydantic.RootModel`` would, without building a
+# model (and validating the value) on every call
+_any_adapter: pydantic.TypeAdapter[Any] = pydantic.TypeAdapter(Any)
+
+
+def dump_json(obj: Any, **kwargs: Unpack[ModelDumpJsonKwargs]) -> bytes:
+    """Like :func:`model_dump_json`, but returns the UTF-8 encoded bytes, ready to be
+    sent as a request body."""
+    return _any_adapter.dump_json(obj, **kwargs)
+
+
 def model_dump_json(obj: Any, **kwargs: Unpack[ModelDumpJsonKwargs]) -> str:
-    return pydantic.RootModel(obj).model_dump_json(**kwargs)
+    return dump_json(obj, **kwargs).decode()
 
 
 class ModelDumpKwargs(AbstractDumpKwargs):
-    mode: NotRequired[Literal["json", "python"] | str]
+    mode: NotRequired[Literal["json", "python"]]
 
 
 def model_dump(obj: Any, **kwargs: Unpack[ModelDumpKwargs]) -> dict[Any, Any]:
-    return pydantic.RootModel(obj).model_dump(**kwargs)
+    return _any_adapter.dump_python(obj, **kwargs)
 
 
 def recursive_dict_filter(dict1: Any, dict2: Any) -> dict[Any, Any]:
@@ -0,0 +1,47 @@
+from collections.abc import Awaitable, Callable, MutableSequence
+from types import SimpleNamespace
+from typing import Any, TypeVar, cast
+
+import aiohttp
+
+__all__ = (
+    "RequestStartCallback",
+    "RequestEndCallback",
+    "RequestExceptionCallback",
+    "create_trace_config",
+)
+
+ParamsT = TypeVar("ParamsT")
+
+RequestCallback = Callable[
+    [aiohttp.ClientSession, SimpleNamespace, ParamsT], Awaitable[None]
+]
+RequestStartCallback = RequestCallback[aiohttp.TraceRequestStartParams]
+RequestEndCallback = RequestCallback[aiohttp.TraceRequestEndParams]
+RequestExceptionCallback = RequestCallback[aiohttp.TraceRequestExceptionParams]
+
+
+def create_trace_config(
+    on_request_start: RequestStartCallback,
+    on_request_end: RequestEndCallback,
+    on_request_exception: RequestExceptionCallback,
+) -> aiohttp.TraceConfig:
+    """
+    Returns a trace config that notifies the given callbacks of the requests sent by a
+    client.
+
+    The callbacks are checked against the signature aiohttp calls them with. The
+    signals themselves are annotated for the aiosignal releases before 1.4, which made
+    them generic over the arguments instead of the callback, so they are appended to
+    untyped.
+    """
+    trace_config = aiohttp.TraceConfig()
+
+    for signal, callback in (
+        (trace_config.on_request_start, on_request_start),
+        (trace_config.on_request_end, on_request_end),
+        (trace_config.on_request_exception, on_request_exception),
+    ):
+        cast(MutableSequence[Any], signal).append(callback)
+
+    return trace_config
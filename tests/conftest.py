@@ -0,0 +1,10 @@
+from pathlib import Path
+
+import pytest
+
+from .stand_in import StandInVault
+
+
+@pytest.fixture
+def vault(tmp_path: Path) -> StandInVault:
+    return StandInVault(str(tmp_path / "agent.sock"))
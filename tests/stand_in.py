@@ -0,0 +1,104 @@
+import asyncio
+import contextlib
+from collections.abc import AsyncIterator
+from dataclasses import dataclass, field
+from typing import Any
+
+from aiohttp import web
+from vault_autopilot._pkg import asyva
+
+
+@dataclass(slots=True)
+class ReceivedRequest:
+    method: str
+    path: str
+    headers: dict[str, str]
+    """The headers, by lowercase name."""
+
+
+@dataclass(slots=True)
+class CannedResponse:
+    status: int
+    body: Any
+    gate: asyncio.Event | None
+    """Holds the response back until set, to keep the request in flight."""
+
+
+@dataclass(slots=True)
+class StandInVault:
+    """
+    Serves the Vault API on a UNIX socket, like a Vault Agent would, so that a client
+    authenticated with :class:`asyva.AgentAuthenticator` sends its requests without
+    logging in. The requests are recorded and answered with the responses set with
+    :meth:`respond`, the others get a ``400``.
+    """
+
+    socket_path: str
+    received: list[ReceivedRequest] = field(default_factory=list)
+    _responses: dict[tuple[str, str], CannedResponse] = field(default_factory=dict)
+
+    @property
+    def base_url(self) -> str:
+        return "unix://%s" % self.socket_path
+
+    def respond(
+        self,
+        method: str,
+        path: str,
+        status: int = 200,
+        body: Any = None,
+        gate: asyncio.Event | None = None,
+    ) -> None:
+        self._responses[(method, path)] = CannedResponse(status, body, gate)
+
+    def count(self, method: str, path: str) -> int:
+        """Returns the number of requests received for the given endpoint."""
+        return sum(
+            1 for req in self.received if (req.method, req.path) == (method, path)
+        )
+
+    async def _handle(self, request: web.Request) -> web.Response:
+        self.received.append(
+            ReceivedRequest(
+                request.method,
+                request.path,
+                {name.lower(): value for name, value in request.headers.items()},
+            )
+        )
+
+        if (resp := self._responses.get((request.method, request.path))) is None:
+            return web.json_response({"errors": ["stand-in"]}, status=400)
+
+        if resp.gate is not None:
+            await resp.gate.wait()
+
+        if resp.body is None:
+            return web.Response(status=resp.status)
+
+        return web.json_response(resp.body, status=resp.status)
+
+    @contextlib.asynccontextmanager
+    async def serve(self) -> AsyncIterator["StandInVault"]:
+        app = web.Application()
+        app.router.add_route("*", "/{tail:.*}", self._handle)
+        runner = web.AppRunner(app)
+        await runner.setup()
+
+        try:
+            await web.UnixSite(runner, self.socket_path).start()
+            yield self
+        finally:
+            await runner.cleanup()
+
+    @contextlib.asynccontextmanager
+    async def connect(self, **kwargs: Any) -> AsyncIterator[asyva.Client]:
+        """Yields a client of the stand-in, created with the given arguments."""
+        client = asyva.Client(**kwargs)
+
+        try:
+            await client.authenticate(
+                base_url=self.base_url, authn=asyva.AgentAuthenticator()
+            )
+            yield client
+        finally:
+            await client.close()
@@ -0,0 +1,209 @@
+import asyncio
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+import pytest
+from vault_autopilot._pkg import asyva
+from vault_autopilot._pkg.asyva.cache import ReadCache
+
+from .stand_in import StandInVault
+
+KV_CONFIGURATION = {
+    "data": {"cas_required": False, "delete_version_after": "0s", "max_versions": 0}
+}
+MOUNT_CONFIGURATION = {"data": {"default_lease_ttl": 0, "max_lease_ttl": 0}}
+
+
+def issuer(ref: str) -> dict[str, Any]:
+    return {"data": {"issuer_id": ref, "issuer_name": ref}}
+
+
+async def until_received(vault: StandInVault, method: str, path: str) -> None:
+    while not vault.count(method, path):
+        await asyncio.sleep(0.01)
+
+
+def test_read_cache_hit_and_miss() -> None:
+    cache = ReadCache()
+    key = (None, "mount", "kv")
+
+    assert cache.get(key) == (False, None)
+
+    cache.put(key, "config", cache.generation)
+
+    assert cache.get(key) == (True, "config")
+    assert cache.stats["mount"].hits == 1
+    assert cache.stats["mount"].misses == 1
+
+
+def test_read_cache_drops_result_of_read_started_before_invalidation() -> None:
+    cache = ReadCache()
+    key = (None, "issuer", "pki", "root")
+
+    generation = cache.generation
+    cache.invalidate((None, "issuer", "pki"))
+    cache.put(key, "stale", generation)
+
+    assert cache.get(key) == (False, None)
+
+    cache.put(key, "fresh", cache.generation)
+
+    assert cache.get(key) == (True, "fresh")
+
+
+def test_client_serves_repeated_reads_from_cache(vault: StandInVault) -> None:
+    vault.respond("GET", "/v1/sys/mounts/kv/tune", body=MOUNT_CONFIGURATION)
+
+    async def main() -> None:
+        async with vault.serve(), vault.connect() as client:
+            first = await client.read_mount_configuration(path="kv")
+            second = await client.read_mount_configuration(path="kv")
+
+            assert first is second
+
+    asyncio.run(main())
+
+    assert vault.count("GET", "/v1/sys/mounts/kv/tune") == 1
+
+
+def test_write_invalidates_objects_under_its_path(vault: StandInVault) -> None:
+    for path in ("/v1/pki/issuer/a", "/v1/pki/issuer/b", "/v1/pki2/issuer/a"):
+        vault.respond("GET", path, body=issuer(path.rsplit("/", 1)[1]))
+    vault.respond("PATCH", "/v1/pki/issuer/a", body=issuer("a"))
+
+    async def read_all(client: asyva.Client) -> None:
+        for mount_path, issuer_ref in (("pki", "a"), ("pki", "b"), ("pki2", "a")):
+            await client.read_issuer(mount_path=mount_path, issuer_ref=issuer_ref)
+
+    async def main() -> None:
+        async with vault.serve(), vault.connect() as client:
+            await read_all(client)
+            await client.update_issuer(mount_path="pki", issuer_ref="a")
+            await read_all(client)
+
+    asyncio.run(main())
+
+    # The issuers are invalidated by mount, the other mount is left alone
+    assert vault.count("GET", "/v1/pki/issuer/a") == 2
+    assert vault.count("GET", "/v1/pki/issuer/b") == 2
+    assert vault.count("GET", "/v1/pki2/issuer/a") == 1
+
+
+def test_read_in_flight_during_write_is_not_cached(vault: StandInVault) -> None:
+    async def main() -> None:
+        gate = asyncio.Event()
+        vault.respond(
+            "GET", "/v1/sys/mounts/kv/tune", body=MOUNT_CONFIGURATION, gate=gate
+        )
+        vault.respond("POST", "/v1/sys/mounts/kv/tune", status=204)
+
+        async with vault.serve(), vault.connect() as client:
+            read = asyncio.create_task(client.read_mount_configuration(path="kv"))
+            await until_received(vault, "GET", "/v1/sys/mounts/kv/tune")
+
+            await client.tune_mount_configuration(path="kv", max_lease_ttl=60)
+            gate.set()
+            await read
+
+            await client.read_mount_configuration(path="kv")
+
+    asyncio.run(main())
+
+    assert vault.count("GET", "/v1/sys/mounts/kv/tune") == 2
+
+
+def test_concurrent_identical_reads_are_coalesced(vault: StandInVault) -> None:
+    async def main() -> None:
+        gate = asyncio.Event()
+        vault.respond(
+            "GET", "/v1/sys/mounts/kv/tune", body=MOUNT_CONFIGURATION, gate=gate
+        )
+        vault.respond("GET", "/v1/sys/mounts/kv2/tune", body=MOUNT_CONFIGURATION)
+
+        async with (
+            vault.serve(),
+            vault.connect(cache=asyva.CacheConfig(enabled=False)) as client,
+        ):
+            reads = [
+                asyncio.create_task(client.read_mount_configuration(path="kv"))
+                for _ in range(5)
+            ]
+            await until_received(vault, "GET", "/v1/sys/mounts/kv/tune")
+            await client.read_mount_configuration(path="kv2")
+            gate.set()
+
+            results = await asyncio.gather(*reads)
+            assert all(result is results[0] for result in results)
+
+            # Once the shared read is done, the next one is sent on its own
+            await client.read_mount_configuration(path="kv")
+
+    asyncio.run(main())
+
+    assert vault.count("GET", "/v1/sys/mounts/kv/tune") == 2
+    assert vault.count("GET", "/v1/sys/mounts/kv2/tune") == 1
+
+
+def test_configuring_kv_engine_invalidates_its_configuration(
+    vault: StandInVault,
+) -> None:
+    vault.respond("GET", "/v1/kv/config", body=KV_CONFIGURATION)
+    vault.respond("POST", "/v1/kv/config", status=204)
+
+    async def main() -> None:
+        async with (
+            vault.serve(),
+            vault.connect(cache=asyva.CacheConfig(enabled=True)) as client,
+        ):
+            for max_versions in (5, 10):
+                await client.read_kv_configuration(path="kv")
+                await client.read_kv_configuration(path="kv")
+                await client.configure_secrets_engine(
+                    secret_mount_path="kv", cas_required=True, max_versions=max_versions
+                )
+
+            await client.read_kv_configuration(path="kv")
+
+    asyncio.run(main())
+
+    assert vault.count("POST", "/v1/kv/config") == 2
+    # Read once before each write and once after the last one
+    assert vault.count("GET", "/v1/kv/config") == 3
+
+
+@pytest.mark.parametrize(
+    "write",
+    [
+        lambda client: client.update_or_create_password_policy(
+            path="policy", policy="length = 8"
+        ),
+        lambda client: client.generate_root(
+            mount_path="pki", common_name="root", type="internal"
+        ),
+        lambda client: client.generate_intermediate_csr(
+            mount_path="pki", common_name="intermediate", type="internal"
+        ),
+        lambda client: client.set_signed_intermediate(
+            mount_path="pki", certificate="certificate"
+        ),
+        lambda client: client.update_issuer(mount_path="pki", issuer_ref="a"),
+        lambda client: client.update_or_create_pki_role(
+            mount_path="pki", name="role", issuer_ref="a"
+        ),
+        lambda client: client.enable_secrets_engine(path="kv", type="kv"),
+        lambda client: client.configure_secrets_engine(secret_mount_path="kv"),
+        lambda client: client.tune_mount_configuration(path="kv"),
+    ],
+)
+def test_every_write_finds_the_path_it_invalidates(
+    vault: StandInVault, write: Callable[[asyva.Client], Awaitable[Any]]
+) -> None:
+    async def main() -> None:
+        async with vault.serve(), vault.connect() as client:
+            # The stand-in rejects the write, once the cache is invalidated
+            with pytest.raises(asyva.exc.VaultAPIError):
+                await write(client)
+
+    asyncio.run(main())
+
+    assert vault.received
@@ -0,0 +1,214 @@
+import asyncio
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass, field
+from typing import Any
+
+import aiohttp
+import pytest
+import yarl
+from aiohttp.client_reqrep import ConnectionKey
+from vault_autopilot._pkg import asyva
+from vault_autopilot._pkg.asyva.executor import RequestExecutor
+
+
+@dataclass(slots=True)
+class FakeResponse:
+    status: int
+    headers: Mapping[str, str] = field(default_factory=dict)
+    method: str = "GET"
+    url: yarl.URL = yarl.URL("http://vault:8200")
+
+    async def read(self) -> bytes:
+        return b""
+
+    async def json(self) -> Any:
+        return None
+
+
+@dataclass(slots=True)
+class FakeSend:
+    """Answers the attempts with the given outcomes, in order, the last one being
+    repeated. ``None`` never answers, until the attempt times out."""
+
+    outcomes: list[FakeResponse | Exception | None]
+    gate: asyncio.Event | None = None
+    attempts: int = 0
+
+    async def __call__(self) -> FakeResponse:
+        outcome = self.outcomes[min(self.attempts, len(self.outcomes) - 1)]
+        self.attempts += 1
+
+        if self.gate is not None:
+            await self.gate.wait()
+
+        if outcome is None:
+            await asyncio.Event().wait()
+
+        if isinstance(outcome, Exception):
+            raise outcome
+
+        assert outcome is not None
+        return outcome
+
+
+def responses(*statuses: int) -> list[FakeResponse | Exception | None]:
+    return [FakeResponse(status) for status in statuses]
+
+
+def executor(**kwargs: Any) -> RequestExecutor:
+    kwargs = {"backoff_base": 0.001, "breaker_threshold": 0} | kwargs
+    return RequestExecutor(asyva.RetryConfig(**kwargs))
+
+
+async def execute_all(
+    executor: RequestExecutor, sends: Iterable[FakeSend], idempotent: bool = True
+) -> list[Any]:
+    return await asyncio.gather(
+        *(executor.execute(send, idempotent, "sys") for send in sends),
+        return_exceptions=True,
+    )
+
+
+@pytest.mark.parametrize(
+    ("outcomes", "attempts", "status"),
+    [
+        (responses(429, 503, 200), 3, 200),
+        (responses(502, 200), 1, 502),
+        (responses(504, 200), 1, 504),
+    ],
+)
+def test_non_idempotent_request_is_retried_only_when_rejected(
+    outcomes: list[FakeResponse | Exception | None], attempts: int, status: int
+) -> None:
+    send = FakeSend(outcomes)
+
+    resp = asyncio.run(executor().execute(send, False, "sys"))
+
+    assert (send.attempts, resp.status) == (attempts, status)
+
+
+def test_non_idempotent_request_is_not_retried_on_connection_error() -> None:
+    send = FakeSend([aiohttp.ServerDisconnectedError(), FakeResponse(200)])
+
+    with pytest.raises(aiohttp.ServerDisconnectedError):
+        asyncio.run(executor().execute(send, False, "sys"))
+
+    assert send.attempts == 1
+
+
+def test_idempotent_request_is_retried_on_connection_error() -> None:
+    send = FakeSend([aiohttp.ServerDisconnectedError(), FakeResponse(200)])
+
+    resp = asyncio.run(executor().execute(send, True, "sys"))
+
+    assert (send.attempts, resp.status) == (2, 200)
+
+
+def test_retry_after_is_capped_at_backoff_max() -> None:
+    send = FakeSend([FakeResponse(429, {"Retry-After": "3600"}), FakeResponse(200)])
+
+    async def main() -> float:
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        await executor(backoff_max=0.05).execute(send, False, "sys")
+        return loop.time() - started
+
+    elapsed = asyncio.run(main())
+
+    assert send.attempts == 2
+    assert 0.05 <= elapsed < 1
+
+
+def test_deadline_stops_retries() -> None:
+    send = FakeSend(responses(503))
+
+    async def main() -> tuple[int, float]:
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        resp = await executor(
+            max_attempts=1000, backoff_base=0.05, backoff_max=0.05, deadline=0.3
+        ).execute(send, True, "sys")
+        return resp.status, loop.time() - started
+
+    status, elapsed = asyncio.run(main())
+
+    assert status == 503
+    # Stopped at the deadline rather than after 1000 attempts, give or take the last one
+    assert elapsed < 0.3 + 0.1
+    assert 1 < send.attempts < 1000
+
+
+def test_breaker_opens_after_threshold_and_lets_one_probe_through() -> None:
+    async def main() -> None:
+        ex = executor(breaker_threshold=2, breaker_cooldown=0.05, max_attempts=1)
+
+        await execute_all(ex, [FakeSend(responses(503)) for _ in range(2)])
+        assert ex.breaker.is_open
+
+        send = FakeSend(responses(200))
+        with pytest.raises(asyva.exc.CircuitOpenError):
+            await ex.execute(send, True, "sys")
+        assert send.attempts == 0
+
+        await asyncio.sleep(0.06)
+
+        gate = asyncio.Event()
+        sends = [FakeSend(responses(200), gate) for _ in range(5)]
+        probing = asyncio.ensure_future(execute_all(ex, sends))
+        await asyncio.sleep(0.01)
+        gate.set()
+        results = await probing
+
+        assert [send.attempts for send in sends] == [1, 0, 0, 0, 0]
+        assert isinstance(results[0], FakeResponse)
+        assert all(
+            isinstance(result, asyva.exc.CircuitOpenError) for result in results[1:]
+        )
+
+        # The successful probe closed the breaker
+        assert not ex.breaker.is_open
+        assert (await ex.execute(FakeSend(responses(200)), True, "sys")).status == 200
+
+    asyncio.run(main())
+
+
+@pytest.mark.parametrize(
+    "outcome",
+    [
+        FakeResponse(503),
+        aiohttp.ClientConnectorError(
+            ConnectionKey("vault", 8200, False, True, None, None, None),
+            OSError(None, "Connection refused"),
+        ),
+        None,
+    ],
+    ids=["unavailable", "connection refused", "timeout"],
+)
+def test_failed_probe_reopens_breaker(outcome: FakeResponse | Exception | None) -> None:
+    async def main() -> None:
+        ex = executor(
+            breaker_threshold=1,
+            breaker_cooldown=0.05,
+            max_attempts=3,
+            request_timeout=0.05,
+        )
+
+        await execute_all(ex, [FakeSend(responses(503))])
+        await asyncio.sleep(0.06)
+
+        probe = FakeSend([outcome])
+        await execute_all(ex, [probe])
+
+        # The probe isn't retried, and the breaker fails requests fast again
+        assert probe.attempts == 1
+        assert ex.breaker.is_open
+
+        send = FakeSend(responses(200))
+        with pytest.raises(asyva.exc.CircuitOpenError):
+            await ex.execute(send, True, "sys")
+        assert send.attempts == 0
+
+        await asyncio.sleep(0.06)
+        assert (await ex.execute(send, True, "sys")).status == 200
+
+    asyncio.run(main())
@@ -0,0 +1,57 @@
+import asyncio
+
+import aiohttp
+from vault_autopilot._pkg import asyva
+from vault_autopilot._pkg.asyva.transport.http1 import AiohttpTransport
+
+from .stand_in import StandInVault
+
+MOUNT_CONFIGURATION = {
+    "data": {
+        "default_lease_ttl": 0,
+        "max_lease_ttl": 0,
+        "force_no_cache": False,
+        "description": "",
+    }
+}
+
+
+def test_unix_base_url_is_served_through_unix_connector(vault: StandInVault) -> None:
+    vault.respond("GET", "/v1/sys/mounts/kv/tune", body=MOUNT_CONFIGURATION)
+
+    async def main() -> None:
+        async with vault.serve():
+            transport = asyva.TransportConfig().create_transport()
+            assert isinstance(transport, AiohttpTransport)
+
+            try:
+                async with transport.create_session(vault.base_url, headers={}) as sess:
+                    resp = await sess.request("GET", "/v1/sys/mounts/kv/tune")
+                    assert resp.status == 200
+                    assert await resp.json() == MOUNT_CONFIGURATION
+
+                assert isinstance(transport._connector, aiohttp.UnixConnector)
+            finally:
+                await transport.close()
+
+    asyncio.run(main())
+
+    assert [(req.method, req.path) for req in vault.received] == [
+        ("GET", "/v1/sys/mounts/kv/tune")
+    ]
+
+
+def test_agent_authenticator_sends_no_token(vault: StandInVault) -> None:
+    vault.respond("GET", "/v1/sys/mounts/kv/tune", body=MOUNT_CONFIGURATION)
+
+    async def main() -> None:
+        async with vault.serve(), vault.connect() as client:
+            assert await client.read_mount_configuration(path="kv") is not None
+
+    asyncio.run(main())
+
+    assert vault.received, "the request didn't reach the agent"
+
+    for req in vault.received:
+        assert not req.path.startswith("/v1/auth/"), req
+        assert "x-vault-token" not in req.headers, req